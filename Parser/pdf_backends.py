@@ -0,0 +1,151 @@
+"""
+Pluggable PDF text extraction backends
+
+Each backend exposes page_count(source), iter_pages(source, start, stop),
+which lazily yields the text of each page in order, and page_range(source,
+start, stop), which returns the page count together with that iterator from
+a single parse of the document.
+The active backend is chosen by PDF_BACKEND in app/core/config.py; optional
+engines are imported only when selected. Compare them with
+benchmarks/pdf_backends.py before switching.
+"""
+import io
+import os
+
+from app.core.config import PDF_BACKEND
+
+PDF_BACKENDS = {}
+
+
+def register_backend(name):
+    """Class decorator adding a backend to the registry under `name`."""
+    def decorator(cls):
+        cls.name = name
+        PDF_BACKENDS[name] = cls
+        return cls
+    return decorator
+
+
+def _as_stream(source):
+    """Wrap in-memory bytes in a BytesIO; paths pass through, file objects are rewound."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
+
+@register_backend("pypdf2")
+class PyPDF2Backend:
+    """Pure-Python PyPDF2 extraction (default, no extra dependencies)."""
+
+    def __init__(self):
+        from PyPDF2 import PdfReader
+        self._reader_cls = PdfReader
+
+    def page_count(self, source):
+        return len(self._reader_cls(_as_stream(source)).pages)
+
+    def page_range(self, source, start, stop):
+        reader = self._reader_cls(_as_stream(source))
+        count = len(reader.pages)
+        return count, (reader.pages[index].extract_text() or "" for index in range(start, min(stop, count)))
+
+    def iter_pages(self, source, start, stop):
+        return self.page_range(source, start, stop)[1]
+
+
+@register_backend("pdfminer")
+class PdfminerBackend:
+    """pdfminer.six layout-based extraction (pip install pdfminer.six)."""
+
+    def __init__(self):
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LTTextContainer
+        from pdfminer.pdfpage import PDFPage
+        self._extract_pages = extract_pages
+        self._text_container = LTTextContainer
+        self._pdf_page = PDFPage
+
+    def page_count(self, source):
+        if isinstance(source, (str, os.PathLike)):
+            with io.open(source, 'rb') as f:
+                return sum(1 for _ in self._pdf_page.get_pages(f))
+        return sum(1 for _ in self._pdf_page.get_pages(_as_stream(source)))
+
+    def page_range(self, source, start, stop):
+        # pdfminer has no cheap handle on a parsed document: count, then lay out the pages
+        return self.page_count(source), self.iter_pages(source, start, stop)
+
+    def iter_pages(self, source, start, stop):
+        for layout in self._extract_pages(_as_stream(source), page_numbers=range(start, stop)):
+            yield "".join(
+                element.get_text() for element in layout
+                if isinstance(element, self._text_container)
+            ).strip()
+
+
+@register_backend("pdfium")
+class PdfiumBackend:
+    """PDFium (C++) extraction via pypdfium2 (pip install pypdfium2)."""
+
+    def __init__(self):
+        import pypdfium2
+        self._pdfium = pypdfium2
+
+    def _open(self, source):
+        if isinstance(source, (bytearray, memoryview)):
+            source = bytes(source)
+        elif hasattr(source, "seek"):
+            source.seek(0)
+        return self._pdfium.PdfDocument(source)
+
+    def page_count(self, source):
+        document = self._open(source)
+        try:
+            return len(document)
+        finally:
+            document.close()
+
+    def page_range(self, source, start, stop):
+        document = self._open(source)
+        return len(document), self._iter_document(document, start, stop)
+
+    def iter_pages(self, source, start, stop):
+        return self.page_range(source, start, stop)[1]
+
+    def _iter_document(self, document, start, stop):
+        try:
+            for index in range(start, min(stop, len(document))):
+                page = document[index]
+                textpage = page.get_textpage()
+                text = textpage.get_text_range().replace("\r\n", "\n")
+                textpage.close()
+                page.close()
+                yield text
+        finally:
+            document.close()
+
+
+_instances = {}
+
+
+def get_backend(name=None):
+    """
+    Return a (cached) backend instance.
+
+    Args:
+        name: Registered backend name; defaults to PDF_BACKEND from config
+
+    Raises:
+        ValueError: If the backend is unknown or its library is not installed
+    """
+    name = (name or PDF_BACKEND).lower()
+    if name not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend '{name}'. Available: {', '.join(sorted(PDF_BACKENDS))}")
+    if name not in _instances:
+        try:
+            _instances[name] = PDF_BACKENDS[name]()
+        except ImportError as e:
+            raise ValueError(f"PDF backend '{name}' is not installed: {e}")
+    return _instances[name]
@@ -1,11 +1,14 @@
-from groq import Groq
 import yaml
-from PyPDF2 import PdfReader
 from google.cloud import vision
 from google.api_core import exceptions as google_exceptions
 import os
 import io
+import itertools
+import sys
+import time
 from app.core.utils import parse_json_response, convert_to_string
+from app.core.llm_client import chat_completion, stream_chat_completion
+from Parser.pdf_backends import get_backend
 
 api_key = None
 google_vision_api_key = None
@@ -17,21 +20,86 @@ with open(CONFIG_PATH) as file:
     google_vision_api_key = data.get("GOOGLE_VISION_API_KEY")
 
 
-def extract_text_from_pdf(pdf_path):
-    """Extracts and returns all text from a PDF file"""
-    reader = PdfReader(pdf_path)
-    text = ""
-    for page in reader.pages:
-        text += page.extract_text() + "\n"
-    return text.strip()
+def read_source_bytes(source):
+    """Return the full content of a path, bytes-like object or binary file object."""
+    if isinstance(source, (str, os.PathLike)):
+        with io.open(source, 'rb') as f:
+            return f.read()
+    if isinstance(source, memoryview):
+        return source.tobytes()
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    return source.read()
 
 
-def extract_text_from_image(image_path):
+def extract_text_from_pdf(pdf_source, backend=None):
+    """
+    Extracts and returns all text from a PDF (path, bytes, memoryview or file object)
+    using the configured extraction backend (see Parser/pdf_backends.py)
+    """
+    _, pages = get_backend(backend).page_range(pdf_source, 0, sys.maxsize)
+    return "\n".join(pages).strip()
+
+
+def _timed_pages(pages):
+    """Drain a page iterator into a list of (page_text, seconds) tuples."""
+    results = []
+    started = time.perf_counter()
+    for page_text in pages:
+        finished = time.perf_counter()
+        results.append((page_text, finished - started))
+        started = finished
+    return results
+
+
+def extract_pdf_head(pdf_source, max_pages, head_pages, backend=None):
+    """
+    Counts the pages of a PDF and extracts text from the same parse.
+    Documents of up to max_pages pages are extracted whole; for larger ones
+    only the first head_pages are, and the rest is left to extract_pdf_pages
+    running in other worker processes.
+    
+    Args:
+        pdf_source: Path or bytes of the PDF
+        max_pages: Largest document extracted in this one call
+        head_pages: Pages extracted here when the document is larger
+        backend: Extraction backend name (defaults to PDF_BACKEND)
+        
+    Returns:
+        Tuple of (page_count, list of (page_text, seconds) tuples in page order)
+    """
+    page_count, pages = get_backend(backend).page_range(pdf_source, 0, sys.maxsize)
+    limit = page_count if page_count <= max_pages else head_pages
+    try:
+        return page_count, _timed_pages(itertools.islice(pages, limit))
+    finally:
+        pages.close()
+
+
+def extract_pdf_pages(pdf_source, start, stop, backend=None):
+    """
+    Extracts text from pages [start, stop) of a PDF, timing each page.
+    Used to fan large documents out across worker processes.
+    
+    Args:
+        pdf_source: Path or bytes of the PDF
+        start: First page index (inclusive)
+        stop: Last page index (exclusive)
+        backend: Extraction backend name (defaults to PDF_BACKEND)
+        
+    Returns:
+        List of (page_text, seconds) tuples in page order
+    """
+    return _timed_pages(get_backend(backend).iter_pages(pdf_source, start, stop))
+
+
+def extract_text_from_image(image_source):
     """
     Extracts text from an image file using Google Vision API OCR.
     
     Args:
-        image_path: Path to the image file (jpg, png, etc.)
+        image_source: Path to the image file (jpg, png, etc.), its bytes,
+                      a memoryview or a binary file object
         
     Returns:
         Extracted text as a string
@@ -50,9 +118,8 @@ def extract_text_from_image(image_path):
     # Initialize the Vision API client
     client = vision.ImageAnnotatorClient()
     
-    # Read the image file
-    with io.open(image_path, 'rb') as image_file:
-        content = image_file.read()
+    # Read the image content
+    content = read_source_bytes(image_source)
     
     # Create image object
     image = vision.Image(content=content)
@@ -105,28 +172,33 @@ def extract_text_from_image(image_path):
         raise
 
 
-def extract_text_from_file(file_path):
+def extract_text_from_file(source, file_type=None):
     """
     Automatically detects file type and extracts text from PDF or image.
     
     Args:
-        file_path: Path to the file (PDF or image)
+        source: Path to the file (PDF or image), its bytes, a memoryview
+                or a binary file object
+        file_type: Extension such as ".pdf"; required for in-memory sources
         
     Returns:
         Extracted text as a string
     """
-    file_ext = os.path.splitext(file_path)[1].lower()
+    if file_type is None:
+        if not isinstance(source, (str, os.PathLike)):
+            raise ValueError("file_type is required when extracting from in-memory content")
+        file_type = os.path.splitext(source)[1]
+    file_ext = file_type.lower()
     
     if file_ext == '.pdf':
-        return extract_text_from_pdf(file_path)
+        return extract_text_from_pdf(source)
     elif file_ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp']:
-        return extract_text_from_image(file_path)
+        return extract_text_from_image(source)
     else:
         raise ValueError(f"Unsupported file type: {file_ext}. Supported: PDF, JPG, PNG, GIF, BMP, WEBP")
 
 
-def ats_extractor(resume_data):
-    prompt = '''
+ATS_EXTRACTOR_PROMPT = '''
     You are an AI bot designed to act as a professional for parsing resumes. 
     You are given the resume and your job is to extract the following information:
     1. full name
@@ -140,8 +212,44 @@ def ats_extractor(resume_data):
     Give the extracted information in JSON format.
     '''
 
-    # ✅ Create Groq client
-    client = Groq(api_key=api_key)
+
+COMBINED_EXTRACTOR_PROMPT = '''
+    You are an AI bot designed to act as a professional for parsing resumes and preparing technical interviews.
+    You are given the resume text. In a single pass:
+
+    A. Extract the resume fields:
+    full_name, email_id, github_portfolio, linkedin_id, education, skills, key_projects, internships
+
+    B. Group interview-relevant topics into these categories, keeping each topic concise and specific
+    (e.g. "Python", "TensorFlow", "REST APIs") and never repeating a topic across categories:
+    technical_skills, frameworks_libraries, projects_topics, conceptual_topics, databases_cloud, roles_experience
+
+    Return only clean JSON with exactly this structure, without extra text or commentary:
+    {
+      "resume": {
+        "full_name": "...",
+        "email_id": "...",
+        "github_portfolio": "...",
+        "linkedin_id": "...",
+        "education": [...],
+        "skills": [...],
+        "key_projects": [...],
+        "internships": [...]
+      },
+      "key_categories": {
+        "technical_skills": [...],
+        "frameworks_libraries": [...],
+        "projects_topics": [...],
+        "conceptual_topics": [...],
+        "databases_cloud": [...],
+        "roles_experience": [...]
+      }
+    }
+    '''
+
+
+async def ats_extractor(resume_data, cache=None):
+    prompt = ATS_EXTRACTOR_PROMPT
 
     # ✅ Construct messages
     messages = [
@@ -149,22 +257,24 @@ def ats_extractor(resume_data):
         {"role": "user", "content": resume_data}
     ]
 
-    # ✅ Use a valid Groq model (gpt-3.5-turbo is NOT supported on Groq)
-    response = client.chat.completions.create(
-        model="qwen/qwen3-32b",
-        messages=messages,
-        temperature=0.0,
-        max_tokens=2500
-    )
-
-    # ✅ Typo fix: should be response.choices (plural)
-    data = response.choices[0].message.content
+    # ✅ Shared async client (model defaults to qwen/qwen3-32b)
+    data = await chat_completion(messages, temperature=0.0, max_tokens=2500, cache=cache)
 
     # print(data)
     return data
 
 
-def key_extraction(key_categories):
+async def combined_extractor(resume_data, cache=None):
+    """Single call returning both the resume fields and the interview key categories"""
+    messages = [
+        {"role": "system", "content": COMBINED_EXTRACTOR_PROMPT},
+        {"role": "user", "content": resume_data}
+    ]
+
+    return await chat_completion(messages, temperature=0.0, max_tokens=4000, cache=cache)
+
+
+async def key_extraction(key_categories, cache=None):
     prompt = '''
             You are an AI assistant that prepares personalized technical interviews based on a candidate’s resume.
 
@@ -191,28 +301,19 @@ def key_extraction(key_categories):
     - Keep the final JSON clean, without extra text or commentary.
     '''
 
-    client = Groq(api_key=api_key)
-
     messages = [
         {"role": "system", "content" : prompt },
         {"role" : "user", "content": key_categories}
     ]
 
-    response = client.chat.completions.create(
-        model="qwen/qwen3-32b",
-        messages=messages,
-        temperature=0.0,
-        max_tokens=2500
-    )
-
-    key_data = response.choices[0].message.content
+    key_data = await chat_completion(messages, temperature=0.0, max_tokens=2500, cache=cache)
 
 
     print("-------------------------------------------:",parse_json_response(key_data))
     return parse_json_response(key_data)
 
-def topicwise_questions(key_words):
-    prompt = '''
+
+TOPICWISE_QUESTIONS_PROMPT = '''
             You are an intelligent AI interviewer. Your goal is to generate technical interview questions based on a candidate’s resume topics.
 
     Input:
@@ -245,35 +346,37 @@ def topicwise_questions(key_words):
       “What was your role in the [project name] project?” or “Which technologies did you use in this project?”
     - Keep questions diverse — include both technical and real-world problem-based questions.'''
 
-    client = Groq(api_key=api_key)
 
-    messages = [
-        {"role":"system","content" : prompt},
+def _topicwise_messages(key_words):
+    return [
+        {"role":"system","content" : TOPICWISE_QUESTIONS_PROMPT},
         {"role": "user", "content" : key_words}
     ]
 
-    response = client.chat.completions.create(
-        model = "qwen/qwen3-32b",
-        messages=messages,
-        temperature=0.9,
-        max_tokens=2500)
-    
-    questions_ontopic = response.choices[0].message.content
+
+async def topicwise_questions(key_words, cache=None):
+    messages = _topicwise_messages(key_words)
+
+    questions_ontopic = await chat_completion(messages, temperature=0.9, max_tokens=2500, cache=cache)
 
     print(questions_ontopic)
     return questions_ontopic
 
-@staticmethod
-def compare_resume_to_job(job_description: str, resume_data: dict) -> dict:
+
+def topicwise_questions_stream(key_words, cache=None):
+    """Same as topicwise_questions, but returns an async iterator of response deltas"""
+    return stream_chat_completion(
+        _topicwise_messages(key_words), temperature=0.9, max_tokens=2500, cache=cache
+    )
+
+
+async def compare_resume_to_job(job_description: str, resume_data: dict) -> dict:
     """
     Compare resume content against a job description using Groq AI.
     Returns match percentage, matching and missing skills, and a summary.
     """
-    from groq import Groq
     import re, json
 
-    client = Groq(api_key=api_key)
-
     prompt = f"""
     You are an expert HR recruiter.
     Compare the following job description and resume data.
@@ -293,15 +396,12 @@ def compare_resume_to_job(job_description: str, resume_data: dict) -> dict:
     }}
     """
 
-    response = client.chat.completions.create(
-        model="qwen/qwen3-32b",
-        messages=[{"role": "system", "content": prompt}],
+    result = await chat_completion(
+        [{"role": "system", "content": prompt}],
         temperature=0.3,
         max_tokens=800
     )
 
-    result = response.choices[0].message.content
-
     # ✅ Extract valid JSON from AI output
     match = re.search(r"(\{[\s\S]*\})", result)
     try:
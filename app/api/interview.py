@@ -1,9 +1,11 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from app.core.database import get_connection
 from app.services.gmail_service import GmailService
+from app.core.executors import run_io
+from app.repositories import ResumeRepository
 
 router = APIRouter(tags=["Interview Email"])
+resume_repository = ResumeRepository()
 
 class InterviewDetails(BaseModel):
     interview_date: str
@@ -11,20 +13,20 @@ class InterviewDetails(BaseModel):
     interview_link: str
 
 
+def _send_email(to_email: str, subject: str, message_text: str):
+    gmail = GmailService()
+    return gmail.send_email(
+        to_email=to_email,
+        subject=subject,
+        message_text=message_text
+    )
+
+
 @router.post("/send-interview-mail/{resume_id}")
 async def send_interview_mail(resume_id: str, data: InterviewDetails):
 
     # Fetch candidate details from DB
-    conn = get_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("""
-        SELECT full_name, email_id
-        FROM parsed_resumes
-        WHERE resume_id = %s
-    """, (resume_id,))
-    row = cursor.fetchone()
-    cursor.close()
-    conn.close()
+    row = await resume_repository.get_candidate_contact(resume_id)
 
     if not row:
         raise HTTPException(404, "Candidate not found")
@@ -50,11 +52,11 @@ S2Integrators HR Team
 
     # Send email
     try:
-        gmail = GmailService()
-        gmail.send_email(
-            to_email=candidate_email,
-            subject="Interview Scheduled – S2Integrators",
-            message_text=body  
+        await run_io(
+            _send_email,
+            candidate_email,
+            "Interview Scheduled – S2Integrators",
+            body
         )
     except Exception as e:
         raise HTTPException(500, f"Error sending email: {str(e)}")
@@ -1,13 +1,17 @@
 """
 Job description API routes
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Query
+from typing import Optional
+from app.core.config import RANKING_TOP_K, RANKING_MAX_TOP_K, LIST_PAGE_SIZE, LIST_MAX_PAGE_SIZE
 from app.services.job_service import JobService
+from app.services.ranking_service import RankingService
 from app.schemas.resume import JobDescriptionCreate
 from typing import Dict, Any
 
 router = APIRouter(tags=["Jobs"])
 job_service = JobService()
+ranking_service = RankingService()
 
 
 @router.post("/add", response_model=Dict[str, Any])
@@ -15,15 +19,50 @@ async def add_job_description(request: JobDescriptionCreate):
     """
     Add a new job description to the database.
     """
-    return job_service.add_job_description(request.title, request.description)
+    return await job_service.add_job_description(
+        request.title,
+        request.description,
+        company_branch=request.comapny_branch,
+        required_skills=request.required_skills
+    )
 
 
 @router.get("/all", response_model=Dict[str, Any])
-async def get_all_jobs():
+async def get_all_jobs(
+    page_size: int = Query(LIST_PAGE_SIZE, ge=1, le=LIST_MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated subset of job_id,title,company_branch,description,required_skills,created_at"
+    ),
+    total: str = Query("none", pattern="^(none|approx|exact)$")
+):
     """
-    Fetch all job descriptions stored in the database.
+    Fetch job descriptions newest first, one keyset page at a time.
+    Pass **next_cursor** back as **cursor** for the next page; use e.g.
+    `fields=job_id,title` to skip the description text in list views.
+    **total** adds a count: `approx` (table statistics) or `exact`.
     """
-    return job_service.get_all_jobs()
+    return await job_service.get_all_jobs(page_size=page_size, cursor=cursor, fields=fields, total=total)
+
+
+@router.get("/{job_id}/ranking", response_model=Dict[str, Any])
+async def rank_candidates(
+    job_id: str,
+    top_k: int = Query(RANKING_TOP_K, ge=0, le=RANKING_MAX_TOP_K),
+    min_score: Optional[float] = Query(None, ge=0, le=100),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=200),
+    refresh: bool = False
+):
+    """
+    Rank all parsed resumes for a job.
+    Every candidate is pre-scored locally by skill overlap; only the best
+    **top_k** are compared by the LLM. **min_score** drops candidates below
+    a final score (0-100); **refresh** ignores cached LLM comparisons.
+    """
+    return await ranking_service.rank_candidates(
+        job_id, top_k=top_k, min_score=min_score, page=page, page_size=page_size, refresh=refresh
+    )
 
 
 @router.get("/{job_id}", response_model=Dict[str, Any])
@@ -31,7 +70,7 @@ async def get_job_by_id(job_id: str):
     """
     Fetch a specific job by its ID.
     """
-    return job_service.get_job_by_id(job_id)
+    return await job_service.get_job_by_id(job_id)
 
 
 @router.delete("/{job_id}", response_model=Dict[str, Any])
@@ -39,4 +78,4 @@ async def delete_job(job_id: str):
     """
     Delete a job by its ID.
     """
-    return job_service.delete_job(job_id)
+    return await job_service.delete_job(job_id)
@@ -2,23 +2,46 @@
 Resume parsing API routes
 """
 
-from fastapi import APIRouter, UploadFile, File, HTTPException
-import os,json
-from typing import List, Dict, Any
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from fastapi.responses import StreamingResponse
+import os,json,io
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Optional
 from app.services.resume_service import ResumeService
 from uuid import uuid4
-from app.core.database import get_connection
+from app.core.executors import run_io
+from app.core.config import UPLOAD_DIR, API_V1_PREFIX, LIST_PAGE_SIZE, LIST_MAX_PAGE_SIZE, PARSE_BATCH_MAX_FILES
+from app.core.pagination import count_total, decode_cursor, page_response, select_columns
+from app.core.uploads import save_upload, stream_upload, SUPPORTED_EXTENSIONS
+from app.repositories import ResumeRepository
+from app.repositories.queries import RESUME_LIST_COLUMNS
 from app.schemas.resume import (
     ExtractKeysRequest,
     GenerateQuestionsRequest,
     ParseResumeResponse,
+    ParseBatchRequest,
+    ParseBatchResponse,
     ExtractKeysResponse,
     GenerateQuestionsResponse,
-    FullPipelineResponse
+    FullPipelineResponse,
+    PipelineJobSubmitResponse,
+    PipelineJobStatus
 )
+from app.services.pipeline_queue import get_pipeline_queue
+from app.services.skill_index import get_skill_index
+from app.services.text_index import get_text_index
+from app.services.export_service import ExportService, EXPORT_FORMATS
+from app.services.upload_service import UploadService
 
 router = APIRouter(tags=["Resume"])
 resume_service = ResumeService()
+resume_repository = ResumeRepository()
+export_service = ExportService()
+upload_service = UploadService()
+logger = logging.getLogger(__name__)
 
 
 # @router.post("/parse", response_model=ParseResumeResponse)
@@ -36,82 +59,85 @@ resume_service = ResumeService()
 #     except Exception as e:
 #         raise HTTPException(status_code=500, detail=f"Error processing resume: {str(e)}")
 
-UPLOAD_DIR = "D:/ai_screen/app/uploads"
+# Blocking helpers: always dispatched through run_io so disk and email
+# work never run on the event loop.
+
+def _send_email(to_email: str, subject: str, message: str):
+    from app.services.gmail_service import GmailService
+    gmail = GmailService()
+    return gmail.send_email(to_email, subject, message)
 
 
 @router.post("/upload")
 async def upload_resume(file: UploadFile = File(...)):
-    # 1. Save file to disk
+    # 1. Stream file to disk (size limit, hashing and type sniffing on the fly)
     file_id = str(uuid4())
-    file_extension = os.path.splitext(file.filename)[1]
-    saved_filename = f"{file_id}{file_extension}"
-    file_path = os.path.join(UPLOAD_DIR, saved_filename)
+    partial_path = os.path.join(UPLOAD_DIR, f"{file_id}.part")
 
     try:
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
+        info = await save_upload(file, partial_path)
+
+        # Store under the sniffed extension so later parsing dispatches correctly
+        file_path = os.path.join(UPLOAD_DIR, f"{file_id}{info.file_type}")
+        await run_io(os.replace, partial_path, file_path)
 
         # 2. Insert metadata into database
-        conn = get_connection()
-        if conn is None:
-            raise HTTPException(status_code=500, detail="Failed to connect to database")
-
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO resumes (id, file_name, file_path) VALUES (%s, %s, %s)",
-            (file_id, file.filename, file_path)
-        )
-        conn.commit()
-        cursor.close()
-        conn.close()
+        await resume_repository.insert_resume(file_id, file.filename, file_path)
 
         # 3. Return success
-        return {"message": "Resume uploaded successfully", "file_id": file_id}
+        return {
+            "message": "Resume uploaded successfully",
+            "file_id": file_id,
+            "size": info.size,
+            "sha256": info.sha256
+        }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
+@router.post("/upload-batch", response_model=Dict[str, Any])
+async def upload_resumes_batch(files: List[UploadFile] = File(...)):
+    """
+    Upload many resumes at once: PDFs/images and/or zip archives of them.
+    Files are stored concurrently and recorded with one batched insert.
+    Returns a file_id or an error for every file (zip members included).
+    """
+    return await upload_service.upload_batch(files)
+
+
 @router.get("/all", response_model=Dict[str, Any])
-async def get_all_resumes():
+async def get_all_resumes(
+    page_size: int = Query(LIST_PAGE_SIZE, ge=1, le=LIST_MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of id,file_name,file_path,uploaded_at"),
+    total: str = Query("none", pattern="^(none|approx|exact)$")
+):
     """
-    Fetch all uploaded resumes and total count.
+    Fetch uploaded resumes newest first, one keyset page at a time.
+    Pass **next_cursor** back as **cursor** for the next page. **total**
+    adds a count: `approx` (table statistics, O(1)) or `exact` (COUNT(*)).
+    id and uploaded_at are always returned.
     """
+    columns = select_columns(fields, RESUME_LIST_COLUMNS, RESUME_LIST_COLUMNS, ("id", "uploaded_at"))
+    after = decode_cursor(cursor)
     try:
-        conn = get_connection()
-        if conn is None:
-            raise HTTPException(status_code=500, detail="Failed to connect to database")
-
-        cursor = conn.cursor()
-
-        # Fetch all resumes
-        cursor.execute("""
-            SELECT id, file_name, file_path, uploaded_at
-            FROM resumes
-            ORDER BY uploaded_at DESC
-        """)
-        rows = cursor.fetchall()
-
-        # Fetch total count
-        cursor.execute("SELECT COUNT(*) FROM resumes")
-        total_count = cursor.fetchone()[0]
-
-        cursor.close()
-        conn.close()
-
-        resumes = [
-            {
-                "id": str(row[0]),
-                "file_name": row[1],
-                "file_path": row[2],
-                "uploaded_at": row[3]
-            }
-            for row in rows
-        ]
+        rows, total_count = await asyncio.gather(
+            resume_repository.list_resumes(columns, page_size + 1, after),
+            count_total(total, resume_repository.count_resumes, resume_repository.estimate_resumes)
+        )
+        rows, next_cursor = page_response(rows, page_size, "uploaded_at", "id")
+
+        for row in rows:
+            row["id"] = str(row["id"])
 
         return {
             "total_resumes": total_count,
-            "resumes": resumes
+            "total_is_estimate": total == "approx",
+            "page_size": page_size,
+            "next_cursor": next_cursor,
+            "resumes": rows
         }
 
     except HTTPException:
@@ -119,62 +145,120 @@ async def get_all_resumes():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching resumes: {str(e)}")
 
+@router.get("/skills/search", response_model=Dict[str, Any])
+async def search_by_skills(
+    q: str = Query(..., min_length=1, description='e.g. kafka AND python AND NOT php'),
+    limit: int = Query(50, ge=1, le=1000),
+    offset: int = Query(0, ge=0)
+):
+    """
+    Boolean skill search over parsed resumes using the in-memory skill index.
+    Supports AND, OR, NOT and parentheses; adjacent words form one skill
+    (`machine learning`). Skills are normalized, so `Node.js` matches `nodejs`.
+    """
+    index = get_skill_index()
+    try:
+        await index.ensure_built()
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Skill index unavailable: {str(e)}")
+
+    started = time.perf_counter()
+    try:
+        resume_ids, terms = index.search(q)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid query: {str(e)}")
+    took_ms = round((time.perf_counter() - started) * 1000, 3)
+
+    return {
+        "query": q,
+        "terms": terms,
+        "total": len(resume_ids),
+        "took_ms": took_ms,
+        "results": [
+            {"resume_id": resume_id, "full_name": index.name(resume_id)}
+            for resume_id in resume_ids[offset:offset + limit]
+        ]
+    }
+
+
+@router.get("/export")
+async def export_parsed_resumes(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    since: Optional[datetime] = Query(None, description="Only resumes parsed at or after this time"),
+    job_id: Optional[str] = Query(None, description="Join stored comparisons against this job"),
+    comparison_mode: str = Query("llm", pattern="^(llm|fast|fast_summary)$")
+):
+    """
+    Stream every parsed resume as NDJSON or CSV with constant memory.
+    For incremental pulls, pass the **X-Export-Watermark** header of the
+    previous export as **since**.
+    """
+    try:
+        watermark = await export_service.prepare(job_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
+
+    return StreamingResponse(
+        export_service.stream(format, since=since, job_id=job_id, comparison_mode=comparison_mode),
+        media_type=EXPORT_FORMATS[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="parsed_resumes.{format}"',
+            "X-Export-Watermark": watermark.isoformat()
+        }
+    )
+
+
+@router.get("/search", response_model=Dict[str, Any])
+async def search_resume_text(
+    q: str = Query(..., min_length=1, description="Free text, e.g. kafka streaming python"),
+    k: int = Query(10, ge=1, le=1000)
+):
+    """
+    BM25 full-text search over the extracted text of parsed resumes.
+    Returns the top-k resume ids with their scores, best first.
+    """
+    index = get_text_index()
+    try:
+        await index.ensure_built()
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Text index unavailable: {str(e)}")
+
+    started = time.perf_counter()
+    hits = index.search(q, k)
+    took_ms = round((time.perf_counter() - started) * 1000, 3)
+
+    return {
+        "query": q,
+        "took_ms": took_ms,
+        "results": [{"resume_id": resume_id, "score": score} for resume_id, score in hits]
+    }
+
+
+@router.post("/search/backfill", response_model=Dict[str, Any])
+async def backfill_resume_texts(
+    after: str = Query("", description="next_after from the previous call"),
+    limit: int = Query(PARSE_BATCH_MAX_FILES, ge=1, le=PARSE_BATCH_MAX_FILES)
+):
+    """
+    Make resumes parsed before full-text search existed searchable: their text is
+    re-extracted from the stored files (no LLM calls), saved and indexed.
+    Call again with **after** = next_after until it is null.
+    """
+    try:
+        return await resume_service.backfill_resume_texts(after, limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Backfill failed: {str(e)}")
+
+
 @router.post("/parse/{file_id}", response_model=ParseResumeResponse)
-async def parse_resume(file_id: str):
+async def parse_resume(file_id: str, use_cache: bool = True):
     """
     Parse a previously uploaded resume using its file_id.
     - **file_id**: UUID of the uploaded file (returned by /upload)
+    - **use_cache**: Reuse stored parse/LLM results for byte-identical files (default true)
     """
     try:
-        # 1️⃣ Fetch file path from database
-        conn = get_connection()
-        if conn is None:
-            raise HTTPException(status_code=500, detail="Failed to connect to database")
-
-        cursor = conn.cursor()
-        cursor.execute("SELECT file_name, file_path FROM testing1.resumes WHERE id = %s", (file_id,))
-        result = cursor.fetchone()
-
-        if not result:
-            cursor.close()
-            conn.close()
-            raise HTTPException(status_code=404, detail="File not found")
-
-        file_name, file_path = result
-        print("Parsing file:", file_name, file_path)
-
-        # 2️⃣ Parse the file using your Parser service
-        parsed_data = await resume_service.parse_resume(file_path, file_name)
-        extracted = parsed_data.get("extracted_data", {})
-
-        import json
-
-        # 3️⃣ Call stored procedure to insert/update parsed data
-        cursor.callproc("InsertOrUpdateParsedResume", [
-            file_id,
-            extracted.get("full_name"),
-            extracted.get("email_id"),
-            extracted.get("github_portfolio"),
-            extracted.get("linkedin_id"),
-            json.dumps(extracted.get("skills")),
-            json.dumps(extracted.get("education")),
-            json.dumps(extracted.get("key_projects")),
-            json.dumps(extracted.get("internships")),
-            parsed_data.get("resume_text_length", 0)
-        ])
-
-        conn.commit()  # ✅ Commit the transaction
-        cursor.close()
-        conn.close()
-
-        # 4️⃣ Return structured response
-        return {
-            "status": parsed_data.get("status", "success"),
-            "filename": file_name,
-            "resume_text_length": parsed_data.get("resume_text_length", 0),
-            "extracted_data": extracted,
-            "message": "Resume parsed and saved successfully"
-        }
+        return await resume_service.parse_stored_resume(file_id, use_cache=use_cache)
 
     except HTTPException:
         raise
@@ -184,58 +268,39 @@ async def parse_resume(file_id: str):
 
 
 
+@router.post("/parse-batch", response_model=ParseBatchResponse)
+async def parse_resumes_batch(request: ParseBatchRequest):
+    """
+    Parse many uploaded resumes: a list of **file_ids**, or **all_unparsed**
+    for every upload without parsed data (up to PARSE_BATCH_MAX_FILES).
+    Failures are reported per id; the rest of the batch is still saved.
+    """
+    return await resume_service.parse_batch(
+        request.file_ids, all_unparsed=request.all_unparsed, use_cache=request.use_cache
+    )
+
+
 @router.post("/extract-keys/{file_id}", response_model=ExtractKeysResponse)
-async def extract_keys(file_id: str):
+async def extract_keys(file_id: str, use_cache: bool = True):
     """
     Extract key interview categories (technical_skills, frameworks_libraries, etc.)
     from the parsed resume stored in the database.
+
+    - **use_cache**: Reuse a cached LLM response for identical input (default true)
     """
 
     try:
-        conn = get_connection()
-        if conn is None:
-            raise HTTPException(status_code=500, detail="Failed to connect to database")
-        cursor = conn.cursor(dictionary=True)
-
         # 1️⃣ Fetch parsed resume data
-        cursor.execute("""
-            SELECT 
-                resume_id,
-                full_name,
-                email_id,
-                github_portfolio,
-                linkedin_id,
-                skills,
-                education,
-                key_projects,
-                internships,
-                parsed_text_length
-            FROM parsed_resumes
-            WHERE resume_id = %s
-        """, (file_id,))
-
-        row = cursor.fetchone()
+        row = await resume_repository.get_parsed_resume(file_id)
 
         if not row:
-            cursor.close()
-            conn.close()
             raise HTTPException(status_code=404, detail="Parsed resume not found")
 
-        # 2️⃣ Convert JSON fields into Python objects
-        json_fields = ["skills", "education", "key_projects", "internships"]
-        for field in json_fields:
-            if row.get(field):
-                try:
-                    row[field] = json.loads(row[field])
-                except (TypeError, json.JSONDecodeError):
-                    pass
-
-        cursor.close()
-        conn.close()
+        # 2️⃣ JSON fields are decoded by the repository
         print("Row:", row)
 
         # 3️⃣ Call resume service to extract AI-based key categories
-        result = resume_service.extract_keys(row, file_id)
+        result = await resume_service.extract_keys(row, file_id, use_cache=use_cache)
 
         return result
 
@@ -253,37 +318,129 @@ async def generate_questions(file_id: str):
     from the parsed_resumes table.
     """
     try:
-        return resume_service.generate_questions(file_id=file_id)
+        return await resume_service.generate_questions(file_id=file_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating questions: {str(e)}")
 
 
 
 @router.post("/full-pipeline", response_model=FullPipelineResponse)
-async def full_pipeline(file: UploadFile = File(...)):
+async def full_pipeline(file: UploadFile = File(...), mode: str = "two_call"):
     """
     Complete pipeline: Upload PDF/Image → Parse → Extract Keys → Generate Questions.
     Returns all results in one response.
     
     - **file**: PDF or image file (JPG, PNG, etc.) containing the resume
+    - **mode**: `two_call` (default) or `combined` to parse and extract keys in a single LLM call;
+      `extraction_usage` reports calls, tokens and latency of that stage for comparison
     """
     try:
-        return await resume_service.full_pipeline(file)
+        return await resume_service.full_pipeline(file, mode=mode)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error in pipeline: {str(e)}")
 
 
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+@router.post("/full-pipeline/stream")
+async def full_pipeline_stream(file: UploadFile = File(...)):
+    """
+    Full pipeline streamed as Server-Sent Events (text/event-stream).
+    Emits text_extracted, resume_parsed, keys_extracted, questions_delta (LLM
+    tokens), questions_generated and done; failures arrive as an error event.
+    Closing the connection cancels the remaining stages and in-flight LLM calls.
+
+    - **file**: PDF or image file (JPG, PNG, etc.) containing the resume
+    """
+    file_ext = os.path.splitext(file.filename)[1].lower()
+    if file_ext not in SUPPORTED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type. Supported: {', '.join(SUPPORTED_EXTENSIONS)}"
+        )
+
+    # Validate and buffer the upload before the 200 response starts
+    buffer = io.BytesIO()
+    info = await stream_upload(file, out=buffer)
+    content = buffer.getvalue()
+
+    async def event_stream():
+        events = resume_service.full_pipeline_events(content, file.filename, info.file_type, info.sha256)
+        try:
+            async for event, data in events:
+                yield _sse(event, data)
+        except HTTPException as e:
+            yield _sse("error", {"status_code": e.status_code, "detail": e.detail})
+        except asyncio.CancelledError:
+            logger.info("Client disconnected from pipeline stream for %s", file.filename)
+            raise
+        except Exception as e:
+            yield _sse("error", {"status_code": 500, "detail": f"Error in pipeline: {str(e)}"})
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/full-pipeline/jobs", response_model=PipelineJobSubmitResponse, status_code=202)
+async def submit_full_pipeline_job(file: UploadFile = File(...)):
+    """
+    Queue the full pipeline as a background job and return immediately.
+    Poll the returned status_url for per-stage progress and results.
+
+    - **file**: PDF or image file (JPG, PNG, etc.) containing the resume
+    """
+    try:
+        job = await get_pipeline_queue().submit(file)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error queuing pipeline: {str(e)}")
+    return {**job, "status_url": f"{API_V1_PREFIX}/resume/full-pipeline/jobs/{job['job_id']}"}
+
+
+@router.get("/full-pipeline/jobs/{job_id}", response_model=PipelineJobStatus)
+async def get_full_pipeline_job(job_id: str):
+    """
+    Status of a background pipeline job: overall status plus status,
+    timing and result of each stage (parse_resume, extract_keys, generate_questions).
+    """
+    job = await get_pipeline_queue().get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Pipeline job not found")
+    return job
+
+
 #COMPARING JOBS
 @router.post("/compare/{parsed_file_id}/{job_id}")
-async def compare_resume_job(parsed_file_id: str, job_id: str):
+async def compare_resume_job(
+    parsed_file_id: str,
+    job_id: str,
+    mode: str = "llm",
+    llm_summary: bool = False,
+    force: bool = False
+):
     """
     Compare a candidate's parsed resume against a job description.
     Returns matching score, matching/missing skills, and a summary.
+
+    - **mode**: `llm` (default) or `fast` for local skill matching with no network call
+    - **llm_summary**: with `mode=fast`, ask the LLM for the summary text only
+    - **force**: recompute instead of serving the stored result
     """
     try:
-        result = await resume_service.compare_resume_with_job(parsed_file_id, job_id)
+        result = await resume_service.compare_resume_with_job(
+            parsed_file_id, job_id, mode=mode, llm_summary=llm_summary, force=force
+        )
         return result
     except HTTPException:
         raise
@@ -297,23 +454,8 @@ async def send_interview_mail(file_id: str):
     Send interview email to candidate fetched from database using resume_id.
     """
     try:
-        conn = get_connection()
-        if conn is None:
-            raise HTTPException(status_code=500, detail="DB connection failed")
-
-        cursor = conn.cursor(dictionary=True)
-
         # Fetch candidate email
-        cursor.execute("""
-            SELECT full_name, email_id 
-            FROM parsed_resumes 
-            WHERE resume_id = %s
-        """, (file_id,))
-
-        row = cursor.fetchone()
-
-        cursor.close()
-        conn.close()
+        row = await resume_repository.get_candidate_contact(file_id)
 
         if not row or not row["email_id"]:
             raise HTTPException(status_code=404, detail="Email not found for this resume ID")
@@ -321,10 +463,6 @@ async def send_interview_mail(file_id: str):
         full_name = row["full_name"]
         email = row["email_id"]
 
-        # Send email
-        from app.services.gmail_service import GmailService
-        gmail = GmailService()
-
         subject = "Interview Invitation"
         message = f"""
 Hello {full_name},
@@ -337,7 +475,8 @@ Regards,
 HR Team
 """
 
-        result = gmail.send_email(email, subject, message)
+        # Send email
+        result = await run_io(_send_email, email, subject, message)
 
         return {
             "status": "success",
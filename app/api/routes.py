@@ -2,7 +2,7 @@
 Main API routes aggregator
 """
 from fastapi import APIRouter
-from app.api import resume, jobs, interview
+from app.api import resume, jobs, interview, tasks
 
 # Create main API router
 api_router = APIRouter()
@@ -11,3 +11,4 @@ api_router = APIRouter()
 api_router.include_router(resume.router, prefix="/resume")
 api_router.include_router(jobs.router, prefix="/job")
 api_router.include_router(interview.router, prefix="/interview")
+api_router.include_router(tasks.router, prefix="/tasks")
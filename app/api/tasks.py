@@ -0,0 +1,75 @@
+"""
+Distributed task queue API routes
+
+Work queued here is claimed by whichever app instance has a free worker,
+instead of running on the node that received the request.
+"""
+from typing import Any, Dict
+
+from fastapi import APIRouter, HTTPException
+
+from app.core.config import API_V1_PREFIX
+from app.schemas.resume import TaskSubmitResponse, TaskStatus
+from app.services.task_queue import get_task_queue
+
+router = APIRouter(tags=["Tasks"])
+
+
+async def _submit(task_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        task_id = await get_task_queue().enqueue(task_type, payload)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error queuing task: {str(e)}")
+    return {
+        "task_id": task_id,
+        "task_type": task_type,
+        "status": "queued",
+        "status_url": f"{API_V1_PREFIX}/tasks/{task_id}"
+    }
+
+
+@router.post("/parse/{file_id}", response_model=TaskSubmitResponse, status_code=202)
+async def queue_parse(file_id: str, use_cache: bool = True):
+    """Queue parsing of an uploaded resume (same work as /resume/parse/{file_id})."""
+    return await _submit("parse", {"file_id": file_id, "use_cache": use_cache})
+
+
+@router.post("/extract-keys/{file_id}", response_model=TaskSubmitResponse, status_code=202)
+async def queue_extract_keys(file_id: str, use_cache: bool = True):
+    """Queue key-category extraction for a parsed resume."""
+    return await _submit("extract_keys", {"file_id": file_id, "use_cache": use_cache})
+
+
+@router.post("/generate-questions/{file_id}", response_model=TaskSubmitResponse, status_code=202)
+async def queue_generate_questions(file_id: str):
+    """Queue interview question generation from stored key categories."""
+    return await _submit("generate_questions", {"file_id": file_id})
+
+
+@router.post("/compare/{parsed_file_id}/{job_id}", response_model=TaskSubmitResponse, status_code=202)
+async def queue_compare(parsed_file_id: str, job_id: str, mode: str = "llm", force: bool = False):
+    """Queue a resume vs job description comparison (mode: llm or fast; force skips the stored result)."""
+    return await _submit("compare", {"file_id": parsed_file_id, "job_id": job_id, "mode": mode, "force": force})
+
+
+@router.get("/stats", response_model=Dict[str, Any])
+async def task_stats():
+    """Cluster-wide task counts per status and this node's worker count."""
+    try:
+        return await get_task_queue().stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching task stats: {str(e)}")
+
+
+@router.get("/{task_id}", response_model=TaskStatus)
+async def get_task(task_id: str):
+    """Status, attempts, owning node and result of a queued task."""
+    try:
+        task = await get_task_queue().get(task_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching task: {str(e)}")
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
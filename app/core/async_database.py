@@ -0,0 +1,137 @@
+"""
+Async MySQL connection provider (aiomysql)
+
+Used by the repository layer so database I/O overlaps with LLM I/O on
+the event loop. Connections run in autocommit mode; writes that span
+several statements open an explicit transaction.
+
+Checkouts wait at most DB_POOL_TIMEOUT seconds for a free connection and,
+with DB_POOL_HEALTH_CHECK, ping it first (reconnecting if the server closed
+it), so callers never get a dead connection. Connections older than
+DB_POOL_RECYCLE seconds are replaced by the pool.
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import aiomysql
+
+from app.core.config import (
+    DB_HOST,
+    DB_PORT,
+    DB_USER,
+    DB_PASSWORD,
+    DB_NAME,
+    DB_POOL_MIN_SIZE,
+    DB_POOL_MAX_SIZE,
+    DB_POOL_RECYCLE,
+    DB_POOL_TIMEOUT,
+    DB_POOL_HEALTH_CHECK
+)
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[aiomysql.Pool] = None
+_pool_lock = asyncio.Lock()  # concurrent first calls must not each create a pool
+_wait_stats = {"checkouts": 0, "total_wait": 0.0, "max_wait": 0.0, "timeouts": 0, "health_check_failures": 0}
+
+
+async def get_async_pool() -> aiomysql.Pool:
+    """Return the process-wide aiomysql pool, creating it on first use."""
+    global _pool
+    if _pool is not None:
+        return _pool
+    async with _pool_lock:
+        if _pool is None:
+            _pool = await aiomysql.create_pool(
+                host=DB_HOST,
+                port=DB_PORT,
+                user=DB_USER,
+                password=DB_PASSWORD,
+                db=DB_NAME,
+                minsize=DB_POOL_MIN_SIZE,
+                maxsize=DB_POOL_MAX_SIZE,
+                pool_recycle=DB_POOL_RECYCLE,
+                autocommit=True,
+                charset="utf8mb4"
+            )
+    return _pool
+
+
+@asynccontextmanager
+async def acquire() -> AsyncIterator[aiomysql.Connection]:
+    """
+    Check out a connection for the duration of an `async with` block.
+    The connection is always returned to the pool.
+
+    Raises:
+        TimeoutError: if no connection is free within DB_POOL_TIMEOUT seconds
+    """
+    pool = await get_async_pool()
+    start = time.monotonic()
+    try:
+        conn = await asyncio.wait_for(pool.acquire(), timeout=DB_POOL_TIMEOUT)
+    except asyncio.TimeoutError:
+        _wait_stats["timeouts"] += 1
+        raise TimeoutError(f"No database connection free within {DB_POOL_TIMEOUT}s") from None
+    try:
+        waited = time.monotonic() - start
+        _wait_stats["checkouts"] += 1
+        _wait_stats["total_wait"] += waited
+        _wait_stats["max_wait"] = max(_wait_stats["max_wait"], waited)
+        if DB_POOL_HEALTH_CHECK:
+            try:
+                await conn.ping(reconnect=True)
+            except Exception:
+                _wait_stats["health_check_failures"] += 1
+                logger.warning("Pooled MySQL connection failed its health check", exc_info=True)
+                conn.close()  # the pool drops closed connections on release
+                raise
+        yield conn
+    finally:
+        pool.release(conn)
+
+
+@asynccontextmanager
+async def transaction() -> AsyncIterator[aiomysql.Connection]:
+    """Connection with an open transaction: commit on success, rollback on error."""
+    async with acquire() as conn:
+        await conn.begin()
+        try:
+            yield conn
+        except BaseException:
+            await conn.rollback()
+            raise
+        await conn.commit()
+
+
+def get_async_pool_stats() -> Optional[Dict[str, Any]]:
+    """Async pool metrics for monitoring, or None if the pool was never used."""
+    if _pool is None:
+        return None
+    checkouts = _wait_stats["checkouts"]
+    in_use = _pool.size - _pool.freesize
+    return {
+        "min_size": _pool.minsize,
+        "max_size": _pool.maxsize,
+        "size": _pool.size,
+        "in_use": in_use,
+        "idle": _pool.freesize,
+        "saturation": round(in_use / _pool.maxsize, 3) if _pool.maxsize else 0.0,
+        "checkouts": checkouts,
+        "avg_wait_ms": round(_wait_stats["total_wait"] / checkouts * 1000, 3) if checkouts else 0.0,
+        "max_wait_ms": round(_wait_stats["max_wait"] * 1000, 3),
+        "timeouts": _wait_stats["timeouts"],
+        "health_check_failures": _wait_stats["health_check_failures"]
+    }
+
+
+async def close_async_pool() -> None:
+    """Close the pool and wait for its connections to shut down."""
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        await _pool.wait_closed()
+        _pool = None
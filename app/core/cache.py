@@ -0,0 +1,176 @@
+"""
+Persistent SQLite-backed caches
+
+SQLiteCache stores JSON-serializable values on local disk so they survive
+restarts, with LRU eviction above max_entries, optional TTL expiry and
+hit/miss counters. Hits do not write: last_access updates are buffered and
+flushed in batches, and the entry count is tracked in memory.
+"""
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.core.config import (
+    PARSE_CACHE_PATH,
+    PARSE_CACHE_MAX_ENTRIES,
+    PARSE_CACHE_TTL,
+    LLM_CACHE_PATH,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_TTL
+)
+
+ACCESS_FLUSH_SIZE = 256  # buffered last_access updates written in one batch
+ACCESS_FLUSH_SECONDS = 30.0
+
+
+class SQLiteCache:
+    """Thread-safe key/value cache persisted in a single SQLite file."""
+
+    def __init__(self, path: Path, max_entries: int, ttl: Optional[int] = None):
+        """
+        Args:
+            path: SQLite database file
+            max_entries: Least recently used entries are evicted above this size
+            ttl: Seconds an entry stays valid (None = no expiry)
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_last_access ON cache (last_access)")
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        self._accessed: Dict[str, float] = {}
+        self._accessed_flushed = time.monotonic()
+
+    def _flush_access(self) -> None:
+        """Write buffered last_access times (caller holds the lock)."""
+        if self._accessed:
+            self._conn.executemany(
+                "UPDATE cache SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._accessed.items()]
+            )
+            self._conn.commit()
+            self._accessed.clear()
+        self._accessed_flushed = time.monotonic()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            if self.ttl is not None and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self._accessed.pop(key, None)
+                self._count -= 1
+                self.evictions += 1
+                self.misses += 1
+                return None
+            self._accessed[key] = now
+            if (len(self._accessed) >= ACCESS_FLUSH_SIZE
+                    or time.monotonic() - self._accessed_flushed >= ACCESS_FLUSH_SECONDS):
+                self._flush_access()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        """Store value under key and evict least recently used entries if over capacity."""
+        now = time.time()
+        payload = json.dumps(value, ensure_ascii=False, default=str)
+        with self._lock:
+            exists = self._conn.execute("SELECT 1 FROM cache WHERE key = ?", (key,)).fetchone() is not None
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, payload, now, now)
+            )
+            self._accessed.pop(key, None)
+            if not exists:
+                self._count += 1
+            if self._count > self.max_entries:
+                # Resync in case another process shares the file, and order by up-to-date access times
+                self._flush_access()
+                self._count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+                excess = self._count - self.max_entries
+                if excess > 0:
+                    self._conn.execute(
+                        "DELETE FROM cache WHERE key IN "
+                        "(SELECT key FROM cache ORDER BY last_access ASC LIMIT ?)",
+                        (excess,)
+                    )
+                    self._count -= excess
+                    self.evictions += excess
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        """Remove a single entry."""
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM cache WHERE key = ?", (key,)).rowcount
+            self._conn.commit()
+            self._accessed.pop(key, None)
+            self._count -= deleted
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+            self._accessed.clear()
+            self._count = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and hit/miss/eviction counters."""
+        entries = self._count
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+
+_parse_cache: Optional[SQLiteCache] = None
+_llm_cache: Optional[SQLiteCache] = None
+
+
+def get_parse_cache() -> SQLiteCache:
+    """Cache of parse results keyed by resume file hash and parser version."""
+    global _parse_cache
+    if _parse_cache is None:
+        _parse_cache = SQLiteCache(PARSE_CACHE_PATH, PARSE_CACHE_MAX_ENTRIES, PARSE_CACHE_TTL)
+    return _parse_cache
+
+
+def get_llm_cache() -> SQLiteCache:
+    """Cache of LLM completions keyed by model, messages and parameters."""
+    global _llm_cache
+    if _llm_cache is None:
+        _llm_cache = SQLiteCache(LLM_CACHE_PATH, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTL)
+    return _llm_cache
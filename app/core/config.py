@@ -20,4 +20,101 @@ APP_VERSION = "1.0.0"
 # CORS Configuration
 CORS_ORIGINS = ["*"]  # In production, specify actual origins
 
+# LLM (Groq) Configuration
+LLM_MODEL = os.getenv("LLM_MODEL", "qwen/qwen3-32b")
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "30"))
 
+# Executor Configuration
+CPU_POOL_SIZE = int(os.getenv("CPU_POOL_SIZE", str(os.cpu_count() or 2)))
+IO_POOL_SIZE = int(os.getenv("IO_POOL_SIZE", "32"))
+
+# Database Configuration
+DB_HOST = os.getenv("DB_HOST", "localhost")
+DB_PORT = int(os.getenv("DB_PORT", "3306"))
+DB_USER = os.getenv("DB_USER", "root")
+DB_PASSWORD = os.getenv("DB_PASSWORD", "Airesume@s2")
+DB_NAME = os.getenv("DB_NAME", "testing1")
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))  # seconds to wait for a free connection
+DB_POOL_HEALTH_CHECK = os.getenv("DB_POOL_HEALTH_CHECK", "true").lower() == "true"  # ping on checkout
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+
+# Cache Configuration
+CACHE_DIR = Path(os.getenv("CACHE_DIR", str(BASE_DIR / ".cache")))
+PARSE_CACHE_PATH = CACHE_DIR / "parse_cache.sqlite3"
+PARSE_CACHE_VERSION = "1"  # Bump to invalidate cached parses after parser changes
+PARSE_CACHE_MAX_ENTRIES = int(os.getenv("PARSE_CACHE_MAX_ENTRIES", "10000"))
+PARSE_CACHE_TTL = int(os.getenv("PARSE_CACHE_TTL", str(30 * 24 * 3600)))  # seconds
+LLM_CACHE_PATH = CACHE_DIR / "llm_cache.sqlite3"
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "0")) or None  # seconds, 0 = never expire
+
+# Batch Parse Configuration
+PARSE_BATCH_MAX_FILES = int(os.getenv("PARSE_BATCH_MAX_FILES", "500"))  # per request
+PARSE_BATCH_CONCURRENCY = int(os.getenv("PARSE_BATCH_CONCURRENCY", "8"))  # resumes extracted/parsed at once
+PARSE_BATCH_WRITE_SIZE = int(os.getenv("PARSE_BATCH_WRITE_SIZE", "50"))  # parsed rows written per transaction
+
+# Offline Ingestion (python -m app.ingest) Configuration
+INGEST_LLM_CONCURRENCY = int(os.getenv("INGEST_LLM_CONCURRENCY", "8"))  # resumes in LLM stages at once
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "100"))  # resumes per MySQL transaction
+INGEST_FLUSH_SECONDS = float(os.getenv("INGEST_FLUSH_SECONDS", "30"))  # write a partial batch after this long
+
+# Upload Configuration
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "D:/ai_screen/app/uploads")
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))  # 1 MB
+MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE", str(10 * 1024 * 1024)))  # 10 MB
+BATCH_UPLOAD_MAX_FILES = int(os.getenv("BATCH_UPLOAD_MAX_FILES", "2000"))  # per request, zip members included
+BATCH_UPLOAD_MAX_ARCHIVE_SIZE = int(os.getenv("BATCH_UPLOAD_MAX_ARCHIVE_SIZE", str(1024 * 1024 * 1024)))  # 1 GB
+BATCH_UPLOAD_MAX_TOTAL_SIZE = int(os.getenv("BATCH_UPLOAD_MAX_TOTAL_SIZE", str(2 * 1024 * 1024 * 1024)))  # 2 GB written per request
+BATCH_UPLOAD_CONCURRENCY = int(os.getenv("BATCH_UPLOAD_CONCURRENCY", "8"))  # files written at once
+
+# PDF Extraction Configuration
+PDF_BACKEND = os.getenv("PDF_BACKEND", "pypdf2")  # pypdf2 | pdfium | pdfminer (see Parser/pdf_backends.py)
+PDF_PARALLEL_PAGE_THRESHOLD = int(os.getenv("PDF_PARALLEL_PAGE_THRESHOLD", "8"))  # pages
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "4"))
+
+# Background Pipeline Queue Configuration
+DATA_DIR = Path(os.getenv("DATA_DIR", str(BASE_DIR / ".data")))
+PIPELINE_QUEUE_PATH = DATA_DIR / "pipeline_jobs.sqlite3"
+PIPELINE_UPLOAD_DIR = DATA_DIR / "pipeline_uploads"
+PIPELINE_WORKERS = int(os.getenv("PIPELINE_WORKERS", "4"))
+PIPELINE_MAX_PENDING = int(os.getenv("PIPELINE_MAX_PENDING", "500"))
+PIPELINE_LEASE_SECONDS = int(os.getenv("PIPELINE_LEASE_SECONDS", "300"))  # a running job is requeued if not renewed
+
+# Distributed Task Queue Configuration (MySQL work_tasks table, shared by all nodes)
+TASK_WORKERS = int(os.getenv("TASK_WORKERS", "2"))  # per node, 0 = enqueue only
+TASK_LEASE_SECONDS = int(os.getenv("TASK_LEASE_SECONDS", "120"))
+TASK_MAX_ATTEMPTS = int(os.getenv("TASK_MAX_ATTEMPTS", "3"))
+TASK_RETRY_BACKOFF = int(os.getenv("TASK_RETRY_BACKOFF", "10"))  # seconds, multiplied by attempt
+TASK_POLL_INTERVAL = float(os.getenv("TASK_POLL_INTERVAL", "1.0"))  # seconds
+
+# Question Generation Configuration
+QUESTION_GROUP_SIZE = int(os.getenv("QUESTION_GROUP_SIZE", "6"))  # topics per LLM call
+QUESTION_CONCURRENCY = int(os.getenv("QUESTION_CONCURRENCY", "4"))  # parallel LLM calls per request
+
+# Candidate Ranking Configuration
+RANKING_TOP_K = int(os.getenv("RANKING_TOP_K", "50"))  # candidates re-scored by the LLM
+RANKING_MAX_TOP_K = int(os.getenv("RANKING_MAX_TOP_K", "500"))
+RANKING_LLM_CONCURRENCY = int(os.getenv("RANKING_LLM_CONCURRENCY", "8"))
+
+# Skill Index Configuration
+SKILL_INDEX_REFRESH_SECONDS = float(os.getenv("SKILL_INDEX_REFRESH_SECONDS", "30"))  # pull other nodes' changes, 0 = off
+
+# Full-text (BM25) Index Configuration
+BM25_K1 = float(os.getenv("BM25_K1", "1.5"))
+BM25_B = float(os.getenv("BM25_B", "0.75"))
+TEXT_INDEX_FLUSH_SIZE = int(os.getenv("TEXT_INDEX_FLUSH_SIZE", "256"))  # buffered docs per new segment
+TEXT_INDEX_MERGE_FACTOR = int(os.getenv("TEXT_INDEX_MERGE_FACTOR", "8"))  # same-size segments merged at once
+TEXT_INDEX_REFRESH_SECONDS = float(os.getenv("TEXT_INDEX_REFRESH_SECONDS", "30"))  # pull other nodes' texts, 0 = off
+
+# List Pagination Configuration
+LIST_PAGE_SIZE = int(os.getenv("LIST_PAGE_SIZE", "50"))
+LIST_MAX_PAGE_SIZE = int(os.getenv("LIST_MAX_PAGE_SIZE", "500"))
+
+# Bulk Export Configuration
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))  # rows per server-side cursor fetch
@@ -0,0 +1,86 @@
+"""
+Bounded executors for blocking work
+
+CPU-bound work (PDF parsing) runs in a process pool and blocking I/O
+(database, OCR, email) runs in a thread pool, so async route handlers
+never stall the event loop. Pool sizes come from app/core/config.py.
+"""
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.core.config import CPU_POOL_SIZE, IO_POOL_SIZE
+
+_cpu_executor: Optional[ProcessPoolExecutor] = None
+_io_executor: Optional[ThreadPoolExecutor] = None
+
+
+def set_cpu_pool_size(size: int) -> None:
+    """Override CPU_POOL_SIZE before the process pool is first used (e.g. from a CLI flag)."""
+    global CPU_POOL_SIZE
+    if _cpu_executor is not None:
+        raise RuntimeError("CPU pool already started")
+    CPU_POOL_SIZE = max(1, size)
+
+
+def get_cpu_executor() -> ProcessPoolExecutor:
+    """Return the shared process pool, creating it on first use."""
+    global _cpu_executor
+    if _cpu_executor is None:
+        # spawn: never fork a process that already runs an event loop and threads
+        _cpu_executor = ProcessPoolExecutor(
+            max_workers=CPU_POOL_SIZE,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _cpu_executor
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """Return the shared thread pool, creating it on first use."""
+    global _io_executor
+    if _io_executor is None:
+        _io_executor = ThreadPoolExecutor(max_workers=IO_POOL_SIZE, thread_name_prefix="io")
+    return _io_executor
+
+
+async def run_cpu(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a CPU-bound function in the process pool.
+
+    Args:
+        func: Picklable, module-level callable
+        *args, **kwargs: Arguments passed to func (must be picklable)
+
+    Returns:
+        Result of func
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_cpu_executor(), functools.partial(func, *args, **kwargs))
+
+
+async def run_io(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking I/O function in the thread pool.
+
+    Args:
+        func: Blocking callable
+        *args, **kwargs: Arguments passed to func
+
+    Returns:
+        Result of func
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_io_executor(), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_executors() -> None:
+    """Shut down both pools, waiting for running work to finish."""
+    global _cpu_executor, _io_executor
+    if _cpu_executor is not None:
+        _cpu_executor.shutdown(wait=True)
+        _cpu_executor = None
+    if _io_executor is not None:
+        _io_executor.shutdown(wait=True)
+        _io_executor = None
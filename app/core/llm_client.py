@@ -0,0 +1,230 @@
+"""
+Shared async LLM client
+
+One AsyncGroq client is created lazily per process and reused by every
+parser stage, so HTTP keep-alive connections are pooled across requests
+instead of being rebuilt on every call.
+
+Completions are memoized on disk. Deterministic calls (temperature 0) are
+cached by default; sampled calls are only cached when the caller opts in.
+stream_chat_completion yields tokens as Groq produces them; cancelling the
+consumer closes the underlying HTTP stream so the generation is abandoned.
+track_usage() totals calls, tokens and LLM time for everything awaited
+inside it, including calls made by concurrently gathered tasks.
+"""
+import hashlib
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+import httpx
+from groq import AsyncGroq
+
+from app.core.cache import get_llm_cache
+from app.core.executors import run_io
+from app.core.config import (
+    LLM_MODEL,
+    LLM_TIMEOUT,
+    LLM_MAX_RETRIES,
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_KEEPALIVE_CONNECTIONS,
+    LLM_KEEPALIVE_EXPIRY
+)
+
+_client: Optional[AsyncGroq] = None
+_usage: ContextVar[Optional[Dict[str, Any]]] = ContextVar("llm_usage", default=None)
+
+
+def get_llm_client() -> AsyncGroq:
+    """
+    Return the process-wide AsyncGroq client, creating it on first use.
+
+    Returns:
+        Shared AsyncGroq client backed by a pooled httpx.AsyncClient
+    """
+    global _client
+    if _client is None:
+        # Loaded lazily: Parser.resume_parser imports this module
+        from Parser.resume_parser import api_key
+
+        http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(LLM_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=LLM_KEEPALIVE_EXPIRY
+            )
+        )
+        _client = AsyncGroq(
+            api_key=api_key,
+            http_client=http_client,
+            max_retries=LLM_MAX_RETRIES
+        )
+    return _client
+
+
+@contextmanager
+def track_usage() -> Iterator[Dict[str, Any]]:
+    """
+    Collect LLM usage for the calls made inside the block.
+
+    Returns:
+        Dict updated in place: calls, cached_calls, prompt_tokens,
+        completion_tokens, total_tokens and llm_ms
+    """
+    usage = {
+        "calls": 0,
+        "cached_calls": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "total_tokens": 0,
+        "llm_ms": 0.0
+    }
+    token = _usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage.reset(token)
+
+
+def _record_usage(response_usage: Any = None, seconds: float = 0.0, cached: bool = False) -> None:
+    usage = _usage.get()
+    if usage is None:
+        return
+    usage["calls"] += 1
+    if cached:
+        usage["cached_calls"] += 1
+    if response_usage is not None:
+        usage["prompt_tokens"] += response_usage.prompt_tokens or 0
+        usage["completion_tokens"] += response_usage.completion_tokens or 0
+        usage["total_tokens"] += response_usage.total_tokens or 0
+    usage["llm_ms"] = round(usage["llm_ms"] + seconds * 1000, 2)
+
+
+def _cache_key(model: str, messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> str:
+    """Stable hash of everything that determines a completion."""
+    payload = json.dumps(
+        {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        },
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return "llm:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def chat_completion(
+    messages: List[Dict[str, str]],
+    temperature: float = 0.0,
+    max_tokens: int = 2500,
+    model: str = LLM_MODEL,
+    cache: Optional[bool] = None
+) -> str:
+    """
+    Run a chat completion on the shared client.
+
+    Args:
+        messages: Chat messages (role/content dicts)
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens to generate
+        model: Groq model name
+        cache: True to use the response cache, False to bypass it,
+               None to cache only deterministic (temperature 0) calls
+
+    Returns:
+        Content of the first choice
+    """
+    use_cache = (temperature == 0) if cache is None else cache
+    key = _cache_key(model, messages, temperature, max_tokens) if use_cache else None
+
+    if key:
+        cached = await run_io(get_llm_cache().get, key)
+        if cached is not None:
+            _record_usage(cached=True)
+            return cached
+
+    client = get_llm_client()
+    started = time.perf_counter()
+    response = await client.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        max_tokens=max_tokens
+    )
+    _record_usage(response.usage, time.perf_counter() - started)
+    content = response.choices[0].message.content
+
+    if key and content:
+        await run_io(get_llm_cache().set, key, content)
+    return content
+
+
+async def stream_chat_completion(
+    messages: List[Dict[str, str]],
+    temperature: float = 0.0,
+    max_tokens: int = 2500,
+    model: str = LLM_MODEL,
+    cache: Optional[bool] = None
+) -> AsyncIterator[str]:
+    """
+    Stream a chat completion on the shared client, one content delta at a time.
+
+    Args:
+        messages: Chat messages (role/content dicts)
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens to generate
+        model: Groq model name
+        cache: Same semantics as chat_completion; a cache hit is yielded as one chunk
+
+    Yields:
+        Content deltas of the first choice, in order
+    """
+    use_cache = (temperature == 0) if cache is None else cache
+    key = _cache_key(model, messages, temperature, max_tokens) if use_cache else None
+
+    if key:
+        cached = await run_io(get_llm_cache().get, key)
+        if cached is not None:
+            _record_usage(cached=True)
+            yield cached
+            return
+
+    client = get_llm_client()
+    started = time.perf_counter()
+    stream = await client.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        stream=True
+    )
+    parts = []
+    try:
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+    finally:
+        # Runs on completion, error, cancellation or early aclose(): drops the connection
+        await stream.close()
+        _record_usage(seconds=time.perf_counter() - started)
+
+    content = "".join(parts)
+    if key and content:
+        await run_io(get_llm_cache().set, key, content)
+
+
+async def close_llm_client() -> None:
+    """Close the shared client and release its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
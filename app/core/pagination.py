@@ -0,0 +1,94 @@
+"""
+Keyset (cursor) pagination helpers
+
+List endpoints order by (timestamp, id) descending and continue after the
+last row of the previous page instead of using OFFSET, so every page costs
+one index range scan no matter how deep the client pages. The cursor is an
+opaque URL-safe token holding that last (timestamp, id) pair.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+
+TOTAL_MODES = ("none", "approx", "exact")
+
+
+def encode_cursor(sort_value: datetime, row_id: Any) -> str:
+    """Opaque cursor pointing just after the given row."""
+    payload = json.dumps([sort_value.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, str]]:
+    """
+    Decode a cursor from encode_cursor.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(sort_value), str(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def select_columns(fields: Optional[str], allowed: Sequence[str], default: Sequence[str],
+                   required: Sequence[str]) -> List[str]:
+    """
+    Columns to select for a comma-separated `fields` parameter.
+
+    Args:
+        fields: Requested fields, e.g. "id,file_name"; None or empty for the default set
+        allowed: Columns a client may request
+        default: Columns returned when no fields are requested
+        required: Columns always selected (the keyset sort columns)
+
+    Raises:
+        HTTPException: 400 for unknown fields
+    """
+    requested = [field.strip() for field in fields.split(",") if field.strip()] if fields else list(default)
+    unknown = [field for field in requested if field not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+        )
+    return list(dict.fromkeys([*required, *requested]))
+
+
+async def count_total(
+    mode: str,
+    exact: Callable[[], Awaitable[int]],
+    approx: Callable[[], Awaitable[int]]
+) -> Optional[int]:
+    """Total row count for a list response: None, a table-statistics estimate or an exact COUNT(*)."""
+    if mode == "exact":
+        return await exact()
+    if mode == "approx":
+        return await approx()
+    return None
+
+
+def page_response(
+    rows: List[Dict[str, Any]],
+    page_size: int,
+    sort_key: str,
+    id_key: str
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Trim a page fetched with LIMIT page_size + 1.
+
+    Returns:
+        (rows of this page, cursor for the next page or None on the last page)
+    """
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, encode_cursor(rows[-1][sort_key], rows[-1][id_key])
@@ -0,0 +1,303 @@
+"""
+Streaming upload handling
+
+Uploads are copied to their destination in fixed-size chunks. The SHA-256
+digest, byte count and file type (from magic bytes) are computed as the
+chunks arrive, and oversized or unsupported files are rejected as soon as
+that is known, so no upload is ever held in memory in full. Zip archives of
+resumes are unpacked member by member under the same rules. A batch
+request shares one UploadBudget, so the bytes written across all of its
+files and archive members stay under a single cap.
+"""
+import hashlib
+import os
+import threading
+import zipfile
+from typing import Any, BinaryIO, Dict, List, NamedTuple, Optional
+from uuid import uuid4
+
+from fastapi import HTTPException, UploadFile
+
+from app.core.config import UPLOAD_CHUNK_SIZE, MAX_UPLOAD_SIZE
+from app.core.executors import run_io
+
+# Magic-byte signatures -> canonical extension
+FILE_SIGNATURES = [
+    (b"%PDF-", ".pdf"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+    (b"BM", ".bmp"),
+]
+
+SUPPORTED_EXTENSIONS = ['.pdf', '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp']
+
+ZIP_SIGNATURE = b"PK\x03\x04"
+
+
+class UploadInfo(NamedTuple):
+    """Facts gathered while streaming an upload."""
+    size: int
+    sha256: str
+    file_type: str  # canonical extension, e.g. ".pdf"
+
+
+class UploadBudget:
+    """Bytes left for one batch request; shared by the event loop and run_io threads."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def take(self, size: int) -> bool:
+        """Charge size bytes; False (nothing charged) if that would exceed the budget."""
+        with self._lock:
+            if self.used + size > self.max_bytes:
+                return False
+            self.used += size
+            return True
+
+
+def sniff_file_type(head: bytes) -> Optional[str]:
+    """
+    Detect the file type from its first bytes.
+
+    Args:
+        head: Leading bytes of the file (at least 12 for WEBP)
+
+    Returns:
+        Canonical extension (".pdf", ".png", ...) or None if unsupported
+    """
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    for signature, extension in FILE_SIGNATURES:
+        if head.startswith(signature):
+            return extension
+    return None
+
+
+async def stream_upload(
+    file: UploadFile,
+    out: Optional[BinaryIO] = None,
+    max_size: int = MAX_UPLOAD_SIZE,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+    budget: Optional[UploadBudget] = None
+) -> UploadInfo:
+    """
+    Copy an upload into a writable binary stream chunk by chunk.
+    With no destination the upload is only validated and hashed, so the
+    caller can seek back and hand the spooled upload on as-is.
+
+    Args:
+        file: Incoming upload
+        out: Destination stream (file, BytesIO, ...) or None to only inspect
+        max_size: Maximum accepted size in bytes
+        chunk_size: Bytes read per chunk
+        budget: Batch-wide byte budget charged as chunks arrive
+
+    Returns:
+        UploadInfo with size, SHA-256 hex digest and detected file type
+
+    Raises:
+        HTTPException: 413 if the upload exceeds max_size or the budget,
+                       400 if the file type is unsupported or the file is empty
+    """
+    # Reject early when the multipart parser already knows the size
+    if file.size is not None and file.size > max_size:
+        raise HTTPException(status_code=413, detail=f"File exceeds maximum upload size of {max_size} bytes")
+
+    digest = hashlib.sha256()
+    size = 0
+    file_type = None
+
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_size:
+            raise HTTPException(status_code=413, detail=f"File exceeds maximum upload size of {max_size} bytes")
+        if budget is not None and not budget.take(len(chunk)):
+            raise HTTPException(status_code=413, detail=f"Batch exceeds {budget.max_bytes} bytes")
+        if file_type is None:
+            file_type = sniff_file_type(chunk)
+            if file_type is None:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Unsupported file type. Supported: {', '.join(SUPPORTED_EXTENSIONS)}"
+                )
+        digest.update(chunk)
+        if out is not None:
+            await run_io(out.write, chunk)
+
+    if size == 0:
+        raise HTTPException(status_code=400, detail="Uploaded file is empty")
+
+    return UploadInfo(size=size, sha256=digest.hexdigest(), file_type=file_type)
+
+
+def remove_file(path: str) -> None:
+    """Delete a file if it exists (blocking; use via run_io)."""
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+async def save_upload(
+    file: UploadFile,
+    path: str,
+    max_size: int = MAX_UPLOAD_SIZE,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+    budget: Optional[UploadBudget] = None
+) -> UploadInfo:
+    """
+    Stream an upload to a file on disk. A partially written file is
+    removed if the upload is rejected or fails.
+
+    Args:
+        file: Incoming upload
+        path: Destination file path
+        max_size: Maximum accepted size in bytes
+        chunk_size: Bytes read per chunk
+        budget: Batch-wide byte budget charged as chunks arrive
+
+    Returns:
+        UploadInfo with size, SHA-256 hex digest and detected file type
+    """
+    out = await run_io(open, path, "wb")
+    try:
+        info = await stream_upload(file, out, max_size=max_size, chunk_size=chunk_size, budget=budget)
+    except BaseException:
+        await run_io(out.close)
+        await run_io(remove_file, path)
+        raise
+    await run_io(out.close)
+    return info
+
+
+async def is_zip_upload(file: UploadFile) -> bool:
+    """True if the upload is a zip archive (checked by magic bytes; the upload is rewound)."""
+    head = await file.read(len(ZIP_SIGNATURE))
+    await file.seek(0)
+    return head == ZIP_SIGNATURE
+
+
+def _resume_members(archive: zipfile.ZipFile) -> List[zipfile.ZipInfo]:
+    """Archive members that are resumes: folders and macOS/hidden metadata entries are skipped."""
+    return [
+        member for member in archive.infolist()
+        if not member.is_dir()
+        and not member.filename.startswith("__MACOSX/")
+        and not os.path.basename(member.filename).startswith(".")
+    ]
+
+
+def count_zip_members(source: BinaryIO) -> int:
+    """
+    Count the resumes in a zip archive from its central directory, without
+    extracting anything (blocking; use via run_io). The stream is rewound.
+
+    Args:
+        source: Seekable binary stream holding the archive
+
+    Returns:
+        Number of resume members, 0 if the archive is invalid
+    """
+    try:
+        with zipfile.ZipFile(source) as archive:
+            return len(_resume_members(archive))
+    except zipfile.BadZipFile:
+        return 0
+    finally:
+        source.seek(0)
+
+
+def _extract_member(
+    archive: zipfile.ZipFile,
+    member: zipfile.ZipInfo,
+    dest_dir: str,
+    max_size: int,
+    chunk_size: int,
+    budget: Optional[UploadBudget]
+) -> Dict[str, Any]:
+    file_name = os.path.basename(member.filename)
+    if member.file_size > max_size:
+        return {"filename": file_name, "error": f"File exceeds maximum upload size of {max_size} bytes"}
+
+    file_id = str(uuid4())
+    partial_path = os.path.join(dest_dir, f"{file_id}.part")
+    digest = hashlib.sha256()
+    size = 0
+    file_type = None
+    try:
+        with archive.open(member) as source, open(partial_path, "wb") as out:
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:  # the header may understate the real size
+                    raise ValueError(f"File exceeds maximum upload size of {max_size} bytes")
+                if budget is not None and not budget.take(len(chunk)):
+                    raise ValueError(f"Batch exceeds {budget.max_bytes} bytes")
+                if file_type is None:
+                    file_type = sniff_file_type(chunk)
+                    if file_type is None:
+                        raise ValueError(f"Unsupported file type. Supported: {', '.join(SUPPORTED_EXTENSIONS)}")
+                digest.update(chunk)
+                out.write(chunk)
+        if size == 0:
+            raise ValueError("File is empty")
+        file_path = os.path.join(dest_dir, f"{file_id}{file_type}")
+        os.replace(partial_path, file_path)
+    except (ValueError, OSError, zipfile.BadZipFile, RuntimeError) as e:  # RuntimeError: encrypted member
+        remove_file(partial_path)
+        return {"filename": file_name, "error": str(e)}
+
+    return {
+        "filename": file_name,
+        "file_id": file_id,
+        "file_path": file_path,
+        "size": size,
+        "sha256": digest.hexdigest()
+    }
+
+
+def extract_zip(
+    source: BinaryIO,
+    dest_dir: str,
+    max_files: int,
+    max_size: int = MAX_UPLOAD_SIZE,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+    budget: Optional[UploadBudget] = None
+) -> List[Dict[str, Any]]:
+    """
+    Unpack every resume in a zip archive into dest_dir (blocking; use via run_io).
+    Each member is streamed, size-limited, hashed and type-sniffed like a
+    regular upload; folders and macOS metadata entries are skipped.
+
+    Args:
+        source: Seekable binary stream holding the archive
+        dest_dir: Directory to store extracted files in
+        max_files: Maximum number of resumes accepted from the archive
+        budget: Batch-wide byte budget charged as members are written
+
+    Returns:
+        One dict per member: filename, file_id, file_path, size and sha256, or filename and error
+
+    Raises:
+        HTTPException: 400 if the archive is invalid or holds more than max_files files
+    """
+    try:
+        archive = zipfile.ZipFile(source)
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="Invalid zip archive")
+
+    with archive:
+        members = _resume_members(archive)
+        if len(members) > max_files:
+            raise HTTPException(status_code=400, detail=f"Archive holds more than {max_files} files")
+        return [_extract_member(archive, member, dest_dir, max_size, chunk_size, budget) for member in members]
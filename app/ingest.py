@@ -0,0 +1,460 @@
+"""
+Offline bulk ingestion of a resume archive
+
+Walks a directory tree or a zip archive and runs every resume through the
+same steps as the API: text extraction in the CPU process pool, the Groq
+parse (and optionally key extraction) with bounded async concurrency, and
+batched MySQL writes. A resume is appended to the checkpoint file only
+after its batch is committed, so an interrupted run picks up where it
+stopped without redoing (or paying the LLM again for) finished work.
+Only permanent failures (unsupported or unreadable file, no text, invalid
+model JSON) are checkpointed. Transient errors (Groq rate limits and
+outages, a crashed worker pool, I/O errors) are retried with backoff; if
+they persist the run stops after committing what is finished, and those
+resumes are picked up again by the next run.
+
+Usage:
+    python -m app.ingest /archive/resumes [--extract-keys] [--workers 8] [--llm-concurrency 16]
+    python -m app.ingest resumes.zip --checkpoint .data/ingest_resumes.jsonl
+
+Directory sources are recorded with their path on disk; zip members are
+extracted into UPLOAD_DIR.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zipfile
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Set
+from uuid import NAMESPACE_URL, uuid5
+
+import groq
+from fastapi import HTTPException
+
+from app.core.async_database import close_async_pool
+from app.core.config import (
+    CPU_POOL_SIZE,
+    DATA_DIR,
+    UPLOAD_DIR,
+    MAX_UPLOAD_SIZE,
+    INGEST_LLM_CONCURRENCY,
+    INGEST_BATCH_SIZE,
+    INGEST_FLUSH_SECONDS
+)
+from app.core.executors import run_io, set_cpu_pool_size, shutdown_executors
+from app.core.llm_client import close_llm_client
+from app.core.uploads import SUPPORTED_EXTENSIONS, sniff_file_type
+from app.services.resume_service import ResumeService
+
+logger = logging.getLogger("app.ingest")
+
+DB_WRITE_ATTEMPTS = 3
+ITEM_ATTEMPTS = 3  # tries per resume and stage before a transient error aborts the run
+PERMANENT_LLM_STATUSES = (400, 413, 422)  # Groq rejected this resume's request itself
+
+
+def _is_transient(error: BaseException) -> bool:
+    """True for errors worth retrying: Groq rate limits/outages, a crashed worker pool, I/O and cache errors."""
+    if isinstance(error, groq.APIStatusError):
+        return error.status_code not in PERMANENT_LLM_STATUSES
+    if isinstance(error, OSError):
+        return not isinstance(error, FileNotFoundError)
+    return isinstance(error, (groq.APIError, BrokenProcessPool, sqlite3.Error))
+
+
+class SourceItem(NamedTuple):
+    """One resume in the source."""
+    key: str  # path relative to the directory, or zip member name
+    name: str  # recorded as resumes.file_name
+
+
+class ResumeSource:
+    """Resumes in a directory tree or a zip archive."""
+
+    def __init__(self, root: Path):
+        self.root = root.resolve()
+        self.archive = zipfile.ZipFile(self.root) if self.root.is_file() else None
+        self._lock = threading.Lock()  # ZipFile reads are not thread-safe
+
+    def items(self) -> List[SourceItem]:
+        """Every supported file, in a stable order."""
+        if self.archive is not None:
+            keys = [info.filename for info in self.archive.infolist()
+                    if not info.is_dir() and not info.filename.startswith("__MACOSX/")]
+        else:
+            keys = [
+                os.path.relpath(os.path.join(directory, name), self.root).replace(os.sep, "/")
+                for directory, _, names in os.walk(self.root) for name in names
+            ]
+        return [
+            SourceItem(key, os.path.basename(key)) for key in sorted(keys)
+            if os.path.splitext(key)[1].lower() in SUPPORTED_EXTENSIONS
+            and not os.path.basename(key).startswith(".")
+        ]
+
+    def read(self, item: SourceItem) -> bytes:
+        """File bytes (blocking; use via run_io)."""
+        if self.archive is not None:
+            if self.archive.getinfo(item.key).file_size > MAX_UPLOAD_SIZE:
+                raise ValueError(f"File exceeds maximum upload size of {MAX_UPLOAD_SIZE} bytes")
+            with self._lock:
+                return self.archive.read(item.key)
+        path = self.root / item.key
+        if path.stat().st_size > MAX_UPLOAD_SIZE:
+            raise ValueError(f"File exceeds maximum upload size of {MAX_UPLOAD_SIZE} bytes")
+        return path.read_bytes()
+
+    def file_id(self, item: SourceItem) -> str:
+        """Stable id, so a resume re-run after a crash updates its rows instead of duplicating them."""
+        return str(uuid5(NAMESPACE_URL, f"{self.root.as_uri()}#{item.key}"))
+
+    def default_checkpoint(self) -> Path:
+        digest = hashlib.sha256(str(self.root).encode("utf-8")).hexdigest()[:12]
+        return DATA_DIR / f"ingest_{self.root.stem}_{digest}.jsonl"
+
+
+class Checkpoint:
+    """Append-only JSONL log of resumes that are committed (or permanently failed)."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.status: Dict[str, str] = {}
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn last line from a crash mid-write
+                    self.status[entry["key"]] = entry["status"]
+
+    def finished(self, retry_failed: bool) -> Set[str]:
+        return {key for key, status in self.status.items() if status == "done" or not retry_failed}
+
+    def record(self, entries: List[Dict[str, Any]]) -> None:
+        """Append entries and fsync (blocking; use via run_io)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                self.status[entry["key"]] = entry["status"]
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class _Parsed(NamedTuple):
+    item: SourceItem
+    file_id: str
+    file_path: str
+    content_hash: str
+    resume_text: str
+    extracted_data: Optional[Any]  # set when served from the parse cache
+
+
+def _write_file(path: str, content: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+def _duration(seconds: float) -> str:
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    return f"{hours}h{rest // 60:02d}m" if hours else f"{rest // 60}m{rest % 60:02d}s"
+
+
+class Ingestor:
+    """Three-stage pipeline: extract (process pool) -> LLM (bounded) -> batched MySQL writes."""
+
+    def __init__(
+        self,
+        source: ResumeSource,
+        checkpoint: Checkpoint,
+        extract_workers: int,
+        llm_concurrency: int = INGEST_LLM_CONCURRENCY,
+        batch_size: int = INGEST_BATCH_SIZE,
+        extract_keys: bool = False,
+        use_cache: bool = True
+    ):
+        self.source = source
+        self.checkpoint = checkpoint
+        self.extract_workers = extract_workers
+        self.llm_concurrency = llm_concurrency
+        self.batch_size = batch_size
+        self.extract_keys = extract_keys
+        self.use_cache = use_cache
+        self.resume_service = ResumeService()
+        self.counts = {"done": 0, "failed": 0, "cache_hits": 0}
+        self.fatal: Optional[BaseException] = None  # transient error that outlasted its retries
+
+    # ---------- Stages ----------
+
+    async def _extract(self, items: asyncio.Queue, parsed: asyncio.Queue, results: asyncio.Queue) -> None:
+        while self.fatal is None:
+            try:
+                item = items.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                await self._attempt(item, self._extract_one, item, parsed)
+            except Exception as e:
+                if _is_transient(e):
+                    self._abort(item, e)
+                    return
+                await results.put(self._failure(item, e))
+
+    async def _extract_one(self, item: SourceItem, parsed: asyncio.Queue) -> None:
+        content = await run_io(self.source.read, item)
+        file_type = sniff_file_type(content[:16])
+        if file_type is None:
+            raise ValueError("Unsupported file type")
+        file_id = self.source.file_id(item)
+        content_hash = await run_io(lambda: hashlib.sha256(content).hexdigest())
+
+        if self.source.archive is not None:
+            file_path = os.path.join(UPLOAD_DIR, f"{file_id}{file_type}")
+            await run_io(_write_file, file_path, content)
+        else:
+            file_path = str(self.source.root / item.key)
+
+        cached = await self.resume_service.cached_parse(content_hash) if self.use_cache else None
+        if cached is not None and cached.get("resume_text"):
+            self.counts["cache_hits"] += 1
+            await parsed.put(_Parsed(item, file_id, file_path, content_hash,
+                                     cached["resume_text"], cached["extracted_data"]))
+            return
+
+        text, _ = await self.resume_service.parser_service.extract_text_with_stats(
+            content, file_type=file_type
+        )
+        if not text or not text.strip():
+            raise ValueError("No text could be extracted from the file")
+        await parsed.put(_Parsed(item, file_id, file_path, content_hash, text, None))
+
+    async def _llm(self, parsed: asyncio.Queue, results: asyncio.Queue) -> None:
+        while (work := await parsed.get()) is not None:
+            if self.fatal is not None:
+                continue  # drain without checkpointing; the next run redoes it
+            try:
+                await results.put(await self._attempt(work.item, self._llm_one, work))
+            except Exception as e:
+                if _is_transient(e):
+                    self._abort(work.item, e)
+                else:
+                    await results.put(self._failure(work.item, e))
+
+    async def _llm_one(self, work: _Parsed) -> Dict[str, Any]:
+        extracted = work.extracted_data
+        if extracted is None:
+            extracted = await self.resume_service.structure_resume_text(
+                work.resume_text, work.content_hash, use_cache=self.use_cache
+            )
+        if not isinstance(extracted, dict) or "parse_error" in extracted:
+            raise ValueError("Model output was not valid JSON")
+
+        key_categories = None
+        if self.extract_keys:
+            # Not extract_keys: it wraps every error (Groq 429s included) in an HTTPException(500)
+            key_categories = await self.resume_service.extract_key_categories(extracted, use_cache=self.use_cache)
+
+        return {
+            "key": work.item.key,
+            "status": "done",
+            "file_id": work.file_id,
+            "resume": (work.file_id, work.item.name, work.file_path),
+            "parsed": (work.file_id, extracted, len(work.resume_text), work.resume_text),
+            "keys": (work.file_id, key_categories) if key_categories is not None else None
+        }
+
+    async def _attempt(self, item: SourceItem, step: Callable[..., Awaitable[Any]], *args) -> Any:
+        """Run one stage for a resume, retrying transient errors with backoff."""
+        for attempt in range(1, ITEM_ATTEMPTS + 1):
+            try:
+                return await step(*args)
+            except Exception as e:
+                if not _is_transient(e) or attempt == ITEM_ATTEMPTS or self.fatal is not None:
+                    raise
+                logger.warning("Transient error on %s (attempt %d), retrying: %s", item.key, attempt, e)
+                await asyncio.sleep(2 ** attempt)
+
+    async def _write(self, results: asyncio.Queue) -> None:
+        batch: List[Dict[str, Any]] = []
+        while True:
+            try:
+                entry = await asyncio.wait_for(results.get(), timeout=INGEST_FLUSH_SECONDS)
+            except asyncio.TimeoutError:
+                await self._flush(batch)
+                batch = []
+                continue
+            if entry is None:
+                break
+            batch.append(entry)
+            if len(batch) >= self.batch_size:
+                await self._flush(batch)
+                batch = []
+        await self._flush(batch)
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        """Commit a batch, then checkpoint it. Raises after DB_WRITE_ATTEMPTS failed writes."""
+        if not batch:
+            return
+        done = [entry for entry in batch if entry["status"] == "done"]
+        if done:
+            await self._save(done)
+        await run_io(self.checkpoint.record, [
+            {key: entry[key] for key in ("key", "status", "file_id", "error") if key in entry}
+            for entry in batch
+        ])
+        self.counts["done"] += len(done)
+        self.counts["failed"] += len(batch) - len(done)
+
+    async def _save(self, done: List[Dict[str, Any]]) -> None:
+        for attempt in range(1, DB_WRITE_ATTEMPTS + 1):
+            try:
+                await self.resume_service.resume_repository.save_ingested(
+                    [entry["resume"] for entry in done],
+                    [entry["parsed"] for entry in done],
+                    [entry["keys"] for entry in done if entry["keys"] is not None]
+                )
+                return
+            except Exception:
+                if attempt == DB_WRITE_ATTEMPTS:
+                    raise
+                logger.warning("Batch write failed (attempt %d), retrying", attempt, exc_info=True)
+                await asyncio.sleep(2 ** attempt)
+
+    def _abort(self, item: SourceItem, error: Exception) -> None:
+        """Stop taking new resumes; finished batches are still committed and checkpointed."""
+        if self.fatal is None:
+            self.fatal = error
+            logger.error("Aborting: %s still failing after %d attempts: %s", item.key, ITEM_ATTEMPTS, error)
+
+    def _failure(self, item: SourceItem, error: Exception) -> Dict[str, Any]:
+        detail = error.detail if isinstance(error, HTTPException) else str(error)
+        logger.warning("Failed %s: %s", item.key, detail)
+        return {"key": item.key, "status": "failed", "error": detail}
+
+    async def _report(self, total: int, started: float, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            self._print_progress(total, started)
+
+    def _print_progress(self, total: int, started: float) -> None:
+        finished = self.counts["done"] + self.counts["failed"]
+        elapsed = time.monotonic() - started
+        rate = finished / elapsed if elapsed else 0.0
+        eta = _duration((total - finished) / rate) if rate else "?"
+        print(
+            f"[ingest] {finished}/{total} ({self.counts['done']} done, {self.counts['failed']} failed, "
+            f"{self.counts['cache_hits']} cache hits) {rate:.2f} resumes/s, elapsed {_duration(elapsed)}, ETA {eta}",
+            flush=True
+        )
+
+    # ---------- Run ----------
+
+    async def run(self, items: List[SourceItem], progress_interval: float) -> Dict[str, int]:
+        """
+        Ingest items.
+
+        Returns:
+            Final counts
+
+        Raises:
+            RuntimeError: if a transient error outlasted its retries (after committing finished work)
+        """
+        if self.source.archive is not None:
+            await run_io(os.makedirs, UPLOAD_DIR, exist_ok=True)
+
+        item_queue: asyncio.Queue = asyncio.Queue()
+        for item in items:
+            item_queue.put_nowait(item)
+        parsed: asyncio.Queue = asyncio.Queue(maxsize=self.llm_concurrency * 2)  # backpressure on extraction
+        results: asyncio.Queue = asyncio.Queue()
+
+        started = time.monotonic()
+        extractors = [asyncio.create_task(self._extract(item_queue, parsed, results))
+                      for _ in range(self.extract_workers * 2)]  # 2x keeps the process pool busy during file I/O
+        llm_workers = [asyncio.create_task(self._llm(parsed, results)) for _ in range(self.llm_concurrency)]
+        writer = asyncio.create_task(self._write(results))
+        reporter = asyncio.create_task(self._report(len(items), started, progress_interval))
+
+        async def drain() -> None:
+            await asyncio.gather(*extractors)
+            for _ in llm_workers:
+                await parsed.put(None)
+            await asyncio.gather(*llm_workers)
+            await results.put(None)
+
+        try:
+            await asyncio.gather(drain(), writer)
+        finally:
+            for task in [*extractors, *llm_workers, writer, reporter]:
+                task.cancel()
+            self._print_progress(len(items), started)
+        if self.fatal is not None:
+            raise RuntimeError(f"Ingestion aborted, rerun to continue: {self.fatal}") from self.fatal
+        return self.counts
+
+
+async def ingest(args: argparse.Namespace) -> Dict[str, int]:
+    source = ResumeSource(args.source)
+    checkpoint = Checkpoint(args.checkpoint or source.default_checkpoint())
+    finished = checkpoint.finished(args.retry_failed)
+    items = [item for item in await run_io(source.items) if item.key not in finished]
+    if args.limit:
+        items = items[:args.limit]
+    print(f"[ingest] {len(items)} resumes to ingest from {source.root} "
+          f"({len(finished)} already in checkpoint {checkpoint.path})", flush=True)
+
+    ingestor = Ingestor(
+        source,
+        checkpoint,
+        extract_workers=args.workers,
+        llm_concurrency=args.llm_concurrency,
+        batch_size=args.batch_size,
+        extract_keys=args.extract_keys,
+        use_cache=not args.no_cache
+    )
+    try:
+        return await ingestor.run(items, args.progress_interval)
+    finally:
+        await close_llm_client()
+        await close_async_pool()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", type=Path, help="Directory tree or zip archive of resumes")
+    parser.add_argument("--checkpoint", type=Path, help="Checkpoint file (default: DATA_DIR/ingest_<source>.jsonl)")
+    parser.add_argument("--workers", type=int, default=CPU_POOL_SIZE, help="Text extraction processes")
+    parser.add_argument("--llm-concurrency", type=int, default=INGEST_LLM_CONCURRENCY, help="Resumes in LLM calls at once")
+    parser.add_argument("--batch-size", type=int, default=INGEST_BATCH_SIZE, help="Resumes per MySQL transaction")
+    parser.add_argument("--extract-keys", action="store_true", help="Also extract key categories")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the parse and LLM response caches")
+    parser.add_argument("--retry-failed", action="store_true", help="Retry resumes that failed in earlier runs")
+    parser.add_argument("--limit", type=int, default=0, help="Ingest at most this many new resumes")
+    parser.add_argument("--progress-interval", type=float, default=10.0, help="Seconds between progress lines")
+    args = parser.parse_args()
+
+    if not args.source.exists():
+        parser.error(f"{args.source} does not exist")
+    if args.source.is_file() and not zipfile.is_zipfile(args.source):
+        parser.error(f"{args.source} is not a directory or zip archive")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    set_cpu_pool_size(args.workers)
+    try:
+        counts = asyncio.run(ingest(args))
+    finally:
+        shutdown_executors()
+    print(f"[ingest] finished: {counts['done']} ingested, {counts['failed']} failed", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@
 FastAPI Resume Parser Application
 Main application entry point
 """
+import logging
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import (
@@ -12,6 +14,16 @@ from app.core.config import (
     CORS_ORIGINS
 )
 from app.api.routes import api_router
+from app.core.llm_client import close_llm_client
+from app.core.executors import shutdown_executors
+from app.core.async_database import get_async_pool_stats, close_async_pool
+from app.core.cache import get_parse_cache, get_llm_cache
+from app.services.pipeline_queue import get_pipeline_queue
+from app.services.task_queue import get_task_queue
+from app.services.skill_index import get_skill_index
+from app.services.text_index import get_text_index
+
+logger = logging.getLogger(__name__)
 
 # Create FastAPI app
 app = FastAPI(
@@ -35,6 +47,36 @@ app.add_middleware(
 app.include_router(api_router, prefix=API_V1_PREFIX)
 
 
+@app.on_event("startup")
+async def startup_event():
+    """Start background workers and build the in-memory skill and text indexes."""
+    await get_pipeline_queue().start()
+    await get_task_queue().start()
+    try:
+        await get_skill_index().build()
+    except Exception:
+        # Database not reachable yet: the index is built on the first search instead
+        logger.warning("Skill index build at startup failed", exc_info=True)
+    await get_skill_index().start_refresh()
+    try:
+        await get_text_index().load()
+    except Exception:
+        logger.warning("Text index load at startup failed", exc_info=True)
+    await get_text_index().start_refresh()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers and release pooled LLM/DB connections and executors."""
+    await get_pipeline_queue().stop()
+    await get_task_queue().stop()
+    await get_skill_index().stop_refresh()
+    await get_text_index().stop_refresh()
+    await close_llm_client()
+    shutdown_executors()
+    await close_async_pool()
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
@@ -55,3 +97,20 @@ async def root():
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy", "service": APP_TITLE}
+
+
+@app.get("/health/db")
+async def db_pool_health():
+    """MySQL pool metrics: size, saturation and checkout wait times."""
+    return {"db_pool": get_async_pool_stats()}
+
+
+@app.get("/health/cache")
+async def cache_health():
+    """Hit/miss counters and sizes of the local caches and in-memory indexes."""
+    return {
+        "parse_cache": get_parse_cache().stats(),
+        "llm_cache": get_llm_cache().stats(),
+        "skill_index": get_skill_index().stats(),
+        "text_index": get_text_index().stats()
+    }
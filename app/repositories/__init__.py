@@ -0,0 +1,5 @@
+# Async data access layer
+from app.repositories.resume_repository import ResumeRepository
+from app.repositories.job_repository import JobRepository
+from app.repositories.task_repository import TaskRepository
+from app.repositories.comparison_repository import ComparisonRepository
@@ -0,0 +1,89 @@
+"""
+Async data access for the resume_job_comparisons table
+"""
+import json
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+import aiomysql
+
+from app.core.async_database import acquire
+from app.repositories import queries
+
+
+class ComparisonRepository:
+    """Async queries for stored resume vs job comparison results."""
+
+    _schema_ready = False
+
+    async def ensure_schema(self) -> None:
+        """Create the resume_job_comparisons table if it does not exist (once per process)."""
+        if ComparisonRepository._schema_ready:
+            return
+        async with acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(queries.CREATE_COMPARISONS_TABLE)
+        ComparisonRepository._schema_ready = True
+
+    async def get_comparison(self, resume_id: str, job_id: str, mode: str) -> Optional[Dict[str, Any]]:
+        """Stored comparison with skill lists decoded, or None."""
+        await self.ensure_schema()
+        async with acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(queries.SELECT_COMPARISON, (resume_id, job_id, mode))
+                row = await cursor.fetchone()
+
+        return self._decode(row) if row else None
+
+    async def get_job_comparisons(self, job_id: str, mode: str, resume_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Stored comparisons of many resumes against one job, keyed by resume_id."""
+        if not resume_ids:
+            return {}
+        await self.ensure_schema()
+        sql = queries.SELECT_JOB_COMPARISONS.format(placeholders=", ".join(["%s"] * len(resume_ids)))
+        async with acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(sql, [job_id, mode, *resume_ids])
+                rows = await cursor.fetchall()
+        return {str(row["resume_id"]): self._decode(row) for row in rows}
+
+    @staticmethod
+    def _decode(row: Dict[str, Any]) -> Dict[str, Any]:
+        for field in ("matching_skills", "missing_skills"):
+            if isinstance(row[field], str):
+                row[field] = json.loads(row[field])
+        return row
+
+    async def save_comparison(
+        self,
+        resume_id: str,
+        job_id: str,
+        mode: str,
+        resume_hash: str,
+        job_hash: str,
+        comparison: Dict[str, Any]
+    ) -> None:
+        """Insert or replace the comparison for (resume_id, job_id, mode)."""
+        await self.ensure_schema()
+        async with acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(queries.UPSERT_COMPARISON, (
+                    str(uuid4()),
+                    resume_id,
+                    job_id,
+                    mode,
+                    resume_hash,
+                    job_hash,
+                    comparison["match_percentage"],
+                    json.dumps(comparison["matching_skills"], ensure_ascii=False),
+                    json.dumps(comparison["missing_skills"], ensure_ascii=False),
+                    comparison["summary"]
+                ))
+
+    async def delete_job_comparisons(self, job_id: str) -> int:
+        """Delete every stored comparison for a job. Returns the number of deleted rows."""
+        await self.ensure_schema()
+        async with acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(queries.DELETE_JOB_COMPARISONS, (job_id,))
+                return cursor.rowcount
@@ -0,0 +1,102 @@
+"""
+Async data access for the job_descriptions table
+"""
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiomysql
+
+from app.core.async_database import acquire
+from app.repositories import queries
+
+
+class JobRepository:
+    """Async queries for job descriptions."""
+
+    async def add_job(
+        self,
+        job_id: str,
+        title: str,
+        description: str,
+        company_branch: Optional[str] = None,
+        required_skills: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Insert a job description."""
+        skills = json.dumps(required_skills) if required_skills is not None else None
+        async with acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(
+                    queries.INSERT_JOB,
+                    (job_id, title, company_branch, description, skills)
+                )
+
+    async def list_jobs(
+        self,
+        columns: List[str],
+        limit: int,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        One keyset page of job descriptions, newest first.
+
+        Args:
+            columns: Columns to select (subset of queries.JOB_LIST_COLUMNS)
+            limit: Maximum rows to return
+            after: (created_at, job_id) of the last row of the previous page
+        """
+        unknown = set(columns) - set(queries.JOB_LIST_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown job columns: {sorted(unknown)}")
+        where, params = "", []
+        if after:
+            where, params = queries.JOBS_AFTER_CURSOR, [after[0], after[0], after[1]]
+        sql = queries.SELECT_JOBS_PAGE.format(columns=", ".join(columns), where=where)
+        async with acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(sql, (*params, limit))
+                return await cursor.fetchall()
+
+    async def count_jobs(self) -> int:
+        """Exact number of job descriptions."""
+        async with acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(queries.COUNT_JOBS)
+                row = await cursor.fetchone()
+                return row["total"]
+
+    async def estimate_jobs(self) -> int:
+        """Approximate number of job descriptions from table statistics (no scan)."""
+        async with acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(queries.ESTIMATE_TABLE_ROWS, ("job_descriptions",))
+                row = await cursor.fetchone()
+                return int(row["total"] or 0) if row else 0
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """A single job description, or None."""
+        async with acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(queries.SELECT_JOB, (job_id,))
+                return await cursor.fetchone()
+
+    async def get_job_requirements(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Title, description and raw required_skills JSON of a job, or None."""
+        async with acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(queries.SELECT_JOB_REQUIREMENTS, (job_id,))
+                return await cursor.fetchone()
+
+    async def get_job_description(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Row holding only the description text, or None."""
+        async with acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(queries.SELECT_JOB_DESCRIPTION, (job_id,))
+                return await cursor.fetchone()
+
+    async def delete_job(self, job_id: str) -> int:
+        """Delete a job description. Returns the number of deleted rows."""
+        async with acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(queries.DELETE_JOB, (job_id,))
+                return cursor.rowcount
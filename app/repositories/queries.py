@@ -0,0 +1,403 @@
+"""
+SQL statements for the resumes, parsed_resumes, resume_texts, job_descriptions,
+resume_job_comparisons and work_tasks tables
+
+All SQL used by the repository layer lives here.
+"""
+
+# ===========================
+# shared
+# ===========================
+
+SELECT_DB_NOW = "SELECT NOW() AS now"
+
+# InnoDB's row estimate from table statistics: O(1), typically within a few percent
+ESTIMATE_TABLE_ROWS = """
+    SELECT TABLE_ROWS AS total
+    FROM information_schema.TABLES
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+"""
+
+# ===========================
+# resumes
+# ===========================
+
+INSERT_RESUME = """
+    INSERT INTO resumes (id, file_name, file_path)
+    VALUES (%s, %s, %s)
+"""
+
+# Idempotent variant for re-runnable bulk ingestion (executemany -> one multi-row INSERT)
+UPSERT_RESUME = """
+    INSERT INTO resumes (id, file_name, file_path)
+    VALUES (%s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        file_name = VALUES(file_name),
+        file_path = VALUES(file_path)
+"""
+
+RESUME_LIST_COLUMNS = ("id", "file_name", "file_path", "uploaded_at")
+
+# Keyset page: {columns} come from RESUME_LIST_COLUMNS, {where} is empty or RESUMES_AFTER_CURSOR.
+# Flat with an index on (uploaded_at, id).
+SELECT_RESUMES_PAGE = """
+    SELECT {columns}
+    FROM resumes
+    {where}
+    ORDER BY uploaded_at DESC, id DESC
+    LIMIT %s
+"""
+
+RESUMES_AFTER_CURSOR = "WHERE uploaded_at < %s OR (uploaded_at = %s AND id < %s)"
+
+COUNT_RESUMES = "SELECT COUNT(*) AS total FROM resumes"
+
+SELECT_RESUME_FILE = """
+    SELECT file_name, file_path
+    FROM resumes
+    WHERE id = %s
+"""
+
+# {placeholders}: one %s per requested id
+SELECT_RESUME_FILES = """
+    SELECT id, file_name, file_path
+    FROM resumes
+    WHERE id IN ({placeholders})
+"""
+
+SELECT_UNPARSED_RESUME_FILES = """
+    SELECT r.id, r.file_name, r.file_path
+    FROM resumes r
+    LEFT JOIN parsed_resumes p ON p.resume_id = r.id
+    WHERE p.resume_id IS NULL
+    ORDER BY r.uploaded_at
+    LIMIT %s
+"""
+
+# ===========================
+# parsed_resumes
+# ===========================
+
+UPSERT_PARSED_RESUME_PROC = "InsertOrUpdateParsedResume"
+
+SELECT_PARSED_RESUME = """
+    SELECT
+        resume_id,
+        full_name,
+        email_id,
+        github_portfolio,
+        linkedin_id,
+        skills,
+        education,
+        key_projects,
+        internships,
+        parsed_text_length
+    FROM parsed_resumes
+    WHERE resume_id = %s
+"""
+
+SELECT_CANDIDATE_CONTACT = """
+    SELECT full_name, email_id
+    FROM parsed_resumes
+    WHERE resume_id = %s
+"""
+
+SELECT_EXTRACTED_KEYS = """
+    SELECT extracted_keys
+    FROM parsed_resumes
+    WHERE resume_id = %s
+"""
+
+SELECT_ALL_EXTRACTED_KEYS = """
+    SELECT resume_id, full_name, extracted_keys
+    FROM parsed_resumes
+    WHERE extracted_keys IS NOT NULL
+"""
+
+# Incremental skill-index refresh; includes rows whose keys were cleared
+SELECT_EXTRACTED_KEYS_SINCE = """
+    SELECT resume_id, full_name, extracted_keys
+    FROM parsed_resumes
+    WHERE parsed_at >= %s
+"""
+
+EXPORT_RESUME_COLUMNS = (
+    "resume_id", "full_name", "email_id", "github_portfolio", "linkedin_id", "skills", "education",
+    "key_projects", "internships", "extracted_keys", "parsed_text_length", "parsed_at"
+)
+EXPORT_COMPARISON_COLUMNS = (
+    "job_id", "match_percentage", "matching_skills", "missing_skills", "summary", "compared_at"
+)
+
+# Bulk export, read through an unbuffered cursor. since (twice) may be NULL.
+EXPORT_PARSED_RESUMES = f"""
+    SELECT {", ".join("p." + column for column in EXPORT_RESUME_COLUMNS)}
+    FROM parsed_resumes p
+    WHERE (%s IS NULL OR p.parsed_at >= %s)
+"""
+
+# Same, with the stored comparison against one job (NULL columns if never compared)
+EXPORT_PARSED_RESUMES_WITH_COMPARISON = f"""
+    SELECT
+        {", ".join("p." + column for column in EXPORT_RESUME_COLUMNS)},
+        {", ".join("c." + column for column in EXPORT_COMPARISON_COLUMNS)}
+    FROM parsed_resumes p
+    LEFT JOIN resume_job_comparisons c
+        ON c.resume_id = p.resume_id AND c.job_id = %s AND c.mode = %s
+    WHERE (%s IS NULL OR p.parsed_at >= %s)
+"""
+
+UPDATE_EXTRACTED_KEYS = """
+    UPDATE parsed_resumes
+    SET extracted_keys = %s,
+        parsed_at = NOW()
+    WHERE resume_id = %s
+"""
+
+# ===========================
+# resume_texts (extracted text for full-text search)
+# ===========================
+
+CREATE_RESUME_TEXTS_TABLE = """
+    CREATE TABLE IF NOT EXISTS resume_texts (
+        resume_id VARCHAR(64) NOT NULL PRIMARY KEY,
+        resume_text LONGTEXT NOT NULL,
+        text_length INT NOT NULL,
+        updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        KEY idx_resume_texts_updated (updated_at)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+UPSERT_RESUME_TEXT = """
+    INSERT INTO resume_texts (resume_id, resume_text, text_length)
+    VALUES (%s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        resume_text = VALUES(resume_text),
+        text_length = VALUES(text_length)
+"""
+
+SELECT_ALL_RESUME_TEXTS = "SELECT resume_id, resume_text FROM resume_texts"
+SELECT_RESUME_TEXTS_SINCE = "SELECT resume_id, resume_text FROM resume_texts WHERE updated_at >= %s"
+
+# Parsed resumes whose text was never stored (parsed before resume_texts existed), keyset by id
+SELECT_RESUMES_WITHOUT_TEXT = """
+    SELECT r.id, r.file_name, r.file_path
+    FROM resumes r
+    JOIN parsed_resumes p ON p.resume_id = r.id
+    LEFT JOIN resume_texts t ON t.resume_id = r.id
+    WHERE t.resume_id IS NULL AND r.id > %s
+    ORDER BY r.id
+    LIMIT %s
+"""
+
+# ===========================
+# job_descriptions
+# ===========================
+
+INSERT_JOB = """
+    INSERT INTO job_descriptions (job_id, title, company_branch, description, required_skills)
+    VALUES (%s, %s, %s, %s, %s)
+"""
+
+JOB_LIST_COLUMNS = ("job_id", "title", "company_branch", "description", "required_skills", "created_at")
+
+# Keyset page: {columns} come from JOB_LIST_COLUMNS, {where} is empty or JOBS_AFTER_CURSOR.
+# Flat with an index on (created_at, job_id).
+SELECT_JOBS_PAGE = """
+    SELECT {columns}
+    FROM job_descriptions
+    {where}
+    ORDER BY created_at DESC, job_id DESC
+    LIMIT %s
+"""
+
+JOBS_AFTER_CURSOR = "WHERE created_at < %s OR (created_at = %s AND job_id < %s)"
+
+COUNT_JOBS = "SELECT COUNT(*) AS total FROM job_descriptions"
+
+SELECT_JOB = """
+    SELECT job_id, title, description, created_at
+    FROM job_descriptions
+    WHERE job_id = %s
+"""
+
+SELECT_JOB_REQUIREMENTS = """
+    SELECT job_id, title, description, required_skills
+    FROM job_descriptions
+    WHERE job_id = %s
+"""
+
+SELECT_JOB_DESCRIPTION = """
+    SELECT description
+    FROM job_descriptions
+    WHERE job_id = %s
+"""
+
+DELETE_JOB = "DELETE FROM job_descriptions WHERE job_id = %s"
+
+# ===========================
+# resume_job_comparisons (stored comparison results)
+# ===========================
+
+CREATE_COMPARISONS_TABLE = """
+    CREATE TABLE IF NOT EXISTS resume_job_comparisons (
+        comparison_id CHAR(36) NOT NULL PRIMARY KEY,
+        resume_id VARCHAR(64) NOT NULL,
+        job_id VARCHAR(64) NOT NULL,
+        mode VARCHAR(16) NOT NULL,
+        resume_hash CHAR(64) NOT NULL,
+        job_hash CHAR(64) NOT NULL,
+        match_percentage INT NOT NULL,
+        matching_skills JSON NOT NULL,
+        missing_skills JSON NOT NULL,
+        summary TEXT NOT NULL,
+        compared_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE KEY uq_comparisons_pair (resume_id, job_id, mode),
+        KEY idx_comparisons_job (job_id)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+SELECT_COMPARISON = """
+    SELECT comparison_id, resume_id, job_id, mode, resume_hash, job_hash,
+           match_percentage, matching_skills, missing_skills, summary, compared_at
+    FROM resume_job_comparisons
+    WHERE resume_id = %s AND job_id = %s AND mode = %s
+"""
+
+# {placeholders}: one %s per resume id
+SELECT_JOB_COMPARISONS = """
+    SELECT comparison_id, resume_id, job_id, mode, resume_hash, job_hash,
+           match_percentage, matching_skills, missing_skills, summary, compared_at
+    FROM resume_job_comparisons
+    WHERE job_id = %s AND mode = %s AND resume_id IN ({placeholders})
+"""
+
+UPSERT_COMPARISON = """
+    INSERT INTO resume_job_comparisons
+        (comparison_id, resume_id, job_id, mode, resume_hash, job_hash,
+         match_percentage, matching_skills, missing_skills, summary, compared_at)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
+    ON DUPLICATE KEY UPDATE
+        resume_hash = VALUES(resume_hash),
+        job_hash = VALUES(job_hash),
+        match_percentage = VALUES(match_percentage),
+        matching_skills = VALUES(matching_skills),
+        missing_skills = VALUES(missing_skills),
+        summary = VALUES(summary),
+        compared_at = NOW()
+"""
+
+DELETE_JOB_COMPARISONS = "DELETE FROM resume_job_comparisons WHERE job_id = %s"
+
+# ===========================
+# work_tasks (distributed task queue)
+# ===========================
+
+CREATE_WORK_TASKS_TABLE = """
+    CREATE TABLE IF NOT EXISTS work_tasks (
+        id BIGINT AUTO_INCREMENT PRIMARY KEY,
+        task_id CHAR(36) NOT NULL,
+        task_type VARCHAR(32) NOT NULL,
+        payload JSON NOT NULL,
+        status VARCHAR(16) NOT NULL DEFAULT 'queued',
+        attempts INT NOT NULL DEFAULT 0,
+        max_attempts INT NOT NULL DEFAULT 3,
+        claimed_by VARCHAR(128) NULL,
+        available_at DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+        lease_expires_at DATETIME(6) NULL,
+        result LONGTEXT NULL,
+        error TEXT NULL,
+        created_at DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+        started_at DATETIME(6) NULL,
+        finished_at DATETIME(6) NULL,
+        UNIQUE KEY uq_work_tasks_task_id (task_id),
+        KEY idx_work_tasks_available (status, available_at),
+        KEY idx_work_tasks_lease (status, lease_expires_at)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+INSERT_WORK_TASK = """
+    INSERT INTO work_tasks (task_id, task_type, payload, max_attempts)
+    VALUES (%s, %s, %s, %s)
+"""
+
+# Oldest runnable task: queued and due, or running with an expired lease
+# (stalled node). SKIP LOCKED lets concurrent claimers pass over rows another
+# node is claiming instead of blocking on them.
+CLAIM_WORK_TASK = """
+    SELECT id, task_id, task_type, payload, attempts
+    FROM work_tasks
+    WHERE (status = 'queued' AND available_at <= NOW(6))
+       OR (status = 'running' AND lease_expires_at < NOW(6) AND attempts < max_attempts)
+    ORDER BY id
+    LIMIT 1
+    FOR UPDATE SKIP LOCKED
+"""
+
+MARK_WORK_TASK_RUNNING = """
+    UPDATE work_tasks
+    SET status = 'running',
+        attempts = attempts + 1,
+        claimed_by = %s,
+        lease_expires_at = NOW(6) + INTERVAL %s SECOND,
+        started_at = NOW(6)
+    WHERE id = %s
+"""
+
+# The attempt number fences every write: a node whose lease expired and was
+# re-claimed elsewhere can no longer touch the task.
+EXTEND_WORK_TASK_LEASE = """
+    UPDATE work_tasks
+    SET lease_expires_at = NOW(6) + INTERVAL %s SECOND
+    WHERE task_id = %s AND attempts = %s AND status = 'running'
+"""
+
+COMPLETE_WORK_TASK = """
+    UPDATE work_tasks
+    SET status = 'completed',
+        result = %s,
+        lease_expires_at = NULL,
+        finished_at = NOW(6)
+    WHERE task_id = %s AND attempts = %s AND status = 'running'
+"""
+
+RETRY_WORK_TASK = """
+    UPDATE work_tasks
+    SET status = 'queued',
+        error = %s,
+        lease_expires_at = NULL,
+        available_at = NOW(6) + INTERVAL %s SECOND
+    WHERE task_id = %s AND attempts = %s AND status = 'running'
+"""
+
+FAIL_WORK_TASK = """
+    UPDATE work_tasks
+    SET status = 'failed',
+        error = %s,
+        lease_expires_at = NULL,
+        finished_at = NOW(6)
+    WHERE task_id = %s AND attempts = %s AND status = 'running'
+"""
+
+# Stalled tasks that already used every attempt are never claimed again.
+FAIL_EXHAUSTED_WORK_TASKS = """
+    UPDATE work_tasks
+    SET status = 'failed',
+        error = CONCAT('Lease expired on ', COALESCE(claimed_by, 'unknown node'), ' after final attempt'),
+        lease_expires_at = NULL,
+        finished_at = NOW(6)
+    WHERE status = 'running' AND lease_expires_at < NOW(6) AND attempts >= max_attempts
+"""
+
+SELECT_WORK_TASK = """
+    SELECT task_id, task_type, payload, status, attempts, max_attempts, claimed_by,
+           result, error, created_at, started_at, finished_at
+    FROM work_tasks
+    WHERE task_id = %s
+"""
+
+COUNT_WORK_TASKS_BY_STATUS = """
+    SELECT status, COUNT(*) AS total
+    FROM work_tasks
+    GROUP BY status
+"""
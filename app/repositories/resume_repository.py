@@ -0,0 +1,347 @@
+"""
+Async data access for the resumes, parsed_resumes and resume_texts tables
+"""
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import aiomysql
+
+from app.core.async_database import acquire, transaction
+from app.repositories import queries
+
+
+class ResumeRepository:
+    """Async queries for uploaded resumes and their parsed data."""
+
+    _text_schema_ready = False
+
+    async def insert_resume(self, file_id: str, file_name: str, file_path: str) -> None:
+        """Record an uploaded resume file."""
+        async with acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(queries.INSERT_RESUME, (file_id, file_name, file_path))
+
+    async def insert_resumes(self, rows: List[Tuple[str, str, str]]) -> None:
+        """
+        Record many uploaded files in one transaction with a single batched insert.
+
+        Args:
+            rows: (file_id, file_name, file_path) tuples
+        """
+        if not rows:
+            return
+        async with transaction() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.executemany(queries.INSERT_RESUME, rows)
+
+    async def list_resumes(
+        self,
+        columns: List[str],
+        limit: int,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        One keyset page of uploaded resumes, newest first.
+
+        Args:
+            columns: Columns to select (subset of queries.RESUME_LIST_COLUMNS)
+            limit: Maximum rows to return
+            after: (uploaded_at, id) of the last row of the previous page
+        """
+        unknown = set(columns) - set(queries.RESUME_LIST_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown resume columns: {sorted(unknown)}")
+        where, params = "", []
+        if after:
+            where, params = queries.RESUMES_AFTER_CURSOR, [after[0], after[0], after[1]]
+        sql = queries.SELECT_RESUMES_PAGE.format(columns=", ".join(columns), where=where)
+        async with acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(sql, (*params, limit))
+                return await cursor.fetchall()
+
+    async def count_resumes(self) -> int:
+        """Total number of uploaded resumes."""
+        async with acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(queries.COUNT_RESUMES)
+                row = await cursor.fetchone()
+                return row["total"]
+
+    async def estimate_resumes(self) -> int:
+        """Approximate number of uploaded resumes from table statistics (no scan)."""
+        async with acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(queries.ESTIMATE_TABLE_ROWS, ("resumes",))
+                row = await cursor.fetchone()
+                return int(row["total"] or 0) if row else 0
+
+    async def get_resume_file(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """file_name and file_path for an uploaded resume, or None."""
+        async with acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(queries.SELECT_RESUME_FILE, (file_id,))
+                return await cursor.fetchone()
+
+    async def get_resume_files(self, file_ids: List[str]) -> List[Dict[str, Any]]:
+        """id, file_name and file_path of the given uploads (unknown ids are absent)."""
+        if not file_ids:
+            return []
+        sql = queries.SELECT_RESUME_FILES.format(placeholders=", ".join(["%s"] * len(file_ids)))
+        async with acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(sql, file_ids)
+                return await cursor.fetchall()
+
+    async def list_unparsed_resume_files(self, limit: int) -> List[Dict[str, Any]]:
+        """Oldest uploads that have no parsed_resumes row yet."""
+        async with acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(queries.SELECT_UNPARSED_RESUME_FILES, (limit,))
+                return await cursor.fetchall()
+
+    @staticmethod
+    def _parsed_params(file_id: str, extracted: Dict[str, Any], text_length: int) -> list:
+        return [
+            file_id,
+            extracted.get("full_name"),
+            extracted.get("email_id"),
+            extracted.get("github_portfolio"),
+            extracted.get("linkedin_id"),
+            json.dumps(extracted.get("skills")),
+            json.dumps(extracted.get("education")),
+            json.dumps(extracted.get("key_projects")),
+            json.dumps(extracted.get("internships")),
+            text_length
+        ]
+
+    async def upsert_parsed_resume(self, file_id: str, extracted: Dict[str, Any], text_length: int) -> None:
+        """Insert or update parsed fields via the InsertOrUpdateParsedResume procedure."""
+        async with acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.callproc(
+                    queries.UPSERT_PARSED_RESUME_PROC, self._parsed_params(file_id, extracted, text_length)
+                )
+
+    async def upsert_parsed_resumes(self, items: List[Tuple[str, Dict[str, Any], int, Optional[str]]]) -> None:
+        """
+        Bulk insert/update parsed resumes and their text in one transaction.
+
+        Args:
+            items: (file_id, extracted fields, text length, resume text or None) tuples
+        """
+        if not items:
+            return
+        await self.ensure_text_schema()  # DDL commits implicitly, so run it before the transaction
+        async with transaction() as conn:
+            async with conn.cursor() as cursor:
+                await self._write_parsed(cursor, items)
+
+    async def save_ingested(
+        self,
+        resume_rows: List[Tuple[str, str, str]],
+        parsed_items: List[Tuple[str, Dict[str, Any], int, Optional[str]]],
+        key_rows: List[Tuple[str, Any]]
+    ) -> None:
+        """
+        Record a batch of bulk-ingested resumes in one transaction. Safe to repeat.
+
+        Args:
+            resume_rows: (file_id, file_name, file_path) tuples for resumes
+            parsed_items: (file_id, extracted fields, text length, resume text) tuples
+            key_rows: (file_id, key categories) tuples
+        """
+        await self.ensure_text_schema()
+        async with transaction() as conn:
+            async with conn.cursor() as cursor:
+                if resume_rows:
+                    await cursor.executemany(queries.UPSERT_RESUME, resume_rows)
+                if parsed_items:
+                    await self._write_parsed(cursor, parsed_items)
+                if key_rows:
+                    await cursor.executemany(queries.UPDATE_EXTRACTED_KEYS, [
+                        (json.dumps(key_data, ensure_ascii=False, indent=2), file_id)
+                        for file_id, key_data in key_rows
+                    ])
+
+    async def _write_parsed(
+        self,
+        cursor: aiomysql.Cursor,
+        items: List[Tuple[str, Dict[str, Any], int, Optional[str]]]
+    ) -> None:
+        # The procedure owns the upsert rules; one CALL per row, all inside the caller's transaction
+        for file_id, extracted, text_length, _ in items:
+            await cursor.callproc(
+                queries.UPSERT_PARSED_RESUME_PROC, self._parsed_params(file_id, extracted, text_length)
+            )
+        texts = [(file_id, text, len(text)) for file_id, _, _, text in items if text]
+        if texts:
+            await cursor.executemany(queries.UPSERT_RESUME_TEXT, texts)
+
+    async def get_parsed_resume(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """Parsed resume row with JSON columns decoded, or None."""
+        async with acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(queries.SELECT_PARSED_RESUME, (file_id,))
+                row = await cursor.fetchone()
+
+        if row:
+            for field in ("skills", "education", "key_projects", "internships"):
+                if row.get(field):
+                    try:
+                        row[field] = json.loads(row[field])
+                    except (TypeError, json.JSONDecodeError):
+                        pass
+        return row
+
+    async def get_candidate_contact(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """full_name and email_id for a parsed resume, or None."""
+        async with acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(queries.SELECT_CANDIDATE_CONTACT, (file_id,))
+                return await cursor.fetchone()
+
+    async def get_extracted_keys(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """Row holding the stored extracted_keys column, or None."""
+        async with acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(queries.SELECT_EXTRACTED_KEYS, (file_id,))
+                return await cursor.fetchone()
+
+    async def list_extracted_keys(self) -> List[Dict[str, Any]]:
+        """resume_id, full_name and raw extracted_keys JSON of every resume with key categories."""
+        async with acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(queries.SELECT_ALL_EXTRACTED_KEYS)
+                return await cursor.fetchall()
+
+    async def list_extracted_keys_since(self, since: datetime) -> List[Dict[str, Any]]:
+        """resume_id, full_name and raw extracted_keys (may be NULL) of rows changed since a DB timestamp."""
+        async with acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(queries.SELECT_EXTRACTED_KEYS_SINCE, (since,))
+                return await cursor.fetchall()
+
+    async def save_extracted_keys(self, file_id: str, key_data: Any) -> None:
+        """Store AI-extracted key categories for a parsed resume."""
+        async with acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(
+                    queries.UPDATE_EXTRACTED_KEYS,
+                    (json.dumps(key_data, ensure_ascii=False, indent=2), file_id)
+                )
+
+    async def get_db_now(self) -> datetime:
+        """Current database time (watermark for incremental exports)."""
+        async with acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(queries.SELECT_DB_NOW)
+                row = await cursor.fetchone()
+                return row["now"]
+
+    async def iter_parsed_resumes(
+        self,
+        since: Optional[datetime] = None,
+        job_id: Optional[str] = None,
+        comparison_mode: str = "llm",
+        batch_size: int = 500
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Stream parsed_resumes rows in batches through an unbuffered (server-side) cursor.
+
+        Args:
+            since: Only rows parsed at or after this time
+            job_id: Join each row with its stored comparison against this job
+            comparison_mode: Comparison mode to join (llm, fast or fast_summary)
+            batch_size: Rows fetched per round trip
+
+        Returns:
+            Async iterator of row batches (JSON columns left as stored)
+        """
+        if job_id:
+            sql = queries.EXPORT_PARSED_RESUMES_WITH_COMPARISON
+            params = (job_id, comparison_mode, since, since)
+        else:
+            sql, params = queries.EXPORT_PARSED_RESUMES, (since, since)
+
+        async with acquire() as conn:
+            cursor = await conn.cursor(aiomysql.SSDictCursor)
+            finished = False
+            try:
+                await cursor.execute(sql, params)
+                while True:
+                    rows = await cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield rows
+                finished = True
+            finally:
+                if finished:
+                    await cursor.close()
+                else:
+                    # Abandoned mid-stream: drop the connection instead of draining unread rows
+                    conn.close()
+
+    async def ensure_text_schema(self) -> None:
+        """Create the resume_texts table if it does not exist (once per process)."""
+        if ResumeRepository._text_schema_ready:
+            return
+        async with acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(queries.CREATE_RESUME_TEXTS_TABLE)
+        ResumeRepository._text_schema_ready = True
+
+    async def save_resume_text(self, file_id: str, resume_text: str) -> None:
+        """Store (or replace) the extracted text of a resume."""
+        await self.ensure_text_schema()
+        async with acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(queries.UPSERT_RESUME_TEXT, (file_id, resume_text, len(resume_text)))
+
+    async def save_resume_texts(self, texts: List[Tuple[str, str]]) -> None:
+        """Store (or replace) many (resume_id, resume_text) pairs in one transaction."""
+        if not texts:
+            return
+        await self.ensure_text_schema()
+        async with transaction() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.executemany(queries.UPSERT_RESUME_TEXT, [
+                    (file_id, resume_text, len(resume_text)) for file_id, resume_text in texts
+                ])
+
+    async def list_resumes_without_text(self, after: str, limit: int) -> List[Dict[str, Any]]:
+        """id, file_name and file_path of parsed resumes without a resume_texts row, by id after `after`."""
+        await self.ensure_text_schema()
+        async with acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(queries.SELECT_RESUMES_WITHOUT_TEXT, (after, limit))
+                return await cursor.fetchall()
+
+    async def iter_resume_texts(
+        self,
+        batch_size: int = 1000,
+        since: Optional[datetime] = None
+    ) -> AsyncIterator[List[Tuple[str, str]]]:
+        """
+        Stream stored resume texts without loading the table into memory.
+
+        Args:
+            batch_size: Rows per yielded batch
+            since: Only texts updated at or after this DB timestamp
+
+        Returns:
+            Async iterator of (resume_id, resume_text) batches
+        """
+        await self.ensure_text_schema()
+        async with acquire() as conn:
+            async with conn.cursor(aiomysql.SSCursor) as cursor:
+                if since is None:
+                    await cursor.execute(queries.SELECT_ALL_RESUME_TEXTS)
+                else:
+                    await cursor.execute(queries.SELECT_RESUME_TEXTS_SINCE, (since,))
+                while True:
+                    rows = await cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield [(str(resume_id), resume_text) for resume_id, resume_text in rows]
@@ -0,0 +1,115 @@
+"""
+Async data access for the work_tasks table (database-backed task queue)
+"""
+import json
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+import aiomysql
+
+from app.core.async_database import acquire, transaction
+from app.repositories import queries
+
+
+class TaskRepository:
+    """Async queries for enqueuing, claiming and finishing distributed tasks."""
+
+    async def ensure_schema(self) -> None:
+        """Create the work_tasks table if it does not exist."""
+        async with acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(queries.CREATE_WORK_TASKS_TABLE)
+
+    async def enqueue(self, task_type: str, payload: Dict[str, Any], max_attempts: int) -> str:
+        """Insert a queued task and return its task_id."""
+        task_id = str(uuid4())
+        async with acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(
+                    queries.INSERT_WORK_TASK,
+                    (task_id, task_type, json.dumps(payload), max_attempts)
+                )
+        return task_id
+
+    async def claim(self, worker_id: str, lease_seconds: int) -> Optional[Dict[str, Any]]:
+        """
+        Atomically claim the oldest runnable task for this worker.
+
+        Returns:
+            Task dict (task_id, task_type, payload, attempt) or None if nothing is runnable
+        """
+        async with transaction() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(queries.CLAIM_WORK_TASK)
+                row = await cursor.fetchone()
+                if not row:
+                    return None
+                await cursor.execute(queries.MARK_WORK_TASK_RUNNING, (worker_id, lease_seconds, row["id"]))
+
+        return {
+            "task_id": row["task_id"],
+            "task_type": row["task_type"],
+            "payload": json.loads(row["payload"]),
+            "attempt": row["attempts"] + 1
+        }
+
+    async def extend_lease(self, task_id: str, attempt: int, lease_seconds: int) -> bool:
+        """Push the lease forward; False if the task was re-claimed elsewhere."""
+        async with acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(queries.EXTEND_WORK_TASK_LEASE, (lease_seconds, task_id, attempt))
+                return cursor.rowcount == 1
+
+    async def complete(self, task_id: str, attempt: int, result: Any) -> bool:
+        """Store the result of a finished attempt."""
+        async with acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(
+                    queries.COMPLETE_WORK_TASK,
+                    (json.dumps(result, ensure_ascii=False, default=str), task_id, attempt)
+                )
+                return cursor.rowcount == 1
+
+    async def retry(self, task_id: str, attempt: int, error: str, delay_seconds: int) -> bool:
+        """Return a failed attempt to the queue after delay_seconds."""
+        async with acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(queries.RETRY_WORK_TASK, (error, delay_seconds, task_id, attempt))
+                return cursor.rowcount == 1
+
+    async def fail(self, task_id: str, attempt: int, error: str) -> bool:
+        """Mark a task permanently failed."""
+        async with acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(queries.FAIL_WORK_TASK, (error, task_id, attempt))
+                return cursor.rowcount == 1
+
+    async def fail_exhausted(self) -> int:
+        """Fail stalled tasks with no attempts left; returns how many were failed."""
+        async with acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(queries.FAIL_EXHAUSTED_WORK_TASKS)
+                return cursor.rowcount
+
+    async def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Task row with payload and result decoded, or None."""
+        async with acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(queries.SELECT_WORK_TASK, (task_id,))
+                row = await cursor.fetchone()
+
+        if row:
+            for field in ("payload", "result"):
+                if row.get(field):
+                    try:
+                        row[field] = json.loads(row[field])
+                    except (TypeError, json.JSONDecodeError):
+                        pass
+        return row
+
+    async def count_by_status(self) -> Dict[str, int]:
+        """Number of tasks in each status."""
+        async with acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(queries.COUNT_WORK_TASKS_BY_STATUS)
+                return {row["status"]: row["total"] for row in await cursor.fetchall()}
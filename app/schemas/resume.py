@@ -2,7 +2,7 @@
 Pydantic schemas for resume parsing API
 """
 from pydantic import BaseModel
-from typing import Union, Dict, Any
+from typing import Union, Dict, Any, List, Optional
 
 
 class ExtractKeysRequest(BaseModel):
@@ -21,12 +21,29 @@ class ParseResumeResponse(BaseModel):
     filename: str
     resume_text_length: int
     extracted_data: Dict[str, Any]
+    cached: bool = False
+    extraction_stats: Optional[Dict[str, Any]] = None  # page count and per-page timings
     # message: str
 
 
 
 
 
+class ParseBatchRequest(BaseModel):
+    """Request model for parsing many uploaded resumes."""
+    file_ids: Optional[List[str]] = None  # ids returned by /upload or /upload-batch
+    all_unparsed: bool = False  # instead of file_ids: every upload without a parsed_resumes row
+    use_cache: bool = True
+
+
+class ParseBatchResponse(BaseModel):
+    """Per-file outcome of a batch parse."""
+    requested: int
+    parsed: int
+    failed: int
+    results: List[Dict[str, Any]]  # file_id, status and cached/resume_text_length or error
+
+
 class GenerateQuestionsResponse(BaseModel):
     """Response model for question generation."""
     status: str
@@ -54,6 +71,26 @@ class FullPipelineResponse(BaseModel):
     filename: str
     pipeline_results: PipelineResults
     message: str
+    mode: str = "two_call"  # two_call | combined
+    extraction_usage: Optional[Dict[str, Any]] = None  # LLM calls, tokens and time of parse + key extraction
+
+
+class PipelineJobSubmitResponse(BaseModel):
+    """Response model for queuing a background pipeline job."""
+    job_id: str
+    status: str
+    status_url: str
+
+
+class PipelineJobStatus(BaseModel):
+    """Status of a background pipeline job with per-stage progress and results."""
+    job_id: str
+    filename: str
+    status: str  # queued | running | completed | failed
+    stages: Dict[str, Dict[str, Any]]
+    error: Optional[str] = None
+    created_at: float
+    updated_at: float
 
 # from pydantic import BaseModel
 # from datetime import datetime
@@ -110,8 +147,35 @@ class ResumeJobComparisonDB(BaseModel):
     comparison_id: str
     resume_id: str
     job_id: str
+    mode: str  # llm | fast | fast_summary
+    resume_hash: str  # SHA-256 of the extracted keys compared
+    job_hash: str  # SHA-256 of the job description, required skills and model
     match_percentage: int
     matching_skills: List[str]
     missing_skills: List[str]
     summary: str
     compared_at: datetime
+
+
+class TaskSubmitResponse(BaseModel):
+    """Response model for a task queued on the distributed task queue."""
+    task_id: str
+    task_type: str
+    status: str
+    status_url: str
+
+
+class TaskStatus(BaseModel):
+    """Status of a distributed task and the node that ran it."""
+    task_id: str
+    task_type: str
+    payload: Dict[str, Any]
+    status: str  # queued | running | completed | failed
+    attempts: int
+    max_attempts: int
+    claimed_by: Optional[str] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,104 @@
+"""
+Streaming bulk export of parsed resumes (NDJSON or CSV)
+
+Rows are read from MySQL through an unbuffered server-side cursor in
+batches and encoded batch by batch into the response, so memory stays
+constant no matter how many rows are exported. Incremental pulls pass the
+previous export's watermark as `since`.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.core.config import EXPORT_BATCH_SIZE
+from app.repositories import ResumeRepository, ComparisonRepository
+from app.repositories.queries import EXPORT_RESUME_COLUMNS, EXPORT_COMPARISON_COLUMNS
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Stored as JSON text; decoded into nested values in NDJSON, kept as JSON text in CSV
+JSON_COLUMNS = frozenset({
+    "skills", "education", "key_projects", "internships", "extracted_keys", "matching_skills", "missing_skills"
+})
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            return value
+    return value
+
+
+def _json_default(value: Any) -> str:
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+def _ndjson_lines(rows: List[Dict[str, Any]]) -> bytes:
+    lines = []
+    for row in rows:
+        record = {key: _decode(value) if key in JSON_COLUMNS else value for key, value in row.items()}
+        lines.append(json.dumps(record, ensure_ascii=False, default=_json_default))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _csv_lines(rows: List[Dict[str, Any]], columns: List[str]) -> bytes:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    for row in rows:
+        writer.writerow([
+            value.isoformat() if isinstance(value, datetime) else ("" if value is None else value)
+            for value in (row[column] for column in columns)
+        ])
+    return out.getvalue().encode("utf-8")
+
+
+class ExportService:
+    """Streams parsed_resumes, optionally with stored comparisons for one job."""
+
+    def __init__(self):
+        self.resume_repository = ResumeRepository()
+        self.comparison_repository = ComparisonRepository()
+
+    async def prepare(self, job_id: Optional[str] = None) -> datetime:
+        """
+        Checks that must pass before the response starts.
+
+        Returns:
+            Database time at the start of the export; pass it as `since` next time
+        """
+        if job_id:
+            await self.comparison_repository.ensure_schema()
+        return await self.resume_repository.get_db_now()
+
+    async def stream(
+        self,
+        export_format: str = "ndjson",
+        since: Optional[datetime] = None,
+        job_id: Optional[str] = None,
+        comparison_mode: str = "llm"
+    ) -> AsyncIterator[bytes]:
+        """
+        Encoded export, one chunk per database batch.
+
+        Args:
+            export_format: "ndjson" or "csv"
+            since: Only resumes parsed at or after this time
+            job_id: Add the stored comparison against this job to every row
+            comparison_mode: Which stored comparison to join (llm, fast or fast_summary)
+        """
+        columns = list(EXPORT_RESUME_COLUMNS) + (list(EXPORT_COMPARISON_COLUMNS) if job_id else [])
+        if export_format == "csv":
+            yield _csv_lines([dict(zip(columns, columns))], columns)
+
+        batches = self.resume_repository.iter_parsed_resumes(
+            since=since, job_id=job_id, comparison_mode=comparison_mode, batch_size=EXPORT_BATCH_SIZE
+        )
+        try:
+            async for rows in batches:
+                yield _csv_lines(rows, columns) if export_format == "csv" else _ndjson_lines(rows)
+        finally:
+            await batches.aclose()
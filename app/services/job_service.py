@@ -2,34 +2,39 @@
 Business logic for managing job descriptions.
 """
 
-import json
+import asyncio
 from uuid import uuid4
 from fastapi import HTTPException
-from typing import Dict, Any
-from app.core.database import get_connection
+from typing import Dict, Any, Optional
+from app.core.config import LIST_PAGE_SIZE
+from app.core.pagination import count_total, decode_cursor, page_response, select_columns
+from app.repositories import JobRepository, ComparisonRepository
+from app.repositories.queries import JOB_LIST_COLUMNS
+
+# Returned when no fields are requested (the columns this endpoint always listed)
+DEFAULT_JOB_FIELDS = ("job_id", "title", "description", "created_at")
 
 
 class JobService:
     """Handles database operations for job descriptions."""
 
-    def add_job_description(self, title: str, description: str) -> Dict[str, Any]:
+    def __init__(self):
+        self.job_repository = JobRepository()
+        self.comparison_repository = ComparisonRepository()
+
+    async def add_job_description(
+        self,
+        title: str,
+        description: str,
+        company_branch: Optional[str] = None,
+        required_skills: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Add a new job description to the database.
         """
         try:
             job_id = str(uuid4())
-            conn = get_connection()
-            if conn is None:
-                raise HTTPException(status_code=500, detail="Database connection failed")
-
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO job_descriptions (job_id, title, company_branch, description, required_skills)
-                VALUES (%s, %s, %s,%s, %s)
-            """, (job_id, title, description))
-            conn.commit()
-            cursor.close()
-            conn.close()
+            await self.job_repository.add_job(job_id, title, description, company_branch, required_skills)
 
             return {
                 "status": "success",
@@ -40,71 +45,64 @@ class JobService:
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error saving job description: {str(e)}")
 
-    def get_all_jobs(self) -> Dict[str, Any]:
+    async def get_all_jobs(
+        self,
+        page_size: int = LIST_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        total: str = "none"
+    ) -> Dict[str, Any]:
         """
-        Retrieve all job descriptions from the database.
+        Retrieve one keyset page of job descriptions, newest first.
+
+        Args:
+            page_size: Jobs per page
+            cursor: next_cursor of the previous page
+            fields: Comma-separated columns; job_id and created_at are always included
+            total: "none", "approx" (table statistics) or "exact" (COUNT(*))
         """
+        columns = select_columns(fields, JOB_LIST_COLUMNS, DEFAULT_JOB_FIELDS, ("job_id", "created_at"))
+        after = decode_cursor(cursor)
         try:
-            conn = get_connection()
-            if conn is None:
-                raise HTTPException(status_code=500, detail="Database connection failed")
-
-            cursor = conn.cursor(dictionary=True)
-            cursor.execute("""
-                SELECT job_id, title, description, created_at
-                FROM job_descriptions
-                ORDER BY created_at DESC
-            """)
-            rows = cursor.fetchall()
-            cursor.close()
-            conn.close()
+            rows, total_count = await asyncio.gather(
+                self.job_repository.list_jobs(columns, page_size + 1, after),
+                count_total(total, self.job_repository.count_jobs, self.job_repository.estimate_jobs)
+            )
+            rows, next_cursor = page_response(rows, page_size, "created_at", "job_id")
 
             return {
                 "status": "success",
-                "total_jobs": len(rows),
+                "total_jobs": total_count,
+                "total_is_estimate": total == "approx",
+                "page_size": page_size,
+                "next_cursor": next_cursor,
                 "jobs": rows
             }
 
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error fetching jobs: {str(e)}")
 
-    def get_job_by_id(self, job_id: str) -> Dict[str, Any]:
+    async def get_job_by_id(self, job_id: str) -> Dict[str, Any]:
         """
         Retrieve a specific job by ID.
         """
         try:
-            conn = get_connection()
-            if conn is None:
-                raise HTTPException(status_code=500, detail="Database connection failed")
-
-            cursor = conn.cursor(dictionary=True)
-            cursor.execute("SELECT job_id, title, description, created_at FROM job_descriptions WHERE job_id = %s", (job_id,))
-            job = cursor.fetchone()
-            cursor.close()
-            conn.close()
-
-            if not job:
-                raise HTTPException(status_code=404, detail="Job description not found")
-
-            return {"status": "success", "job": job}
-
+            job = await self.job_repository.get_job(job_id)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error retrieving job: {str(e)}")
 
-    def delete_job(self, job_id: str) -> Dict[str, Any]:
+        if not job:
+            raise HTTPException(status_code=404, detail="Job description not found")
+
+        return {"status": "success", "job": job}
+
+    async def delete_job(self, job_id: str) -> Dict[str, Any]:
         """
-        Delete a job description by ID.
+        Delete a job description by ID, together with its stored comparisons.
         """
         try:
-            conn = get_connection()
-            if conn is None:
-                raise HTTPException(status_code=500, detail="Database connection failed")
-
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM job_descriptions WHERE job_id = %s", (job_id,))
-            conn.commit()
-            cursor.close()
-            conn.close()
+            await self.job_repository.delete_job(job_id)
+            await self.comparison_repository.delete_job_comparisons(job_id)
 
             return {
                 "status": "success",
@@ -3,8 +3,20 @@ Service for interacting with Parser/resume_parser.py functions
 """
 import sys
 import os
+import hashlib
+import re
 from pathlib import Path
-from app.core.config import PARSER_DIR
+import time
+import asyncio
+from typing import Any, AsyncIterator, BinaryIO, Dict, Optional, Tuple, Union
+from app.core.config import (
+    PARSER_DIR,
+    LLM_MODEL,
+    PDF_PARALLEL_PAGE_THRESHOLD,
+    PDF_PAGES_PER_TASK
+)
+from app.core.llm_client import chat_completion
+from app.core.executors import run_cpu, run_io
 
 # Add Parser directory to path
 sys.path.insert(0, str(PARSER_DIR))
@@ -14,109 +26,246 @@ from Parser.resume_parser import (
     extract_text_from_pdf,
     extract_text_from_image,
     extract_text_from_file,
+    extract_pdf_head,
+    extract_pdf_pages,
+    read_source_bytes,
     ats_extractor,
+    ATS_EXTRACTOR_PROMPT,
+    combined_extractor,
+    COMBINED_EXTRACTOR_PROMPT,
     key_extraction,
     topicwise_questions,
+    topicwise_questions_stream,
     compare_resume_to_job
 )
 
+# Anything the extractors accept as input
+TextSource = Union[str, bytes, memoryview, BinaryIO]
+
 
 class ParserService:
     """Service wrapper for resume parser functions."""
     
     @staticmethod
-    def extract_text(file_path: str) -> str:
+    def extraction_version() -> str:
+        """
+        Fingerprint of the ats_extractor model and prompt.
+        Changes whenever either changes, so cached parses are not reused.
+        """
+        fingerprint = f"{LLM_MODEL}\n{ATS_EXTRACTOR_PROMPT}".encode("utf-8")
+        return hashlib.sha256(fingerprint).hexdigest()[:16]
+
+    @staticmethod
+    def combined_extraction_version() -> str:
+        """Fingerprint of the combined (single-call) extractor model and prompt."""
+        fingerprint = f"{LLM_MODEL}\n{COMBINED_EXTRACTOR_PROMPT}".encode("utf-8")
+        return hashlib.sha256(fingerprint).hexdigest()[:16]
+
+    @staticmethod
+    async def extract_text(source: TextSource, file_type: Optional[str] = None) -> str:
         """
-        Extract text from PDF or image file.
+        Extract text from PDF or image content.
         Automatically detects file type and uses appropriate extraction method.
         
         Args:
-            file_path: Path to PDF or image file
+            source: Path, bytes, memoryview or binary file object (e.g. a spooled upload)
+            file_type: Extension such as ".pdf"; derived from the path when omitted
             
         Returns:
             Extracted text content
         """
-        return extract_text_from_file(file_path)
+        text, _ = await ParserService.extract_text_with_stats(source, file_type)
+        return text
+
+    @staticmethod
+    async def extract_text_with_stats(
+        source: TextSource,
+        file_type: Optional[str] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Extract text and report extraction timings.
+        PDF parsing runs in the CPU process pool; PDFs with more than
+        PDF_PARALLEL_PAGE_THRESHOLD pages are split into page ranges that are
+        extracted concurrently and joined in page order. OCR runs in the
+        I/O thread pool.
+        
+        Args:
+            source: Path, bytes, memoryview or binary file object
+            file_type: Extension such as ".pdf"; derived from the path when omitted
+            
+        Returns:
+            Tuple of (text, stats) where stats has the page count, whether the
+            parallel path was used, per-page timings and total wall time (ms)
+        """
+        if file_type is None:
+            file_type = os.path.splitext(source)[1]
+
+        started = time.perf_counter()
+        if file_type.lower() != '.pdf':
+            text = await run_io(extract_text_from_file, source, file_type)
+            return text, {"pages": 1, "parallel": False, "page_timings_ms": [],
+                          "wall_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+        # Process-pool arguments must be picklable: paths and bytes go as-is
+        if not isinstance(source, (str, os.PathLike, bytes)):
+            source = await run_io(read_source_bytes, source)
+
+        # One worker call counts the pages and extracts small documents whole
+        page_count, head = await run_cpu(
+            extract_pdf_head, source, PDF_PARALLEL_PAGE_THRESHOLD, PDF_PAGES_PER_TASK
+        )
+        parallel = len(head) < page_count
+        chunks = await asyncio.gather(*(
+            run_cpu(extract_pdf_pages, source, start, start + PDF_PAGES_PER_TASK)
+            for start in range(len(head), page_count, PDF_PAGES_PER_TASK)
+        ))
+        pages = head + [page for chunk in chunks for page in chunk]
+
+        text = "\n".join(page_text for page_text, _ in pages).strip()
+        stats = {
+            "pages": page_count,
+            "parallel": parallel,
+            "page_timings_ms": [round(seconds * 1000, 2) for _, seconds in pages],
+            "wall_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+        return text, stats
     
     @staticmethod
-    def extract_text_from_pdf(pdf_path: str) -> str:
+    def extract_text_from_pdf(pdf_source: TextSource) -> str:
         """
-        Extract text from PDF file.
+        Extract text from PDF content.
         
         Args:
-            pdf_path: Path to PDF file
+            pdf_source: Path, bytes, memoryview or binary file object
             
         Returns:
             Extracted text content
         """
-        return extract_text_from_pdf(pdf_path)
+        return extract_text_from_pdf(pdf_source)
     
     @staticmethod
-    def extract_text_from_image(image_path: str) -> str:
+    def extract_text_from_image(image_source: TextSource) -> str:
         """
-        Extract text from image file using Google Vision API OCR.
+        Extract text from image content using Google Vision API OCR.
         
         Args:
-            image_path: Path to image file
+            image_source: Path, bytes, memoryview or binary file object
             
         Returns:
             Extracted text content
         """
-        return extract_text_from_image(image_path)
+        return extract_text_from_image(image_source)
     
     @staticmethod
-    def extract_resume_data(resume_text: str) -> str:
+    async def extract_resume_data(resume_text: str, cache: Optional[bool] = None) -> str:
         """
         Extract structured data from resume text using Groq.
         
         Args:
             resume_text: Text content from resume
+            cache: LLM response cache override (default: cached, temperature is 0)
             
         Returns:
             JSON string with extracted resume data
         """
-        return ats_extractor(resume_text)
+        return await ats_extractor(resume_text, cache=cache)
+    
+    @staticmethod
+    async def extract_resume_and_keys(resume_text: str, cache: Optional[bool] = None) -> str:
+        """
+        Extract structured resume data and interview key categories in one Groq call.
+        
+        Args:
+            resume_text: Text content from resume
+            cache: LLM response cache override (default: cached, temperature is 0)
+            
+        Returns:
+            JSON string with "resume" and "key_categories" objects
+        """
+        return await combined_extractor(resume_text, cache=cache)
     
     @staticmethod
-    def extract_key_categories(extracted_data: str) -> str:
+    async def extract_key_categories(extracted_data: str, cache: Optional[bool] = None) -> str:
         """
         Extract key categories from parsed resume data.
         
         Args:
             extracted_data: JSON string from ats_extractor
+            cache: LLM response cache override (default: cached, temperature is 0)
             
         Returns:
             JSON string with key categories
         """
-        return key_extraction(extracted_data)
+        return await key_extraction(extracted_data, cache=cache)
     
     @staticmethod
-    def generate_questions(key_categories: str) -> str:
+    async def generate_questions(key_categories: str, cache: Optional[bool] = None) -> str:
         """
         Generate interview questions based on key categories.
         
         Args:
             key_categories: JSON string from key_extraction
+            cache: Pass True to opt in to the LLM response cache (sampled stage)
             
         Returns:
             JSON string with interview questions
         """
-        return topicwise_questions(key_categories)
+        return await topicwise_questions(key_categories, cache=cache)
+
+    @staticmethod
+    def generate_questions_stream(key_categories: str, cache: Optional[bool] = None) -> AsyncIterator[str]:
+        """
+        Stream interview questions as the model generates them.
+        
+        Args:
+            key_categories: JSON string from key_extraction
+            cache: Pass True to opt in to the LLM response cache (sampled stage)
+            
+        Returns:
+            Async iterator of response text deltas
+        """
+        return topicwise_questions_stream(key_categories, cache=cache)
 
 
     @staticmethod
-    def compare_resume_to_job(job_description: str, resume_data: dict) -> dict:
+    async def summarize_match(job_description: str, resume_data: dict, comparison: dict) -> str:
+        """
+        Write the recruiter summary for an already computed skill comparison.
+        Much shorter than a full comparison call; deterministic, so it is cached.
+        """
+        import json
+
+        prompt = f"""
+        You are an expert HR recruiter.
+        A candidate was compared with a job description. The skill comparison is final:
+
+        Match percentage: {comparison.get("match_percentage")}
+        Matching skills: {", ".join(comparison.get("matching_skills", [])) or "none"}
+        Missing skills: {", ".join(comparison.get("missing_skills", [])) or "none"}
+
+        Job Description:
+        {job_description}
+
+        Resume Data:
+        {json.dumps(resume_data, indent=2)}
+
+        Write a brief, professional summary of the match quality (2–3 lines). Return only the summary text.
+        """
+
+        result = await chat_completion(
+            [{"role": "system", "content": prompt}],
+            temperature=0.0,
+            max_tokens=600
+        )
+        return re.sub(r"<think>.*?(</think>|$)", "", result or "", flags=re.DOTALL).strip()
+
+    @staticmethod
+    async def compare_resume_to_job(job_description: str, resume_data: dict) -> dict:
         """
         Compare a resume's key categories against a job description using Groq AI.
         Returns match percentage, matching/missing skills, and a summary.
         """
         import json, re
-        from groq import Groq
-
-        # ✅ Load Groq API key (already set in resume_parser)
-        from Parser.resume_parser import api_key  
-
-        client = Groq(api_key=api_key)
 
         prompt = f"""
         You are an expert HR recruiter.
@@ -138,15 +287,12 @@ class ParserService:
         """
 
         try:
-            response = client.chat.completions.create(
-                model="qwen/qwen3-32b",
-                messages=[{"role": "system", "content": prompt}],
+            result = await chat_completion(
+                [{"role": "system", "content": prompt}],
                 temperature=0.2,
                 max_tokens=800
             )
 
-            result = response.choices[0].message.content
-
             # ✅ Extract valid JSON only
             match = re.search(r"(\{[\s\S]*\})", result)
             if match:
@@ -0,0 +1,349 @@
+"""
+Background job queue for the full resume pipeline
+
+Submitting a resume returns a job id immediately; a bounded pool of worker
+tasks runs Parse → Extract Keys → Generate Questions and records the status,
+timing and result of every stage. Job state and the uploaded file are kept
+on local disk, so queued or interrupted jobs resume after a restart and
+completed stages are not re-run.
+
+The store may be shared by several worker processes. A job is claimed with
+one conditional UPDATE, so only one process runs it, and the claim is a
+lease renewed while the job runs. Only running jobs whose lease expired
+(their process died) are put back in the queue.
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+from fastapi import HTTPException, UploadFile
+
+from app.core.config import (
+    PIPELINE_QUEUE_PATH,
+    PIPELINE_UPLOAD_DIR,
+    PIPELINE_WORKERS,
+    PIPELINE_MAX_PENDING,
+    PIPELINE_LEASE_SECONDS
+)
+from app.core.executors import run_io
+from app.core.uploads import save_upload, remove_file
+from app.services.resume_service import ResumeService
+
+logger = logging.getLogger(__name__)
+
+PIPELINE_STAGES = ["parse_resume", "extract_keys", "generate_questions"]
+
+
+class PipelineJobStore:
+    """Thread-safe SQLite persistence for pipeline jobs (blocking; use via run_io)."""
+
+    def __init__(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pipeline_jobs (
+                job_id TEXT PRIMARY KEY,
+                filename TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                content_hash TEXT,
+                status TEXT NOT NULL,
+                stages TEXT NOT NULL,
+                error TEXT,
+                owner TEXT,
+                lease_until REAL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(pipeline_jobs)")}
+        for column, column_type in (("owner", "TEXT"), ("lease_until", "REAL")):
+            if column not in columns:  # store created before leases
+                self._conn.execute(f"ALTER TABLE pipeline_jobs ADD COLUMN {column} {column_type}")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pipeline_jobs_status ON pipeline_jobs (status, created_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["stages"] = json.loads(job["stages"])
+        return job
+
+    def create(self, job_id: str, filename: str, file_path: str, content_hash: str) -> None:
+        now = time.time()
+        stages = {stage: {"status": "pending"} for stage in PIPELINE_STAGES}
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO pipeline_jobs (job_id, filename, file_path, content_hash, status, stages, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, 'queued', ?, ?, ?)",
+                (job_id, filename, file_path, content_hash, json.dumps(stages), now, now)
+            )
+            self._conn.commit()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM pipeline_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def update(self, job_id: str, status: Optional[str] = None,
+               stages: Optional[Dict[str, Any]] = None, error: Optional[str] = None,
+               owner: Optional[str] = None) -> bool:
+        """Update a job; with owner, only while that process still holds it. False if nothing changed."""
+        fields, values = ["updated_at = ?"], [time.time()]
+        if status is not None:
+            fields.append("status = ?")
+            values.append(status)
+        if stages is not None:
+            fields.append("stages = ?")
+            values.append(json.dumps(stages, ensure_ascii=False, default=str))
+        if error is not None:
+            fields.append("error = ?")
+            values.append(error)
+        where = "job_id = ?"
+        values.append(job_id)
+        if owner is not None:
+            where += " AND owner = ?"
+            values.append(owner)
+        with self._lock:
+            cursor = self._conn.execute(f"UPDATE pipeline_jobs SET {', '.join(fields)} WHERE {where}", values)
+            self._conn.commit()
+        return cursor.rowcount == 1
+
+    def claim(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        """Atomically take a queued job; False if it is not queued (another process has it, or it finished)."""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE pipeline_jobs SET status = 'running', owner = ?, lease_until = ?, updated_at = ? "
+                "WHERE job_id = ? AND status = 'queued'",
+                (owner, now + lease_seconds, now, job_id)
+            )
+            self._conn.commit()
+        return cursor.rowcount == 1
+
+    def renew(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        """Extend the lease on a running job; False if this owner lost it."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE pipeline_jobs SET lease_until = ? WHERE job_id = ? AND status = 'running' AND owner = ?",
+                (time.time() + lease_seconds, job_id, owner)
+            )
+            self._conn.commit()
+        return cursor.rowcount == 1
+
+    def release(self, job_id: str, owner: str) -> None:
+        """Put a running job back in the queue (its worker was stopped)."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE pipeline_jobs SET status = 'queued', owner = NULL, lease_until = NULL, updated_at = ? "
+                "WHERE job_id = ? AND status = 'running' AND owner = ?",
+                (time.time(), job_id, owner)
+            )
+            self._conn.commit()
+
+    def count_pending(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM pipeline_jobs WHERE status IN ('queued', 'running')"
+            ).fetchone()[0]
+
+    def recover(self) -> List[str]:
+        """Re-queue running jobs whose lease expired (their process died); return all queued ids, oldest first."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE pipeline_jobs SET status = 'queued', owner = NULL, lease_until = NULL "
+                "WHERE status = 'running' AND (lease_until IS NULL OR lease_until < ?)",
+                (time.time(),)
+            )
+            self._conn.commit()
+            rows = self._conn.execute(
+                "SELECT job_id FROM pipeline_jobs WHERE status = 'queued' ORDER BY created_at"
+            ).fetchall()
+        return [row["job_id"] for row in rows]
+
+
+class PipelineQueue:
+    """Bounded asyncio worker pool running pipeline jobs from the persistent store."""
+
+    def __init__(
+        self,
+        resume_service: ResumeService,
+        store: PipelineJobStore,
+        upload_dir: Path,
+        workers: int = PIPELINE_WORKERS,
+        max_pending: int = PIPELINE_MAX_PENDING,
+        lease_seconds: float = PIPELINE_LEASE_SECONDS
+    ):
+        self.resume_service = resume_service
+        self.store = store
+        self.upload_dir = Path(upload_dir)
+        self.workers = workers
+        self.max_pending = max_pending
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Recover persisted jobs and start the worker tasks and the recovery sweep."""
+        await run_io(self.upload_dir.mkdir, parents=True, exist_ok=True)
+        self._queue = asyncio.Queue()
+        recovered = await self._recover()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._recover_loop()))
+        logger.info("Pipeline queue started with %d workers, %d recovered jobs", self.workers, recovered)
+
+    async def _recover(self) -> int:
+        # Jobs queued by other processes are offered too; claim() lets only one of them run each
+        job_ids = await run_io(self.store.recover)
+        for job_id in job_ids:
+            self._queue.put_nowait(job_id)
+        return len(job_ids)
+
+    async def _recover_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds)
+            try:
+                await self._recover()
+            except Exception:
+                logger.warning("Pipeline job recovery failed", exc_info=True)
+
+    async def stop(self) -> None:
+        """Cancel worker tasks. Interrupted jobs are put back in the queue."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, file: UploadFile) -> Dict[str, Any]:
+        """
+        Persist an upload and queue it for the full pipeline.
+
+        Raises:
+            HTTPException: 503 if the queue is full, plus upload validation errors
+        """
+        if self._queue is None:
+            raise HTTPException(status_code=503, detail="Pipeline queue is not running")
+        if await run_io(self.store.count_pending) >= self.max_pending:
+            raise HTTPException(status_code=503, detail="Pipeline queue is full, retry later")
+
+        job_id = str(uuid4())
+        partial_path = str(self.upload_dir / f"{job_id}.part")
+        info = await save_upload(file, partial_path)
+        file_path = str(self.upload_dir / f"{job_id}{info.file_type}")
+        await run_io(os.replace, partial_path, file_path)
+
+        await run_io(self.store.create, job_id, file.filename, file_path, info.sha256)
+        self._queue.put_nowait(job_id)
+        return {"job_id": job_id, "status": "queued"}
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job record with per-stage status, timings and results."""
+        return await run_io(self.store.get, job_id)
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._process(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Pipeline job %s crashed", job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run_stage(self, job: Dict[str, Any], stage: str, results: Dict[str, Any]) -> Any:
+        if stage == "parse_resume":
+            return await self.resume_service.parse_resume(
+                job["file_path"], job["filename"], content_hash=job["content_hash"]
+            )
+        if stage == "extract_keys":
+            keys_result = await self.resume_service.extract_keys(results["parse_resume"]["extracted_data"])
+            return keys_result["key_categories"]
+        if stage == "generate_questions":
+            return await self.resume_service.generate_questions_from_key_categories(results["extract_keys"])
+        raise ValueError(f"Unknown pipeline stage: {stage}")
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                if not await run_io(self.store.renew, job_id, self.owner, self.lease_seconds):
+                    logger.warning("Pipeline job %s lease lost", job_id)
+                    return
+            except Exception:
+                logger.warning("Renewing the lease on pipeline job %s failed", job_id, exc_info=True)
+
+    async def _process(self, job_id: str) -> None:
+        if not await run_io(self.store.claim, job_id, self.owner, self.lease_seconds):
+            return  # finished, or running in another process
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            await self._run_job(job_id)
+        except asyncio.CancelledError:
+            await run_io(self.store.release, job_id, self.owner)
+            raise
+        finally:
+            heartbeat.cancel()
+
+    async def _run_job(self, job_id: str) -> None:
+        job = await run_io(self.store.get, job_id)
+        stages = job["stages"]
+        results = {name: stage["result"] for name, stage in stages.items() if stage["status"] == "completed"}
+
+        for stage in PIPELINE_STAGES:
+            if stages[stage]["status"] == "completed":
+                continue  # finished before a restart
+
+            started = time.time()
+            stages[stage] = {"status": "running", "started_at": started}
+            await run_io(self.store.update, job_id, stages=stages, owner=self.owner)
+            try:
+                results[stage] = await self._run_stage(job, stage, results)
+            except Exception as e:
+                detail = e.detail if isinstance(e, HTTPException) else str(e)
+                stages[stage].update(status="failed", finished_at=time.time(), error=detail)
+                await run_io(self.store.update, job_id, status="failed", stages=stages,
+                             error=f"{stage}: {detail}", owner=self.owner)
+                await run_io(remove_file, job["file_path"])
+                return
+
+            finished = time.time()
+            stages[stage] = {
+                "status": "completed",
+                "started_at": started,
+                "finished_at": finished,
+                "duration_ms": round((finished - started) * 1000, 2),
+                "result": results[stage]
+            }
+            await run_io(self.store.update, job_id, stages=stages, owner=self.owner)
+
+        await run_io(self.store.update, job_id, status="completed", owner=self.owner)
+        await run_io(remove_file, job["file_path"])
+
+
+_pipeline_queue: Optional[PipelineQueue] = None
+
+
+def get_pipeline_queue() -> PipelineQueue:
+    """Process-wide pipeline queue."""
+    global _pipeline_queue
+    if _pipeline_queue is None:
+        _pipeline_queue = PipelineQueue(
+            ResumeService(),
+            PipelineJobStore(PIPELINE_QUEUE_PATH),
+            PIPELINE_UPLOAD_DIR
+        )
+    return _pipeline_queue
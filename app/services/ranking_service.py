@@ -0,0 +1,172 @@
+"""
+Two-stage candidate ranking for a job
+
+Stage 1 pre-scores every parsed resume locally (skill overlap, no LLM).
+Stage 2 sends only the top-K to the LLM comparison, with bounded
+concurrency. LLM comparisons are kept in resume_job_comparisons, shared
+with /compare (mode "llm") and valid while the resume keys and job are
+unchanged, so paging through a ranking, re-ranking after new applicants
+arrive, or comparing a pair already ranked only pays for new pairs.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+
+from app.core.config import RANKING_TOP_K, RANKING_LLM_CONCURRENCY
+from app.core.executors import run_cpu
+from app.repositories import ResumeRepository, JobRepository, ComparisonRepository
+from app.schemas.resume import ComparisonResult
+from app.services.parser_service import ParserService
+from app.services.resume_service import comparison_hashes
+from app.services.skill_matcher import decode_json, rank_by_pre_score
+
+logger = logging.getLogger(__name__)
+
+
+def _llm_score(comparison: Optional[Dict[str, Any]]) -> Optional[float]:
+    if not isinstance(comparison, dict) or "error" in comparison:
+        return None
+    try:
+        return max(0.0, min(100.0, float(comparison.get("match_percentage"))))
+    except (TypeError, ValueError):
+        return None
+
+
+class RankingService:
+    """Ranks all parsed resumes against a job description."""
+
+    def __init__(self):
+        self.parser_service = ParserService()
+        self.resume_repository = ResumeRepository()
+        self.job_repository = JobRepository()
+        self.comparison_repository = ComparisonRepository()
+
+    async def _compare(
+        self,
+        job: Dict[str, Any],
+        row: Dict[str, Any],
+        stored: Optional[Dict[str, Any]],
+        semaphore: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        """LLM comparison for one candidate, served from resume_job_comparisons while still valid."""
+        resume_id = str(row["resume_id"])
+        resume_hash, job_hash = comparison_hashes(row, job, "llm")
+        if stored and stored["resume_hash"] == resume_hash and stored["job_hash"] == job_hash:
+            return ComparisonResult(**stored).model_dump()
+
+        async with semaphore:
+            comparison = await self.parser_service.compare_resume_to_job(
+                job["description"], decode_json(row["extracted_keys"])
+            )
+        try:
+            validated = ComparisonResult(**comparison).model_dump()
+        except (TypeError, ValueError):
+            return comparison  # error or malformed output: reported, not stored
+        await self.comparison_repository.save_comparison(
+            resume_id, job["job_id"], "llm", resume_hash, job_hash, validated
+        )
+        return comparison
+
+    async def rank_candidates(
+        self,
+        job_id: str,
+        top_k: int = RANKING_TOP_K,
+        min_score: Optional[float] = None,
+        page: int = 1,
+        page_size: int = 20,
+        refresh: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Rank every parsed resume for a job.
+
+        Args:
+            job_id: Job description to rank against
+            top_k: Best pre-scored candidates to re-score with the LLM (0 = local only)
+            min_score: Drop candidates whose final score (0-100) is below this
+            page: 1-based page of the ranked list
+            page_size: Candidates per page
+            refresh: Recompute stored LLM comparisons
+
+        Returns:
+            Paginated ranking. LLM-scored candidates come first (by match_percentage),
+            followed by the rest by pre_score.
+        """
+        try:
+            job, rows = await asyncio.gather(
+                self.job_repository.get_job_requirements(job_id),
+                self.resume_repository.list_extracted_keys()
+            )
+            if not job:
+                raise HTTPException(status_code=404, detail="Job description not found")
+
+            # 1️⃣ Local pre-scoring over every candidate (CPU, off the event loop)
+            job_skills, ranked = await run_cpu(
+                rank_by_pre_score, job.get("required_skills"), job["description"], rows
+            )
+
+            # 2️⃣ LLM comparison for the top-K only, bounded concurrency
+            rows_by_id = {str(row["resume_id"]): row for row in rows}
+            shortlist = ranked[:top_k]
+            stored = {} if refresh else await self.comparison_repository.get_job_comparisons(
+                job_id, "llm", [candidate["resume_id"] for candidate in shortlist]
+            )
+            semaphore = asyncio.Semaphore(RANKING_LLM_CONCURRENCY)
+            comparisons = await asyncio.gather(*(
+                self._compare(job, rows_by_id[candidate["resume_id"]], stored.get(candidate["resume_id"]), semaphore)
+                for candidate in shortlist
+            ))
+
+            llm_scored, llm_failed = [], 0
+            for candidate, comparison in zip(shortlist, comparisons):
+                score = _llm_score(comparison)
+                if score is None:
+                    llm_failed += 1
+                    candidate["stage"] = "pre_score"
+                    candidate["score"] = candidate["pre_score"]
+                    candidate["llm_error"] = (comparison or {}).get("error", "Invalid AI response")
+                    continue
+                candidate.update(
+                    stage="llm",
+                    score=score,
+                    matching_skills=comparison.get("matching_skills", candidate["matching_skills"]),
+                    missing_skills=comparison.get("missing_skills", candidate["missing_skills"]),
+                    summary=comparison.get("summary")
+                )
+                llm_scored.append(candidate)
+
+            rest = [c for c in ranked if c.get("stage") != "llm"]
+            for candidate in rest:
+                candidate.setdefault("stage", "pre_score")
+                candidate.setdefault("score", candidate["pre_score"])
+            rest.sort(key=lambda c: (-c["pre_score"], c["resume_id"]))
+            llm_scored.sort(key=lambda c: (-c["score"], -c["pre_score"], c["resume_id"]))
+            final = llm_scored + rest
+
+            # 3️⃣ Cutoff and pagination
+            if min_score is not None:
+                final = [c for c in final if c["score"] >= min_score]
+            for rank, candidate in enumerate(final, start=1):
+                candidate["rank"] = rank
+            start = (page - 1) * page_size
+
+            return {
+                "status": "success",
+                "job_id": job_id,
+                "job_title": job.get("title"),
+                "job_skills": job_skills,
+                "total_candidates": len(rows),
+                "llm_scored": len(llm_scored),
+                "llm_failed": llm_failed,
+                "total_ranked": len(final),
+                "page": page,
+                "page_size": page_size,
+                "total_pages": (len(final) + page_size - 1) // page_size,
+                "candidates": final[start:start + page_size]
+            }
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error ranking candidates: {str(e)}")
@@ -3,17 +3,42 @@ Business logic service for resume processing
 """
 import os
 import re
+import asyncio
 import json
-import shutil
-import tempfile
-from typing import Dict, Any, Optional
-from uuid import uuid4
+import hashlib
+import logging
+import time
+from typing import Dict, Any, List, Optional, Union, BinaryIO, AsyncIterator, Tuple
 
 from fastapi import UploadFile, HTTPException
 
 from app.services.parser_service import ParserService
 from app.core.utils import parse_json_response, convert_to_string
-from app.core.database import get_connection
+from app.core.executors import run_io
+from app.core.llm_client import track_usage
+from app.core.cache import get_parse_cache
+from app.core.uploads import stream_upload, SUPPORTED_EXTENSIONS
+from app.core.config import (
+    PARSE_CACHE_VERSION,
+    QUESTION_GROUP_SIZE,
+    QUESTION_CONCURRENCY,
+    LLM_MODEL,
+    PARSE_BATCH_MAX_FILES,
+    PARSE_BATCH_CONCURRENCY,
+    PARSE_BATCH_WRITE_SIZE
+)
+from app.repositories import ResumeRepository, JobRepository, ComparisonRepository
+from app.schemas.resume import ParseResumeResponse, ExtractKeysResponse, ComparisonResult, ResumeJobComparisonDB
+from app.services.skill_matcher import compare_skills, matcher_version
+from app.services.skill_index import get_skill_index
+from app.services.text_index import get_text_index
+
+# two_call: ats_extractor then key_extraction; combined: one call returning both
+EXTRACTION_MODES = ("two_call", "combined")
+# llm: AI comparison; fast: local skill-overlap scoring
+COMPARE_MODES = ("llm", "fast")
+
+logger = logging.getLogger(__name__)
 
 
 def safe_json_extract(text):
@@ -46,19 +71,76 @@ def safe_json_extract(text):
         raise ValueError(f"Failed to parse JSON from model response: {e}")
 
 
+def parse_model_json(text):
+    """Decode JSON from an LLM response, dropping <think> blocks and code fences."""
+    if isinstance(text, (dict, list)):
+        return text
+    cleaned = re.sub(r"<think>.*?</think>", "", str(text), flags=re.DOTALL)
+    cleaned = cleaned.replace("```json", "").replace("```", "").strip()
+    match = re.search(r"(\{[\s\S]*\}|\[[\s\S]*\])", cleaned)
+    if match:
+        return json.loads(match.group(0))
+    return parse_json_response(cleaned)
+
+
+def _read_bytes(path: str) -> bytes:
+    """Read a whole file (blocking; dispatched through run_io)."""
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _sha256(data: bytes) -> str:
+    """SHA-256 hex digest (hashlib releases the GIL for large inputs)."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def comparison_hashes(resume_row: Dict[str, Any], job_row: Dict[str, Any], mode: str) -> Tuple[str, str]:
+    """
+    Content hashes of both sides of a comparison; a stored result is reused only while both match.
+    The job side covers the model and, for the fast modes, the skill matcher rules.
+    """
+    resume_hash = _sha256(str(resume_row["extracted_keys"]).encode("utf-8"))
+    job_parts = [job_row["description"], str(job_row.get("required_skills")), LLM_MODEL]
+    if mode != "llm":
+        job_parts.append(matcher_version())
+    return resume_hash, _sha256(json.dumps(job_parts).encode("utf-8"))
+
+
 class ResumeService:
     """Service for resume processing operations."""
 
     def __init__(self):
         self.parser_service = ParserService()
-
-    async def parse_resume(self, file_path: str, file_name: str) -> Dict[str, Any]:
+        self.resume_repository = ResumeRepository()
+        self.job_repository = JobRepository()
+        self.comparison_repository = ComparisonRepository()
+
+    def _parse_cache_key(self, content_hash: str, mode: str = "two_call") -> str:
+        """Cache key: file bytes hash + parser (model/prompt) version."""
+        if mode == "combined":
+            version = "combined-" + self.parser_service.combined_extraction_version()
+        else:
+            version = self.parser_service.extraction_version()
+        return f"parse:v{PARSE_CACHE_VERSION}:{version}:{content_hash}"
+
+    async def parse_resume(
+        self,
+        file_path: str,
+        file_name: str,
+        content_hash: Optional[str] = None,
+        use_cache: bool = True,
+        include_text: bool = False
+    ) -> Dict[str, Any]:
         """
         Parse a saved resume file (PDF or image) from disk.
+        The file is read once; hashing and extraction both use the in-memory bytes.
 
         Args:
             file_path: Absolute or relative path to the resume file.
             file_name: Original filename (for responses)
+            content_hash: SHA-256 of the file bytes, if already known
+            use_cache: Set False to bypass the parse and LLM response caches
+            include_text: Also return the extracted text as "resume_text"
 
         Returns:
             Dictionary with parsed resume data.
@@ -71,101 +153,408 @@ class ResumeService:
             raise HTTPException(status_code=404, detail=f"File not found: {file_path}")
 
         file_ext = os.path.splitext(file_path)[1].lower()
-        supported_extensions = ['.pdf', '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp']
-
-        if file_ext not in supported_extensions:
+        if file_ext not in SUPPORTED_EXTENSIONS:
             raise HTTPException(
                 status_code=400,
-                detail=f"Unsupported file type. Supported: {', '.join(supported_extensions)}"
+                detail=f"Unsupported file type. Supported: {', '.join(SUPPORTED_EXTENSIONS)}"
             )
 
-        suffix = file_ext if file_ext == '.pdf' else '.jpg'
-        tmp_file_path = None
-
-        try:
-            # Copy to a temp file for processing (some libs expect a regular file path)
-            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-                tmp_file_path = tmp_file.name
-            shutil.copy2(file_path, tmp_file_path)
+        content = await run_io(_read_bytes, file_path)
+        if content_hash is None:
+            content_hash = await run_io(_sha256, content)
+
+        return await self.parse_resume_content(
+            content, file_name, file_ext, content_hash=content_hash, use_cache=use_cache,
+            include_text=include_text
+        )
+
+    async def parse_resume_content(
+        self,
+        source: Union[bytes, memoryview, BinaryIO],
+        file_name: str,
+        file_type: str,
+        content_hash: Optional[str] = None,
+        use_cache: bool = True,
+        include_text: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Parse resume content that is already in memory (or in a spooled upload).
+        Identical content is served from the content-addressed parse cache.
 
-            # Extract text (PDF or image) using ParserService
-            if not hasattr(self.parser_service, "extract_text"):
-                raise RuntimeError("ParserService.extract_text not implemented")
+        Args:
+            source: File bytes, memoryview or readable binary file object
+            file_name: Original filename (for responses)
+            file_type: Extension of the content, e.g. ".pdf" or ".png"
+            content_hash: SHA-256 of the content (required for cache lookups)
+            use_cache: Set False to bypass the parse and LLM response caches
+            include_text: Also return the extracted text as "resume_text"; cache entries
+                written before the text was cached get it re-extracted locally (no LLM call)
 
-            resume_text = self.parser_service.extract_text(tmp_file_path)
-            if not resume_text or not str(resume_text).strip():
-                raise HTTPException(status_code=400, detail="No text could be extracted from the file")
+        Returns:
+            Dictionary with parsed resume data.
 
-            # Extract structured data using parser_service; handle both dict and string responses
-            if not hasattr(self.parser_service, "extract_resume_data"):
-                raise RuntimeError("ParserService.extract_resume_data not implemented")
+        Raises:
+            HTTPException: If no text can be extracted or parsing fails.
+        """
+        cache_key = self._parse_cache_key(content_hash) if use_cache and content_hash else None
+        if cache_key:
+            cached = await run_io(get_parse_cache().get, cache_key)
+            if cached is not None:
+                result = {
+                    "status": "success",
+                    "filename": file_name,
+                    "resume_text_length": cached["resume_text_length"],
+                    "extracted_data": cached["extracted_data"],
+                    "cached": True
+                }
+                if include_text:
+                    resume_text = cached.get("resume_text")
+                    if resume_text is None:
+                        resume_text, _ = await self._extract_resume_text(source, file_name, file_type)
+                        await run_io(get_parse_cache().set, cache_key, {**cached, "resume_text": resume_text})
+                    result["resume_text"] = resume_text
+                return result
 
-            extracted_info_raw = self.parser_service.extract_resume_data(resume_text)
-            try:
-                extracted_info = safe_json_extract(extracted_info_raw)
-            except ValueError:
-                # Fallback to parse_json_response if provided (maintain existing util)
-                extracted_info = parse_json_response(extracted_info_raw)
+        try:
+            resume_text, extraction_stats = await self._extract_resume_text(source, file_name, file_type)
+            extracted_info = await self._structure_resume_text(resume_text, use_cache, cache_key)
 
-            return {
+            result = {
                 "status": "success",
                 "filename": file_name,
                 "resume_text_length": len(resume_text),
                 "extracted_data": extracted_info,
+                "cached": False,
+                "extraction_stats": extraction_stats
             }
+            if include_text:
+                result["resume_text"] = resume_text
+            return result
 
         except HTTPException:
             raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error processing resume: {str(e)}")
-        finally:
-            try:
-                if tmp_file_path and os.path.exists(tmp_file_path):
-                    os.unlink(tmp_file_path)
-            except Exception:
-                pass
-    def extract_keys(self, extracted_data: dict, resume_id: Optional[str] = None) -> Dict[str, Any]:
+
+    async def cached_parse(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Parse-cache entry (resume_text_length, extracted_data, usually resume_text) for content, or None."""
+        return await run_io(get_parse_cache().get, self._parse_cache_key(content_hash))
+
+    async def structure_resume_text(
+        self,
+        resume_text: str,
+        content_hash: Optional[str] = None,
+        use_cache: bool = True
+    ) -> Any:
         """
-        Extract key categories (AI-based) from parsed resume data and optionally save to DB.
+        Structured fields for already extracted text (the LLM half of parse_resume_content).
+
+        Args:
+            resume_text: Text from ParserService.extract_text_with_stats
+            content_hash: SHA-256 of the source file; the result is parse-cached under it
+            use_cache: Set False to bypass the parse and LLM response caches
         """
+        cache_key = self._parse_cache_key(content_hash) if use_cache and content_hash else None
+        return await self._structure_resume_text(resume_text, use_cache, cache_key)
+
+    async def _extract_resume_text(
+        self,
+        source: Union[bytes, memoryview, BinaryIO],
+        file_name: str,
+        file_type: str
+    ):
+        """Extract text (PDF or image); raises 400 when nothing is extracted."""
+        resume_text, extraction_stats = await self.parser_service.extract_text_with_stats(
+            source, file_type=file_type
+        )
+        logger.info("Extracted %s: %s", file_name, extraction_stats)
+        if not resume_text or not str(resume_text).strip():
+            raise HTTPException(status_code=400, detail="No text could be extracted from the file")
+        return resume_text, extraction_stats
+
+    async def _structure_resume_text(
+        self,
+        resume_text: str,
+        use_cache: bool,
+        cache_key: Optional[str] = None
+    ) -> Any:
+        """Extract structured fields with the LLM and store them under cache_key."""
+        # Extract structured data using parser_service; handle both dict and string responses
+        extracted_info_raw = await self.parser_service.extract_resume_data(
+            resume_text, cache=None if use_cache else False
+        )
         try:
-            if isinstance(extracted_data, (dict, list)):
-                input_data = json.dumps(extracted_data, indent=2)
-            else:
-                input_data = str(extracted_data)
+            extracted_info = safe_json_extract(extracted_info_raw)
+        except ValueError:
+            # Fallback to parse_json_response if provided (maintain existing util)
+            extracted_info = parse_json_response(extracted_info_raw)
 
-            if not hasattr(self.parser_service, "extract_key_categories"):
-                raise RuntimeError("ParserService.extract_key_categories not implemented")
+        if cache_key and isinstance(extracted_info, dict) and "parse_error" not in extracted_info:
+            await run_io(get_parse_cache().set, cache_key, {
+                "resume_text_length": len(resume_text),
+                "resume_text": resume_text,
+                "extracted_data": extracted_info
+            })
+        return extracted_info
 
-            key_data_raw = self.parser_service.extract_key_categories(input_data)
+    async def parse_stored_resume(self, file_id: str, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Parse a previously uploaded resume, save the result to parsed_resumes
+        and the extracted text to resume_texts (indexed for full-text search).
 
-            # ✅ Clean the raw AI response
-            if isinstance(key_data_raw, (dict, list)):
-                key_data = key_data_raw
-            else:
-                cleaned = re.sub(r"<think>.*?</think>", "", key_data_raw, flags=re.DOTALL)  # remove reasoning
-                cleaned = cleaned.replace("```json", "").replace("```", "").strip()
+        Args:
+            file_id: UUID of the uploaded file (returned by /upload)
+            use_cache: Set False to bypass the parse and LLM response caches
 
-                # Extract only JSON portion
-                match = re.search(r"(\{[\s\S]*\}|\[[\s\S]*\])", cleaned)
-                if match:
-                    key_data = json.loads(match.group(0))
-                else:
-                    key_data = parse_json_response(cleaned)
+        Returns:
+            Parse response with extracted data and cache/extraction stats.
+
+        Raises:
+            HTTPException: If the upload is unknown or parsing fails.
+        """
+        # 1️⃣ Fetch file path from database
+        result = await self.resume_repository.get_resume_file(file_id)
+        if not result:
+            raise HTTPException(status_code=404, detail="File not found")
+
+        file_name, file_path = result["file_name"], result["file_path"]
+        logger.info("Parsing file: %s %s", file_name, file_path)
+
+        # 2️⃣ Parse the file
+        parsed_data = await self.parse_resume(file_path, file_name, use_cache=use_cache, include_text=True)
+        extracted = parsed_data.get("extracted_data", {})
+
+        # 3️⃣ Call stored procedure to insert/update parsed data
+        await self.resume_repository.upsert_parsed_resume(file_id, extracted, parsed_data.get("resume_text_length", 0))
+
+        # 4️⃣ Persist and index the text
+        resume_text = parsed_data["resume_text"]
+        await self.resume_repository.save_resume_text(file_id, resume_text)
+        get_text_index().add(file_id, resume_text)
+
+        return {
+            "status": parsed_data.get("status", "success"),
+            "filename": file_name,
+            "resume_text_length": parsed_data.get("resume_text_length", 0),
+            "extracted_data": extracted,
+            "cached": parsed_data.get("cached", False),
+            "extraction_stats": parsed_data.get("extraction_stats"),
+            "message": "Resume parsed and saved successfully"
+        }
+
+    async def backfill_resume_texts(self, after: str = "", limit: int = PARSE_BATCH_MAX_FILES) -> Dict[str, Any]:
+        """
+        Store and index the text of parsed resumes that have no resume_texts row
+        (parsed before full-text search existed). Text is re-extracted from the
+        stored files, PARSE_BATCH_CONCURRENCY at a time; no LLM calls are made.
+
+        Args:
+            after: Resume id to continue after (next_after of the previous call)
+            limit: Resumes to process in this call
+
+        Returns:
+            Counts, per-id errors and next_after (None when nothing is left)
+        """
+        # 1️⃣ Parsed resumes without stored text, in id order
+        rows = await self.resume_repository.list_resumes_without_text(after, limit)
+
+        # 2️⃣ Extract their text, a bounded number at a time
+        semaphore = asyncio.Semaphore(PARSE_BATCH_CONCURRENCY)
+
+        async def extract_one(row: Dict[str, Any]) -> Tuple[str, Optional[str], Optional[str]]:
+            file_id = str(row["id"])
+            async with semaphore:
+                try:
+                    content = await run_io(_read_bytes, row["file_path"])
+                    resume_text, _ = await self._extract_resume_text(
+                        content, row["file_name"], os.path.splitext(row["file_path"])[1].lower()
+                    )
+                    return file_id, resume_text, None
+                except HTTPException as e:
+                    return file_id, None, e.detail
+                except Exception as e:
+                    return file_id, None, str(e)
+
+        extracted = await asyncio.gather(*(extract_one(row) for row in rows))
+        texts = [(file_id, resume_text) for file_id, resume_text, _ in extracted if resume_text]
+
+        # 3️⃣ Save in one batch and index
+        await self.resume_repository.save_resume_texts(texts)
+        index = get_text_index()
+        for file_id, resume_text in texts:
+            index.add(file_id, resume_text)
+
+        return {
+            "processed": len(rows),
+            "indexed": len(texts),
+            "errors": [{"file_id": file_id, "error": error} for file_id, _, error in extracted if error],
+            "next_after": str(rows[-1]["id"]) if len(rows) == limit else None
+        }
+
+    async def parse_batch(
+        self,
+        file_ids: Optional[List[str]] = None,
+        all_unparsed: bool = False,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Parse many uploaded resumes with bounded concurrency and bulk writes.
+
+        Text extraction and the ats_extractor call run PARSE_BATCH_CONCURRENCY
+        resumes at a time. Parsed rows (and their text) are written in one
+        transaction every PARSE_BATCH_WRITE_SIZE results. A failing resume is reported
+        under its id and does not abort the batch.
+
+        Args:
+            file_ids: Upload ids to parse
+            all_unparsed: Parse the oldest uploads without a parsed_resumes row instead
+            use_cache: Set False to bypass the parse and LLM response caches
+
+        Returns:
+            Counts and one result per id (status plus cached/resume_text_length or error)
+
+        Raises:
+            HTTPException: 400 if neither or both selectors are given, or too many ids
+        """
+        if bool(file_ids) == all_unparsed:
+            raise HTTPException(status_code=400, detail="Pass either file_ids or all_unparsed=true")
+        if file_ids and len(file_ids) > PARSE_BATCH_MAX_FILES:
+            raise HTTPException(status_code=400, detail=f"At most {PARSE_BATCH_MAX_FILES} file ids per batch")
+
+        # 1️⃣ Resolve the uploads
+        if all_unparsed:
+            rows = await self.resume_repository.list_unparsed_resume_files(PARSE_BATCH_MAX_FILES)
+            file_ids = [str(row["id"]) for row in rows]
+        else:
+            file_ids = list(dict.fromkeys(file_ids))
+            rows = await self.resume_repository.get_resume_files(file_ids)
+        files = {str(row["id"]): row for row in rows}
+        results: Dict[str, Dict[str, Any]] = {
+            file_id: {"file_id": file_id, "status": "error", "error": "File not found"}
+            for file_id in file_ids if file_id not in files
+        }
+
+        # 2️⃣ Extract and parse, a bounded number at a time
+        semaphore = asyncio.Semaphore(PARSE_BATCH_CONCURRENCY)
+
+        async def parse_one(file_id: str) -> Tuple[str, Any]:
+            async with semaphore:
+                row = files[file_id]
+                try:
+                    return file_id, await self.parse_resume(
+                        row["file_path"], row["file_name"], use_cache=use_cache, include_text=True
+                    )
+                except HTTPException as e:
+                    return file_id, e
+                except Exception as e:
+                    return file_id, HTTPException(status_code=500, detail=f"Error processing resume: {str(e)}")
+
+        pending: List[Tuple[str, Dict[str, Any], int, Optional[str]]] = []
+
+        async def flush() -> None:
+            batch = pending[:]
+            pending.clear()
+            try:
+                await self.resume_repository.upsert_parsed_resumes(batch)
+            except Exception as e:
+                logger.exception("Bulk upsert of %d parsed resumes failed", len(batch))
+                for file_id, _, _, _ in batch:
+                    results[file_id] = {"file_id": file_id, "status": "error", "error": f"Saving failed: {str(e)}"}
+                return
+            index = get_text_index()
+            for file_id, _, _, resume_text in batch:
+                if resume_text:
+                    index.add(file_id, resume_text)
+
+        # 3️⃣ Bulk-upsert results as they complete
+        tasks = [asyncio.create_task(parse_one(file_id)) for file_id in files]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                file_id, parsed = await next_done
+                if isinstance(parsed, HTTPException):
+                    results[file_id] = {"file_id": file_id, "status": "error", "error": parsed.detail}
+                    continue
+                extracted = parsed.get("extracted_data")
+                if not isinstance(extracted, dict) or "parse_error" in extracted:
+                    results[file_id] = {"file_id": file_id, "status": "error", "error": "Model output was not valid JSON"}
+                    continue
+
+                text_length = parsed.get("resume_text_length", 0)
+                results[file_id] = {
+                    "file_id": file_id,
+                    "status": "success",
+                    "cached": parsed.get("cached", False),
+                    "resume_text_length": text_length
+                }
+                pending.append((file_id, extracted, text_length, parsed.get("resume_text")))
+                if len(pending) >= PARSE_BATCH_WRITE_SIZE:
+                    await flush()
+            if pending:
+                await flush()
+        finally:
+            for task in tasks:
+                task.cancel()  # client went away: stop the remaining LLM calls
+
+        ordered = [results[file_id] for file_id in file_ids]
+        parsed_count = sum(1 for result in ordered if result["status"] == "success")
+        return {
+            "requested": len(ordered),
+            "parsed": parsed_count,
+            "failed": len(ordered) - parsed_count,
+            "results": ordered
+        }
+
+    async def extract_key_categories(self, extracted_data: Any, use_cache: bool = True) -> Any:
+        """
+        Key categories for parsed resume data, with LLM and parse errors left unwrapped.
+
+        Args:
+            extracted_data: Parsed resume fields (dict/list) or their JSON string
+            use_cache: Set False to bypass the LLM response cache
+
+        Returns:
+            Decoded key categories
+        """
+        if isinstance(extracted_data, (dict, list)):
+            input_data = json.dumps(extracted_data, indent=2)
+        else:
+            input_data = str(extracted_data)
+
+        if not hasattr(self.parser_service, "extract_key_categories"):
+            raise RuntimeError("ParserService.extract_key_categories not implemented")
+
+        key_data_raw = await self.parser_service.extract_key_categories(
+            input_data, cache=None if use_cache else False
+        )
+
+        # ✅ Clean the raw AI response
+        if isinstance(key_data_raw, (dict, list)):
+            return key_data_raw
+        cleaned = re.sub(r"<think>.*?</think>", "", key_data_raw, flags=re.DOTALL)  # remove reasoning
+        cleaned = cleaned.replace("```json", "").replace("```", "").strip()
+
+        # Extract only JSON portion
+        match = re.search(r"(\{[\s\S]*\}|\[[\s\S]*\])", cleaned)
+        if match:
+            return json.loads(match.group(0))
+        return parse_json_response(cleaned)
+
+    async def extract_keys(
+        self,
+        extracted_data: dict,
+        resume_id: Optional[str] = None,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Extract key categories (AI-based) from parsed resume data and optionally save to DB.
+        """
+        try:
+            key_data = await self.extract_key_categories(extracted_data, use_cache=use_cache)
 
             # ✅ Optionally save to DB
             if resume_id:
-                conn = get_connection()
-                cursor = conn.cursor()
-                cursor.execute("""
-                    UPDATE parsed_resumes
-                    SET extracted_keys = %s,
-                        parsed_at = NOW()
-                    WHERE resume_id = %s
-                """, (json.dumps(key_data, ensure_ascii=False, indent=2), resume_id))
-                conn.commit()
-                cursor.close()
-                conn.close()
+                await self.resume_repository.save_extracted_keys(resume_id, key_data)
+                get_skill_index().update(resume_id, key_data)
 
             return {
                 "status": "success",
@@ -176,7 +565,7 @@ class ResumeService:
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error extracting and saving key categories: {str(e)}")
 
-    def generate_questions(self, file_id: str) -> Dict[str, Any]:
+    async def generate_questions(self, file_id: str) -> Dict[str, Any]:
         """
         Generate interview questions based on extracted key categories stored in DB.
         
@@ -187,20 +576,8 @@ class ResumeService:
             Dict[str, Any]: Clean, structured JSON of generated interview questions.
         """
         try:
-            # ✅ Connect to database and fetch extracted_keys
-            conn = get_connection()
-            if conn is None:
-                raise HTTPException(status_code=500, detail="Database connection not available")
-
-            cursor = conn.cursor(dictionary=True)
-            cursor.execute("""
-                SELECT extracted_keys 
-                FROM parsed_resumes 
-                WHERE resume_id = %s
-            """, (file_id,))
-            row = cursor.fetchone()
-            cursor.close()
-            conn.close()
+            # ✅ Fetch extracted_keys from the database
+            row = await self.resume_repository.get_extracted_keys(file_id)
 
             if not row or not row.get("extracted_keys"):
                 raise HTTPException(status_code=404, detail="No extracted key categories found for this file")
@@ -214,26 +591,8 @@ class ResumeService:
                 except json.JSONDecodeError:
                     key_categories = parse_json_response(key_categories)
 
-            # ✅ Prepare input for LLM
-            inp = json.dumps(key_categories, indent=2)
-
-            if not hasattr(self, "parser_service") or not hasattr(self.parser_service, "generate_questions"):
-                raise RuntimeError("ParserService.generate_questions not available")
-
-            result = self.parser_service.generate_questions(inp)
-
-            # ✅ If LLM returned dict, return directly
-            if isinstance(result, (dict, list)):
-                parsed = result
-            else:
-                cleaned = re.sub(r"<think>.*?</think>", "", str(result), flags=re.DOTALL)
-                cleaned = cleaned.replace("```json", "").replace("```", "").strip()
-
-                match = re.search(r"(\{[\s\S]*\}|\[[\s\S]*\])", cleaned)
-                if match:
-                    parsed = json.loads(match.group(0))
-                else:
-                    parsed = parse_json_response(cleaned)
+            # ✅ Generate per topic group concurrently and merge
+            parsed = await self._generate_questions_grouped(key_categories)
 
             # ✅ Return structured JSON
             return {
@@ -248,83 +607,199 @@ class ResumeService:
             raise HTTPException(status_code=500, detail=f"Error generating questions: {str(e)}")
         
     
-    def generate_questions_from_key_categories(self, key_categories: dict) -> Dict[str, Any]:
+    async def generate_questions_from_key_categories(self, key_categories: dict) -> Dict[str, Any]:
         """
         Generate interview questions directly from extracted key categories.
         This avoids using the database and works purely in-memory (for the pipeline).
         """
         try:
-            # ✅ Convert dict to JSON string for LLM
-            inp = json.dumps(key_categories, indent=2)
+            return await self._generate_questions_grouped(key_categories)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error generating questions: {str(e)}")
 
-            # ✅ Check if parser service is available
-            if not hasattr(self.parser_service, "generate_questions"):
-                raise RuntimeError("ParserService.generate_questions not available")
+    @staticmethod
+    def _question_groups(key_categories: Any, group_size: int = QUESTION_GROUP_SIZE) -> List[Dict[str, List[str]]]:
+        """
+        Split key categories into LLM inputs of at most group_size topics.
+        Categories keep their order; a topic already seen in an earlier
+        category (case-insensitive) is dropped. Anything that is not a
+        {category: [topics]} mapping is returned as a single group.
+        """
+        if not isinstance(key_categories, dict) or not all(
+            isinstance(topics, list) for topics in key_categories.values()
+        ):
+            return [key_categories]
+
+        seen = set()
+        groups = []
+        for category, topics in key_categories.items():
+            unique = []
+            for topic in topics:
+                marker = str(topic).strip().lower()
+                if marker and marker not in seen:
+                    seen.add(marker)
+                    unique.append(topic)
+            for i in range(0, len(unique), group_size):
+                groups.append({category: unique[i:i + group_size]})
+        return groups or [key_categories]
+
+    async def _generate_questions_grouped(self, key_categories: Any) -> Any:
+        """
+        Generate questions with one LLM call per topic group, at most
+        QUESTION_CONCURRENCY at a time, so wall-clock time follows the largest
+        group and no single response is long enough to be truncated.
 
-            # ✅ Send data to LLM
-            result = self.parser_service.generate_questions(inp)
+        Returns:
+            {topic: [questions]} merged in group order (independent of which call finishes first)
+        """
+        groups = self._question_groups(key_categories)
+        semaphore = asyncio.Semaphore(QUESTION_CONCURRENCY)
 
-            # ✅ Handle result (dict or string)
-            if isinstance(result, (dict, list)):
-                parsed = result
-            else:
-                cleaned = re.sub(r"<think>.*?</think>", "", str(result), flags=re.DOTALL)
-                cleaned = cleaned.replace("```json", "").replace("```", "").strip()
+        async def run(group):
+            async with semaphore:
+                result = await self.parser_service.generate_questions(json.dumps(group, indent=2))
+            return parse_model_json(result)
 
-                match = re.search(r"(\{[\s\S]*\}|\[[\s\S]*\])", cleaned)
-                if match:
-                    parsed = json.loads(match.group(0))
-                else:
-                    parsed = parse_json_response(cleaned)
+        tasks = [asyncio.ensure_future(run(group)) for group in groups]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()  # one group failed: stop the remaining LLM calls
+            raise
 
-            return parsed
+        if len(results) == 1:
+            return results[0]
 
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Error generating questions: {str(e)}")
+        merged: Dict[str, Any] = {}
+        for result in results:
+            if not isinstance(result, dict):
+                raise ValueError("Expected a JSON object of topic questions from the model")
+            for topic, questions in result.items():
+                if topic in merged and isinstance(merged[topic], list) and isinstance(questions, list):
+                    merged[topic].extend(q for q in questions if q not in merged[topic])
+                else:
+                    merged.setdefault(topic, questions)
+        return merged
+
+    async def _parse_combined(
+        self,
+        source: Union[bytes, memoryview, BinaryIO],
+        file_name: str,
+        file_type: str,
+        content_hash: Optional[str] = None,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Parse a resume and extract its key categories with a single LLM call.
+        The response is validated against ParseResumeResponse/ExtractKeysResponse;
+        if it does not fit, the two-call path runs on the already extracted text.
+        """
+        cache_key = self._parse_cache_key(content_hash, mode="combined") if use_cache and content_hash else None
+        if cache_key:
+            cached = await run_io(get_parse_cache().get, cache_key)
+            if cached is not None:
+                return {**cached, "cached": True, "fallback": False}
+
+        resume_text, extraction_stats = await self._extract_resume_text(source, file_name, file_type)
+        raw = await self.parser_service.extract_resume_and_keys(resume_text, cache=None if use_cache else False)
+        try:
+            combined = parse_model_json(raw)
+            parsed = ParseResumeResponse(
+                status="success",
+                filename=file_name,
+                resume_text_length=len(resume_text),
+                extracted_data=combined.get("resume")
+            )
+            keys = ExtractKeysResponse(
+                status="success",
+                key_categories=combined.get("key_categories"),
+                message="Key categories extracted"
+            )
+        except Exception as e:  # malformed JSON, missing section or wrong shape
+            logger.warning("Combined extraction for %s did not validate (%s); using two-call path", file_name, e)
+            two_call_key = self._parse_cache_key(content_hash) if use_cache and content_hash else None
+            extracted_data = await self._structure_resume_text(resume_text, use_cache, two_call_key)
+            keys_result = await self.extract_keys(extracted_data, use_cache=use_cache)
+            return {
+                "resume_text_length": len(resume_text),
+                "extracted_data": extracted_data,
+                "key_categories": keys_result.get("key_categories"),
+                "cached": False,
+                "fallback": True
+            }
 
+        result = {
+            "resume_text_length": parsed.resume_text_length,
+            "extracted_data": parsed.extracted_data,
+            "key_categories": keys.key_categories
+        }
+        if cache_key:
+            await run_io(get_parse_cache().set, cache_key, result)
+        return {**result, "cached": False, "fallback": False}
 
-    
-    async def full_pipeline(self, file: UploadFile) -> Dict[str, Any]:
+    async def full_pipeline(self, file: UploadFile, mode: str = "two_call") -> Dict[str, Any]:
         """
         Complete pipeline: Parse → Extract Keys → Generate Questions.
+        The spooled upload is handed straight to extraction; nothing is
+        written to disk by the pipeline itself.
+
+        Args:
+            file: Uploaded resume
+            mode: "two_call" (parse, then extract keys) or "combined" (one LLM
+                  call for both); the response reports LLM usage of that stage
         """
+        if mode not in EXTRACTION_MODES:
+            raise HTTPException(status_code=400, detail=f"Unknown mode '{mode}'. Supported: {', '.join(EXTRACTION_MODES)}")
+
         file_ext = os.path.splitext(file.filename)[1].lower()
-        supported_extensions = ['.pdf', '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp']
 
-        if file_ext not in supported_extensions:
+        if file_ext not in SUPPORTED_EXTENSIONS:
             raise HTTPException(
                 status_code=400,
-                detail=f"Unsupported file type. Supported: {', '.join(supported_extensions)}"
+                detail=f"Unsupported file type. Supported: {', '.join(SUPPORTED_EXTENSIONS)}"
             )
 
-        suffix = file_ext if file_ext == '.pdf' else '.jpg'
-        tmp_file_path = None
         try:
-            # Step 1: Save uploaded file temporarily
-            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-                tmp_file_path = tmp_file.name
-                content = await file.read()
-                tmp_file.write(content)
-
-            # Step 2: Parse resume
-            parsed = await self.parse_resume(tmp_file_path, file.filename)
-
-            # Step 3: Extract key categories (AI)
-            extracted_data = parsed.get("extracted_data")
-            keys_result = self.extract_keys(extracted_data, resume_id=None)
+            # Step 1: Validate the upload in one streaming pass (size, type, hash)
+            info = await stream_upload(file)
+            await file.seek(0)
+
+            # Step 2-3: Parse resume and extract key categories (AI), timed for comparison
+            started = time.perf_counter()
+            with track_usage() as usage:
+                if mode == "combined":
+                    parsed = await self._parse_combined(
+                        file.file, file.filename, info.file_type, content_hash=info.sha256
+                    )
+                    extracted_data = parsed.get("extracted_data")
+                    key_categories = parsed.get("key_categories")
+                else:
+                    parsed = await self.parse_resume_content(
+                        file.file, file.filename, info.file_type, content_hash=info.sha256
+                    )
+                    extracted_data = parsed.get("extracted_data")
+                    keys_result = await self.extract_keys(extracted_data, resume_id=None)
+                    key_categories = keys_result.get("key_categories")
+            usage["wall_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            usage["fallback"] = parsed.get("fallback", False)
+            usage["parse_cached"] = parsed.get("cached", False)
 
             # Step 4: Generate interview questions directly from extracted data
-            key_categories = keys_result.get("key_categories")
-            questions_parsed = self.generate_questions_from_key_categories(key_categories)
+            questions_parsed = await self.generate_questions_from_key_categories(key_categories)
 
             # ✅ Final structured output
             return {
                 "status": "success",
-                "filename": parsed.get("filename"),
+                "filename": file.filename,
                 "message": "Pipeline completed successfully",
+                "mode": mode,
+                "extraction_usage": usage,
                 "pipeline_results": {
                     "resume_text_length": parsed.get("resume_text_length"),
-                    "extracted_data": parsed.get("extracted_data"),
+                    "extracted_data": extracted_data,
                     "key_categories": key_categories,
                     "interview_questions": questions_parsed
                 }
@@ -334,36 +809,117 @@ class ResumeService:
             raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error in pipeline: {str(e)}")
-        finally:
-            try:
-                if tmp_file_path and os.path.exists(tmp_file_path):
-                    os.unlink(tmp_file_path)
-            except Exception:
-                pass
-
 
-    async def compare_resume_with_job(self, file_id: str, job_id: str):
+    async def full_pipeline_events(
+        self,
+        content: bytes,
+        file_name: str,
+        file_type: str,
+        content_hash: str
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
         """
-        Compare parsed resume data against a job description.
-        Returns a structured JSON response with match %, matching/missing skills, and summary.
+        Full pipeline as a stream of (event, data) pairs, emitted as each stage
+        finishes. Question generation is streamed token by token.
+
+        Events: text_extracted, resume_parsed, keys_extracted, questions_delta
+        (repeated), questions_generated, done. Every payload carries elapsed_ms.
+        Cancelling the consumer cancels the in-flight Groq call.
+
+        Raises:
+            HTTPException: If any stage fails.
         """
+        started = time.perf_counter()
+
+        def event(name: str, **data) -> Tuple[str, Dict[str, Any]]:
+            data["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            return name, data
+
+        # Step 1-2: Extract text and parse (both skipped on a parse-cache hit)
+        cache_key = self._parse_cache_key(content_hash)
+        cached = await run_io(get_parse_cache().get, cache_key)
+        if cached is not None:
+            resume_text_length = cached["resume_text_length"]
+            extracted_data = cached["extracted_data"]
+            yield event("text_extracted", resume_text_length=resume_text_length, cached=True)
+        else:
+            resume_text, extraction_stats = await self._extract_resume_text(content, file_name, file_type)
+            resume_text_length = len(resume_text)
+            yield event("text_extracted", resume_text_length=resume_text_length,
+                        extraction_stats=extraction_stats, cached=False)
+            try:
+                extracted_data = await self._structure_resume_text(resume_text, True, cache_key)
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Error processing resume: {str(e)}")
+        yield event("resume_parsed", extracted_data=extracted_data, cached=cached is not None)
+
+        # Step 3: Extract key categories (AI)
+        keys_result = await self.extract_keys(extracted_data, resume_id=None)
+        key_categories = keys_result.get("key_categories")
+        yield event("keys_extracted", key_categories=key_categories)
+
+        # Step 4: Stream interview questions as they are generated
+        parts = []
+        stream = self.parser_service.generate_questions_stream(json.dumps(key_categories, indent=2))
         try:
-            conn = get_connection()
-            if conn is None:
-                raise HTTPException(status_code=500, detail="Database connection not available")
+            async for delta in stream:
+                parts.append(delta)
+                yield event("questions_delta", delta=delta)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error generating questions: {str(e)}")
+        finally:
+            await stream.aclose()
 
-            cursor = conn.cursor(dictionary=True)
+        try:
+            questions_parsed = parse_model_json("".join(parts))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error generating questions: {str(e)}")
+        yield event("questions_generated", interview_questions=questions_parsed)
+
+        yield event(
+            "done",
+            status="success",
+            filename=file_name,
+            message="Pipeline completed successfully",
+            pipeline_results={
+                "resume_text_length": resume_text_length,
+                "extracted_data": extracted_data,
+                "key_categories": key_categories,
+                "interview_questions": questions_parsed
+            }
+        )
+
+    async def compare_resume_with_job(
+        self,
+        file_id: str,
+        job_id: str,
+        mode: str = "llm",
+        llm_summary: bool = False,
+        force: bool = False
+    ):
+        """
+        Compare parsed resume data against a job description.
+        Returns a structured JSON response with match %, matching/missing skills, and summary.
 
-            # ✅ Fetch parsed resume data
-            cursor.execute("SELECT extracted_keys FROM parsed_resumes WHERE resume_id = %s", (file_id,))
-            resume_row = cursor.fetchone()
+        Results are stored in resume_job_comparisons together with content hashes
+        of the resume keys and the job, and served from there on repeat requests
+        until either side changes.
 
-            # ✅ Fetch job description
-            cursor.execute("SELECT description FROM job_descriptions WHERE job_id = %s", (job_id,))
-            job_row = cursor.fetchone()
+        Args:
+            file_id: Parsed resume ID
+            job_id: Job description ID
+            mode: "llm" (AI comparison) or "fast" (local normalized skill matching, no network call)
+            llm_summary: In fast mode, replace the templated summary with an LLM-written one
+            force: Recompute even if a stored result is still valid
+        """
+        if mode not in COMPARE_MODES:
+            raise HTTPException(status_code=400, detail=f"Unknown mode '{mode}'. Supported: {', '.join(COMPARE_MODES)}")
 
-            cursor.close()
-            conn.close()
+        try:
+            # ✅ Fetch parsed resume data and job description
+            resume_row, job_row = await asyncio.gather(
+                self.resume_repository.get_extracted_keys(file_id),
+                self.job_repository.get_job_requirements(job_id)
+            )
 
             if not resume_row or not resume_row.get("extracted_keys"):
                 raise HTTPException(status_code=404, detail="Parsed resume not found")
@@ -371,6 +927,23 @@ class ResumeService:
             if not job_row:
                 raise HTTPException(status_code=404, detail="Job description not found")
 
+            # ✅ Serve the stored result while neither side has changed
+            stored_mode = "fast_summary" if mode == "fast" and llm_summary else mode
+            resume_hash, job_hash = comparison_hashes(resume_row, job_row, stored_mode)
+            if not force:
+                stored = await self.comparison_repository.get_comparison(file_id, job_id, stored_mode)
+                if stored and stored["resume_hash"] == resume_hash and stored["job_hash"] == job_hash:
+                    record = ResumeJobComparisonDB(**stored)
+                    return {
+                        "status": "success",
+                        "file_id": file_id,
+                        "job_id": job_id,
+                        "mode": mode,
+                        "stored": True,
+                        "compared_at": record.compared_at,
+                        "comparison_result": ComparisonResult(**record.model_dump()).model_dump()
+                    }
+
             resume_data = resume_row["extracted_keys"]
             job_description = job_row["description"]
 
@@ -381,13 +954,35 @@ class ResumeService:
                 except json.JSONDecodeError:
                     resume_data = parse_json_response(resume_data)
 
-            # ✅ Delegate to parser service for AI comparison
-            comparison_result = self.parser_service.compare_resume_to_job(job_description, resume_data)
+            if mode == "fast":
+                # ✅ Local set matching; the LLM is only used for an explicitly requested summary
+                comparison_result = ComparisonResult(**compare_skills(
+                    job_row.get("required_skills"), job_description, resume_data
+                )).model_dump()
+                if llm_summary:
+                    comparison_result["summary"] = await self.parser_service.summarize_match(
+                        job_description, resume_data, comparison_result
+                    )
+            else:
+                # ✅ Delegate to parser service for AI comparison
+                comparison_result = await self.parser_service.compare_resume_to_job(job_description, resume_data)
+
+            # ✅ Store only well-formed results (the AI call may return a parse error instead)
+            try:
+                validated = ComparisonResult(**comparison_result).model_dump()
+            except (TypeError, ValueError):
+                validated = None
+            if validated is not None:
+                await self.comparison_repository.save_comparison(
+                    file_id, job_id, stored_mode, resume_hash, job_hash, validated
+                )
 
             return {
                 "status": "success",
                 "file_id": file_id,
                 "job_id": job_id,
+                "mode": mode,
+                "stored": False,
                 "comparison_result": comparison_result
             }
 
@@ -0,0 +1,310 @@
+"""
+In-memory inverted index from normalized skill/topic to resume ids
+
+Built from parsed_resumes.extracted_keys at startup and updated whenever
+key categories are saved, so boolean skill searches such as
+`kafka AND python AND NOT php` are answered with set operations instead
+of loading and decoding every row. Every SKILL_INDEX_REFRESH_SECONDS the
+rows changed since the last build or refresh (by parsed_at) are re-read,
+so keys saved by task workers on other nodes show up here too.
+
+Query syntax: terms combined with AND, OR, NOT and parentheses. Adjacent
+words form one multi-word term (`machine learning`); quotes are also
+accepted. Operators are case-insensitive and AND binds tighter than OR.
+Terms are normalized like skills (`Node.js` == `nodejs` == `node`).
+"""
+import asyncio
+import logging
+import re
+import time
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from app.core.config import SKILL_INDEX_REFRESH_SECONDS
+from app.core.executors import run_cpu
+from app.repositories import ResumeRepository
+from app.services.skill_matcher import normalize_skill, skill_set
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r'"([^"]*)"|(\()|(\))|([^\s()"]+)')
+_OPERATORS = {"AND", "OR", "NOT"}
+
+
+def _skill_rows(rows: List[Dict[str, Any]]) -> List[Tuple[str, Optional[str], FrozenSet[str]]]:
+    """Decode and normalize extracted_keys for many rows (CPU; run via run_cpu)."""
+    return [
+        (str(row["resume_id"]), row.get("full_name"), frozenset(skill_set(row.get("extracted_keys"))))
+        for row in rows
+    ]
+
+
+def _tokenize(query: str) -> List[Tuple[str, str]]:
+    """(kind, value) tokens; consecutive bare words merge into one term."""
+    tokens: List[Tuple[str, str]] = []
+    for quoted, lparen, rparen, word in _TOKEN_RE.findall(query):
+        if lparen:
+            tokens.append(("(", lparen))
+        elif rparen:
+            tokens.append((")", rparen))
+        elif word and word.upper() in _OPERATORS:
+            tokens.append(("op", word.upper()))
+        elif word and tokens and tokens[-1][0] == "word":
+            tokens[-1] = ("word", f"{tokens[-1][1]} {word}")
+        elif word:
+            tokens.append(("word", word))
+        else:
+            tokens.append(("term", quoted))
+    return [("term", value) if kind == "word" else (kind, value) for kind, value in tokens]
+
+
+class _QueryParser:
+    """Recursive-descent parser evaluating a boolean query against the index."""
+
+    def __init__(self, tokens: List[Tuple[str, str]], index: "SkillIndex"):
+        self.tokens = tokens
+        self.pos = 0
+        self.index = index
+        self.terms: List[str] = []
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def parse(self) -> Set[str]:
+        if not self.tokens:
+            raise ValueError("Empty query")
+        result = self._or()
+        if self._peek() is not None:
+            raise ValueError(f"Unexpected '{self._peek()[1]}' in query")
+        return result
+
+    def _or(self) -> Set[str]:
+        result = self._and()
+        while self._peek() == ("op", "OR"):
+            self.pos += 1
+            result = result | self._and()
+        return result
+
+    def _and(self) -> Set[str]:
+        result = self._not()
+        while True:
+            token = self._peek()
+            if token == ("op", "AND"):
+                self.pos += 1
+            elif token is None or token[0] == ")" or token == ("op", "OR"):
+                return result
+            # implicit AND between adjacent operands, e.g. `python (kafka OR spark)`
+            result = result & self._not()
+
+    def _not(self) -> Set[str]:
+        if self._peek() == ("op", "NOT"):
+            self.pos += 1
+            return self.index.all_ids() - self._not()
+        return self._atom()
+
+    def _atom(self) -> Set[str]:
+        token = self._peek()
+        if token is None:
+            raise ValueError("Query ends unexpectedly")
+        self.pos += 1
+        if token[0] == "(":
+            result = self._or()
+            if self._peek() != (")", ")"):
+                raise ValueError("Missing closing parenthesis")
+            self.pos += 1
+            return result
+        if token[0] == "term":
+            term = normalize_skill(token[1])
+            self.terms.append(term)
+            return self.index.postings(term)
+        raise ValueError(f"Unexpected '{token[1]}' in query")
+
+
+class SkillIndex:
+    """Inverted index: normalized skill -> set of resume ids."""
+
+    def __init__(self):
+        self._postings: Dict[str, Set[str]] = {}
+        self._doc_skills: Dict[str, FrozenSet[str]] = {}
+        self._names: Dict[str, Optional[str]] = {}
+        self._build_lock = asyncio.Lock()
+        self._pending: Optional[List[Tuple[str, FrozenSet[str], Optional[str]]]] = None  # updates during a build
+        self._watermark: Optional[datetime] = None  # DB time the last build/refresh read from
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.ready = False
+        self.built_at: Optional[float] = None
+        self.refreshed_at: Optional[float] = None
+
+    # ---------- Maintenance ----------
+
+    def _add(self, resume_id: str, skills: FrozenSet[str]) -> None:
+        self._remove(resume_id)
+        self._doc_skills[resume_id] = skills
+        for skill in skills:
+            self._postings.setdefault(skill, set()).add(resume_id)
+
+    def _remove(self, resume_id: str) -> None:
+        for skill in self._doc_skills.pop(resume_id, ()):
+            posting = self._postings.get(skill)
+            if posting is not None:
+                posting.discard(resume_id)
+                if not posting:
+                    del self._postings[skill]
+
+    def _apply(self, resume_id: str, skills: FrozenSet[str], full_name: Optional[str]) -> None:
+        self._add(resume_id, skills)
+        if full_name is not None or resume_id not in self._names:
+            self._names[resume_id] = full_name
+
+    def _replay(self, pending: List[Tuple[str, FrozenSet[str], Optional[str]]]) -> None:
+        """Re-apply update() calls made while a build or refresh was reading the database."""
+        for resume_id, skills, full_name in pending:
+            self._apply(resume_id, skills, full_name)
+
+    async def build(self, resume_repository: Optional[ResumeRepository] = None) -> None:
+        """
+        (Re)build the whole index from parsed_resumes.extracted_keys.
+
+        The old index keeps serving searches until the new one is swapped in;
+        updates made meanwhile are replayed on the new one.
+        """
+        async with self._build_lock:
+            started = time.perf_counter()
+            resume_repository = resume_repository or ResumeRepository()
+            self._pending = []
+            try:
+                watermark = await resume_repository.get_db_now()
+                rows = await resume_repository.list_extracted_keys()
+                decoded = await run_cpu(_skill_rows, rows)
+
+                pending, self._pending = self._pending, None
+                self._postings, self._doc_skills, self._names = {}, {}, {}
+                for resume_id, full_name, skills in decoded:
+                    self._names[resume_id] = full_name
+                    self._add(resume_id, skills)
+                self._replay(pending)
+            finally:
+                self._pending = None
+
+            self._watermark = watermark
+            self.ready = True
+            self.built_at = self.refreshed_at = time.time()
+            logger.info(
+                "Skill index built: %d resumes, %d skills in %.1f ms",
+                len(self._doc_skills), len(self._postings), (time.perf_counter() - started) * 1000
+            )
+
+    async def refresh(self, resume_repository: Optional[ResumeRepository] = None) -> int:
+        """
+        Apply parsed_resumes rows changed since the last build or refresh,
+        including changes made on other nodes. Builds first if not ready.
+
+        Returns:
+            Number of re-read rows
+        """
+        if not self.ready:
+            await self.build(resume_repository)
+            return len(self._doc_skills)
+
+        async with self._build_lock:
+            resume_repository = resume_repository or ResumeRepository()
+            self._pending = []
+            try:
+                # parsed_at has second resolution: >= the previous read time re-reads that
+                # second's rows (harmless) instead of missing ones written after the read
+                watermark = await resume_repository.get_db_now()
+                rows = await resume_repository.list_extracted_keys_since(self._watermark)
+                decoded = await run_cpu(_skill_rows, rows) if rows else []
+
+                pending, self._pending = self._pending, None
+                for row, (resume_id, full_name, skills) in zip(rows, decoded):
+                    if row.get("extracted_keys") is None:
+                        self._remove(resume_id)
+                        self._names.pop(resume_id, None)
+                    else:
+                        self._names[resume_id] = full_name
+                        self._add(resume_id, skills)
+                self._replay(pending)
+            finally:
+                self._pending = None
+
+            self._watermark = watermark
+            self.refreshed_at = time.time()
+            return len(rows)
+
+    async def start_refresh(self, interval: float = SKILL_INDEX_REFRESH_SECONDS) -> None:
+        """Refresh in the background every interval seconds (0 disables)."""
+        if interval > 0 and self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop(interval))
+
+    async def stop_refresh(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+            self._refresh_task = None
+
+    async def _refresh_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.warning("Skill index refresh failed", exc_info=True)
+
+    async def ensure_built(self) -> None:
+        """Build on first use if the startup build did not succeed."""
+        if not self.ready:
+            await self.build()
+
+    def update(self, resume_id: str, extracted_keys: Any, full_name: Optional[str] = None) -> None:
+        """Re-index one resume after its key categories were saved."""
+        resume_id = str(resume_id)
+        skills = frozenset(skill_set(extracted_keys))
+        if self._pending is not None:
+            self._pending.append((resume_id, skills, full_name))
+        self._apply(resume_id, skills, full_name)
+
+    # ---------- Queries ----------
+
+    def all_ids(self) -> Set[str]:
+        return set(self._doc_skills)
+
+    def postings(self, skill: str) -> Set[str]:
+        """Posting list for a skill; callers must not mutate it (the parser only builds new sets)."""
+        return self._postings.get(skill, set())
+
+    def search(self, query: str) -> Tuple[List[str], List[str]]:
+        """
+        Evaluate a boolean skill query.
+
+        Returns:
+            (matching resume ids sorted, normalized terms used)
+
+        Raises:
+            ValueError: If the query is malformed
+        """
+        parser = _QueryParser(_tokenize(query), self)
+        return sorted(parser.parse()), parser.terms
+
+    def name(self, resume_id: str) -> Optional[str]:
+        return self._names.get(resume_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "resumes": len(self._doc_skills),
+            "skills": len(self._postings),
+            "built_at": self.built_at,
+            "refreshed_at": self.refreshed_at
+        }
+
+
+_skill_index: Optional[SkillIndex] = None
+
+
+def get_skill_index() -> SkillIndex:
+    """Process-wide skill index."""
+    global _skill_index
+    if _skill_index is None:
+        _skill_index = SkillIndex()
+    return _skill_index
@@ -0,0 +1,221 @@
+"""
+Local skill matching used to pre-score candidates before any LLM call
+
+Skills are normalized (case, punctuation, common aliases) and compared as
+sets. Job terms come from the job's required_skills plus any known skill
+mentioned in the description. Everything here is pure CPU work on plain
+data, so it can run in the process pool via run_cpu.
+"""
+import hashlib
+import json
+import re
+from typing import Any, Dict, List, Set, Tuple
+
+# Frequent spellings of the same skill
+SKILL_ALIASES = {
+    "js": "javascript",
+    "ts": "typescript",
+    "reactjs": "react",
+    "react js": "react",
+    "nodejs": "node",
+    "node js": "node",
+    "vuejs": "vue",
+    "nextjs": "next",
+    "expressjs": "express",
+    "postgres": "postgresql",
+    "k8s": "kubernetes",
+    "golang": "go",
+    "ml": "machine learning",
+    "dl": "deep learning",
+    "nlp": "natural language processing",
+    "sklearn": "scikit learn",
+    "scikitlearn": "scikit learn",
+    "tf": "tensorflow",
+    "amazon web services": "aws",
+    "google cloud": "gcp",
+    "google cloud platform": "gcp",
+    "rest": "rest apis",
+    "rest api": "rest apis",
+    "dot net": "dotnet",
+}
+
+# Skills recognised in job descriptions (the only description terms job_terms picks up)
+COMMON_SKILLS = frozenset({
+    "python", "java", "javascript", "typescript", "c++", "c#", "rust", "kotlin", "swift",
+    "php", "ruby", "scala", "sql", "html", "css", "bash",
+    "react", "angular", "vue", "next", "node", "express", "django", "flask", "fastapi", "spring",
+    "spring boot", "rails", "laravel", "dotnet", "graphql", "rest apis", "grpc", "microservices",
+    "tensorflow", "pytorch", "keras", "scikit learn", "pandas", "numpy", "spark", "hadoop", "kafka",
+    "airflow", "machine learning", "deep learning", "natural language processing", "computer vision",
+    "data science", "data analysis", "statistics", "llm", "generative ai",
+    "mysql", "postgresql", "mongodb", "redis", "elasticsearch", "cassandra", "oracle", "sqlite",
+    "aws", "gcp", "azure", "docker", "kubernetes", "terraform", "ansible", "jenkins", "ci cd",
+    "git", "linux", "devops", "agile", "scrum", "unit testing", "system design",
+})
+
+REQUIRED_SKILL_WEIGHT = 2.0
+DESCRIPTION_SKILL_WEIGHT = 1.0
+MAX_NGRAM = 3
+SKILL_MATCHER_VERSION = "1"  # bump when the matching code changes
+
+
+def matcher_version() -> str:
+    """
+    Fingerprint of the matching rules (code version, aliases, vocabulary, weights).
+    Stored fast-mode comparisons are recomputed once it changes.
+    """
+    fingerprint = json.dumps([
+        SKILL_MATCHER_VERSION, sorted(SKILL_ALIASES.items()), sorted(COMMON_SKILLS),
+        REQUIRED_SKILL_WEIGHT, DESCRIPTION_SKILL_WEIGHT, MAX_NGRAM
+    ])
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()[:16]
+
+
+def _clean(text: str) -> str:
+    """Lowercase and strip punctuation, keeping the dots that are part of a name (Node.js, .NET)."""
+    text = re.sub(r"\.js\b", "js", text.lower())
+    text = re.sub(r"(?<![a-z0-9])\.net\b", "dotnet", text)
+    return re.sub(r"[^a-z0-9+#]+", " ", text).strip()
+
+
+def normalize_skill(term: Any) -> str:
+    """Canonical form of a skill name: 'Node.JS' -> 'node', 'Scikit-Learn' -> 'scikit learn', '.NET' -> 'dotnet'."""
+    text = _clean(str(term))
+    return SKILL_ALIASES.get(text, text)
+
+
+def flatten_terms(value: Any) -> List[str]:
+    """All strings in a nested dict/list structure; comma-separated strings are split."""
+    if value is None:
+        return []
+    if isinstance(value, dict):
+        return [term for item in value.values() for term in flatten_terms(item)]
+    if isinstance(value, (list, tuple, set)):
+        return [term for item in value for term in flatten_terms(item)]
+    return [part.strip() for part in str(value).split(",") if part.strip()]
+
+
+def decode_json(value: Any) -> Any:
+    """Decode a JSON column value, returning it unchanged when it is not JSON text."""
+    if isinstance(value, (str, bytes)):
+        try:
+            return json.loads(value)
+        except (TypeError, ValueError):
+            return value
+    return value
+
+
+def skill_set(extracted_keys: Any) -> Set[str]:
+    """Normalized skills/topics of a resume's extracted key categories."""
+    return {normalize_skill(term) for term in flatten_terms(decode_json(extracted_keys))} - {""}
+
+
+def _ngrams(text: str, max_n: int = MAX_NGRAM) -> Set[str]:
+    words = _clean(text).split()
+    grams = (" ".join(words[i:i + n]) for n in range(1, max_n + 1) for i in range(len(words) - n + 1))
+    return {SKILL_ALIASES.get(gram, gram) for gram in grams}
+
+
+def job_terms(required_skills: Any, description: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Weighted skills a job asks for. Depends on the job only, so every candidate
+    is scored against the same terms.
+
+    Args:
+        required_skills: The job's required_skills (dict/list/JSON text), may be None
+        description: Job description text; COMMON_SKILLS mentioned in it are added
+
+    Returns:
+        {normalized_skill: {"label": display name, "weight": float}}
+    """
+    terms: Dict[str, Dict[str, Any]] = {}
+    for label in flatten_terms(decode_json(required_skills)):
+        key = normalize_skill(label)
+        if key:
+            terms[key] = {"label": label, "weight": REQUIRED_SKILL_WEIGHT}
+
+    for key in sorted(_ngrams(description or "") & COMMON_SKILLS):
+        terms.setdefault(key, {"label": key, "weight": DESCRIPTION_SKILL_WEIGHT})
+    return terms
+
+
+def pre_score(terms: Dict[str, Dict[str, Any]], skills: Set[str]) -> Tuple[float, List[str], List[str]]:
+    """
+    Weighted share (0-100) of the job's terms found in a candidate's skills.
+
+    Returns:
+        (score, matching labels, missing labels)
+    """
+    total = sum(term["weight"] for term in terms.values())
+    if not total:
+        return 0.0, [], []
+    matching = [key for key in terms if key in skills]
+    missing = [key for key in terms if key not in skills]
+    score = 100.0 * sum(terms[key]["weight"] for key in matching) / total
+    return (
+        round(score, 2),
+        [terms[key]["label"] for key in matching],
+        [terms[key]["label"] for key in missing]
+    )
+
+
+def compare_skills(required_skills: Any, description: str, extracted_keys: Any) -> Dict[str, Any]:
+    """
+    Deterministic resume/job comparison with the ComparisonResult fields.
+
+    Args:
+        required_skills: The job's required_skills column
+        description: The job's description
+        extracted_keys: The resume's extracted key categories
+
+    Returns:
+        match_percentage, matching_skills, missing_skills and a templated summary
+    """
+    skills = skill_set(extracted_keys)
+    terms = job_terms(required_skills, description)
+    score, matching, missing = pre_score(terms, skills)
+    if not terms:
+        summary = "No recognisable skills found in the job description to compare against."
+    else:
+        summary = f"Matches {len(matching)} of {len(terms)} job skills ({round(score)}% weighted)."
+        if missing:
+            summary += f" Missing: {', '.join(missing[:5])}{'...' if len(missing) > 5 else ''}."
+    return {
+        "match_percentage": int(round(score)),
+        "matching_skills": matching,
+        "missing_skills": missing,
+        "summary": summary
+    }
+
+
+def rank_by_pre_score(
+    required_skills: Any,
+    description: str,
+    rows: List[Dict[str, Any]]
+) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """
+    Pre-score every candidate against a job (run through run_cpu for large pools).
+
+    Args:
+        required_skills: The job's required_skills column
+        description: The job's description
+        rows: parsed_resumes rows with resume_id, full_name and extracted_keys
+
+    Returns:
+        (job skill labels, candidates sorted by pre_score desc then resume_id)
+    """
+    candidate_skills = [(row, skill_set(row.get("extracted_keys"))) for row in rows]
+    terms = job_terms(required_skills, description)
+
+    ranked = []
+    for row, skills in candidate_skills:
+        score, matching, missing = pre_score(terms, skills)
+        ranked.append({
+            "resume_id": str(row["resume_id"]),
+            "full_name": row.get("full_name"),
+            "pre_score": score,
+            "matching_skills": matching,
+            "missing_skills": missing
+        })
+    ranked.sort(key=lambda c: (-c["pre_score"], c["resume_id"]))
+    return [term["label"] for term in terms.values()], ranked
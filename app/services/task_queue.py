@@ -0,0 +1,229 @@
+"""
+Database-backed task queue shared by all app instances
+
+Tasks are rows in the MySQL work_tasks table. Every node runs a few worker
+loops that claim the oldest runnable row with SELECT ... FOR UPDATE SKIP
+LOCKED, so parse, extract-keys, question-generation and compare work spreads
+across the cluster no matter which node received the request. A claim holds
+a lease that the worker keeps extending while it runs; if a node dies the
+lease expires and another node re-claims the task, up to max_attempts.
+
+Parse tasks read the uploaded file from file_path, so UPLOAD_DIR must be
+storage shared by all nodes.
+"""
+import asyncio
+import logging
+import os
+import socket
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from fastapi import HTTPException
+
+from app.core.config import (
+    TASK_WORKERS,
+    TASK_LEASE_SECONDS,
+    TASK_MAX_ATTEMPTS,
+    TASK_RETRY_BACKOFF,
+    TASK_POLL_INTERVAL
+)
+from app.repositories import ResumeRepository, TaskRepository
+from app.services.resume_service import ResumeService
+
+logger = logging.getLogger(__name__)
+
+TASK_TYPES = ["parse", "extract_keys", "generate_questions", "compare"]
+
+
+class TaskQueue:
+    """Enqueues tasks and runs this node's share of them."""
+
+    def __init__(
+        self,
+        resume_service: ResumeService,
+        task_repository: TaskRepository,
+        workers: int = TASK_WORKERS,
+        lease_seconds: int = TASK_LEASE_SECONDS,
+        max_attempts: int = TASK_MAX_ATTEMPTS
+    ):
+        self.resume_service = resume_service
+        self.resume_repository = ResumeRepository()
+        self.task_repository = task_repository
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.node_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Awaitable[Any]]] = {
+            "parse": self._parse,
+            "extract_keys": self._extract_keys,
+            "generate_questions": self._generate_questions,
+            "compare": self._compare
+        }
+        self._schema_ready = False
+        self._schema_lock = asyncio.Lock()
+        self._tasks: List[asyncio.Task] = []
+
+    # ---------- Task handlers ----------
+
+    async def _parse(self, payload: Dict[str, Any]) -> Any:
+        return await self.resume_service.parse_stored_resume(
+            payload["file_id"], use_cache=payload.get("use_cache", True)
+        )
+
+    async def _extract_keys(self, payload: Dict[str, Any]) -> Any:
+        row = await self.resume_repository.get_parsed_resume(payload["file_id"])
+        if not row:
+            raise HTTPException(status_code=404, detail="Parsed resume not found")
+        return await self.resume_service.extract_keys(
+            row, payload["file_id"], use_cache=payload.get("use_cache", True)
+        )
+
+    async def _generate_questions(self, payload: Dict[str, Any]) -> Any:
+        return await self.resume_service.generate_questions(file_id=payload["file_id"])
+
+    async def _compare(self, payload: Dict[str, Any]) -> Any:
+        return await self.resume_service.compare_resume_with_job(
+            payload["file_id"], payload["job_id"], mode=payload.get("mode", "llm"),
+            force=payload.get("force", False)
+        )
+
+    # ---------- Public API ----------
+
+    async def _ensure_schema(self) -> None:
+        if self._schema_ready:
+            return
+        async with self._schema_lock:
+            if not self._schema_ready:
+                await self.task_repository.ensure_schema()
+                self._schema_ready = True
+
+    async def enqueue(self, task_type: str, payload: Dict[str, Any]) -> str:
+        """
+        Add a task for any node to pick up.
+
+        Args:
+            task_type: One of TASK_TYPES
+            payload: Handler arguments (file_id, job_id, use_cache)
+
+        Returns:
+            task_id of the queued task
+        """
+        if task_type not in self._handlers:
+            raise HTTPException(status_code=400, detail=f"Unknown task type: {task_type}")
+        await self._ensure_schema()
+        return await self.task_repository.enqueue(task_type, payload, self.max_attempts)
+
+    async def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Task status, attempts, owning node and result."""
+        await self._ensure_schema()
+        return await self.task_repository.get_task(task_id)
+
+    async def stats(self) -> Dict[str, Any]:
+        """Cluster-wide task counts per status plus this node's worker settings."""
+        await self._ensure_schema()
+        return {
+            "node_id": self.node_id,
+            "workers": len(self._tasks),
+            "tasks": await self.task_repository.count_by_status()
+        }
+
+    async def start(self) -> None:
+        """Start this node's worker loops (no-op when TASK_WORKERS is 0)."""
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        if self._tasks:
+            logger.info("Task workers started on %s: %d", self.node_id, self.workers)
+
+    async def stop(self) -> None:
+        """Cancel worker loops. Leases of interrupted tasks expire and are re-claimed."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    # ---------- Worker loop ----------
+
+    async def _worker(self, index: int) -> None:
+        worker_id = f"{self.node_id}/{index}"
+        while True:
+            try:
+                await self._ensure_schema()
+                task = await self.task_repository.claim(worker_id, self.lease_seconds)
+                if task is None:
+                    await self.task_repository.fail_exhausted()
+                    await asyncio.sleep(TASK_POLL_INTERVAL)
+                    continue
+                await self._execute(task, worker_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Task worker %s error", worker_id)
+                await asyncio.sleep(TASK_POLL_INTERVAL * 5)
+
+    async def _keep_lease(self, task: Dict[str, Any], run: asyncio.Task) -> None:
+        """Extend the lease until `run` finishes; cancel it if the lease is lost."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                still_owned = await self.task_repository.extend_lease(
+                    task["task_id"], task["attempt"], self.lease_seconds
+                )
+            except Exception:
+                logger.warning("Could not extend lease of task %s", task["task_id"], exc_info=True)
+                continue
+            if not still_owned:
+                logger.warning("Lease of task %s lost, abandoning attempt %d", task["task_id"], task["attempt"])
+                run.cancel()
+                return
+
+    async def _execute(self, task: Dict[str, Any], worker_id: str) -> None:
+        task_id, attempt = task["task_id"], task["attempt"]
+        logger.info("%s running %s task %s (attempt %d)", worker_id, task["task_type"], task_id, attempt)
+
+        handler = self._handlers.get(task["task_type"])
+        if handler is None:
+            await self.task_repository.fail(task_id, attempt, f"Unknown task type: {task['task_type']}")
+            return
+
+        run = asyncio.create_task(handler(task["payload"]))
+        heartbeat = asyncio.create_task(self._keep_lease(task, run))
+        try:
+            result = await run
+        except asyncio.CancelledError:
+            if heartbeat.done() and not heartbeat.cancelled():
+                return  # lease lost; the new owner records the outcome
+            raise  # worker shutdown; the lease will expire and another node retries
+        except HTTPException as e:
+            if e.status_code < 500:
+                # Client errors (missing file, unsupported type) will not succeed on retry
+                await self.task_repository.fail(task_id, attempt, str(e.detail))
+            else:
+                await self._retry_or_fail(task, str(e.detail))
+            return
+        except Exception as e:
+            await self._retry_or_fail(task, str(e))
+            return
+        finally:
+            heartbeat.cancel()
+            if not run.done():
+                run.cancel()
+
+        if not await self.task_repository.complete(task_id, attempt, result):
+            logger.warning("Task %s finished after its lease was lost; result discarded", task_id)
+
+    async def _retry_or_fail(self, task: Dict[str, Any], error: str) -> None:
+        if task["attempt"] < self.max_attempts:
+            await self.task_repository.retry(
+                task["task_id"], task["attempt"], error, TASK_RETRY_BACKOFF * task["attempt"]
+            )
+        else:
+            await self.task_repository.fail(task["task_id"], task["attempt"], error)
+
+
+_task_queue: Optional[TaskQueue] = None
+
+
+def get_task_queue() -> TaskQueue:
+    """Process-wide task queue."""
+    global _task_queue
+    if _task_queue is None:
+        _task_queue = TaskQueue(ResumeService(), TaskRepository())
+    return _task_queue
@@ -0,0 +1,437 @@
+"""
+BM25 full-text index over extracted resume text
+
+Documents live in immutable segments, each a SciPy CSC matrix (resumes x
+terms) of term frequencies, so scoring a query touches only the posting
+columns of its terms. New documents are buffered and flushed into a small
+segment; whenever TEXT_INDEX_MERGE_FACTOR segments of similar size exist
+they are merged into one of the next size tier, keeping adds amortised
+O(log n). A segment is rewritten on its own once 20% of it is deleted.
+Deletes are tombstones (Lucene-style): a deleted resume stops matching at
+once and its document frequencies are dropped at the next merge.
+
+The index is loaded at startup from the resume_texts table and updated
+whenever a resume is parsed. Every TEXT_INDEX_REFRESH_SECONDS the texts
+updated since the last load or refresh are re-read, so resumes parsed by
+task workers on other nodes become searchable here too.
+"""
+import asyncio
+import logging
+import math
+import re
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from app.core.config import (
+    BM25_K1,
+    BM25_B,
+    TEXT_INDEX_FLUSH_SIZE,
+    TEXT_INDEX_MERGE_FACTOR,
+    TEXT_INDEX_REFRESH_SECONDS
+)
+from app.core.executors import run_io
+from app.repositories import ResumeRepository
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "of",
+    "on", "or", "that", "the", "to", "was", "were", "with", "i", "my", "me", "we", "our",
+})
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens without stopwords ('Node.js' -> 'nodejs', 'C++' -> 'c++')."""
+    text = re.sub(r"\.js\b", "js", (text or "").lower())
+    return [token for token in _TOKEN_RE.findall(text) if token not in STOPWORDS]
+
+
+class _Segment:
+    """Immutable block of documents plus a mutable tombstone mask."""
+
+    def __init__(self, matrix: sparse.csc_matrix, ids: List[str], lengths: np.ndarray):
+        self.matrix = matrix
+        self.ids = ids
+        self.lengths = lengths
+        self.alive = np.ones(len(ids), dtype=bool)
+        self.deleted = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class BM25Index:
+    """Segmented BM25 index with incremental adds and deletes."""
+
+    def __init__(
+        self,
+        k1: float = BM25_K1,
+        b: float = BM25_B,
+        flush_size: int = TEXT_INDEX_FLUSH_SIZE,
+        merge_factor: int = TEXT_INDEX_MERGE_FACTOR
+    ):
+        self.k1 = k1
+        self.b = b
+        self.flush_size = flush_size
+        self.merge_factor = max(2, merge_factor)
+        self.ready = False
+        self.built_at: Optional[float] = None
+        self._load_lock = asyncio.Lock()
+        self._pending: Optional[List[Tuple[str, Optional[str]]]] = None  # updates made during a load
+        self._watermark: Optional[datetime] = None  # DB time the last load/refresh read from
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.refreshed_at: Optional[float] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._vocab: Dict[str, int] = {}
+        self._df = np.zeros(1024, dtype=np.int64)  # grown on demand; counts include tombstoned docs
+        self._segments: List[_Segment] = []
+        self._buffer: List[Tuple[str, Dict[int, int], int]] = []
+        self._locations: Dict[str, Any] = {}  # resume_id -> (segment, row) or None while buffered
+        self._lengths: Dict[str, int] = {}
+        self._n_counted = 0  # documents included in _df
+        self._total_length = 0  # of live documents
+
+    # ---------- Maintenance ----------
+
+    def _term_id(self, term: str) -> int:
+        term_id = self._vocab.get(term)
+        if term_id is None:
+            term_id = self._vocab[term] = len(self._vocab)
+            if term_id >= len(self._df):
+                self._df = np.concatenate([self._df, np.zeros(len(self._df), dtype=np.int64)])
+        return term_id
+
+    def add(self, resume_id: str, text: str) -> None:
+        """Index (or re-index) one resume."""
+        resume_id = str(resume_id)
+        if self._pending is not None:
+            self._pending.append((resume_id, text))
+        self._delete(resume_id)  # re-index: the add alone is the pending update
+
+        tokens = Counter(tokenize(text))
+        counts = {self._term_id(token): count for token, count in tokens.items()}
+        length = sum(counts.values())
+        for term_id in counts:
+            self._df[term_id] += 1
+        self._n_counted += 1
+        self._buffer.append((resume_id, counts, length))
+        self._locations[resume_id] = None
+        self._lengths[resume_id] = length
+        self._total_length += length
+
+        if len(self._buffer) >= self.flush_size:
+            self.flush()
+
+    def delete(self, resume_id: str) -> bool:
+        """Remove a resume from results; False if it was not indexed."""
+        resume_id = str(resume_id)
+        if self._pending is not None:
+            self._pending.append((resume_id, None))
+        return self._delete(resume_id)
+
+    def _delete(self, resume_id: str) -> bool:
+        if resume_id not in self._locations:
+            return False
+        location = self._locations.pop(resume_id)
+        self._total_length -= self._lengths.pop(resume_id)
+
+        if location is None:
+            # Still buffered: drop it outright, including its document frequencies
+            for i, (buffered_id, counts, _) in enumerate(self._buffer):
+                if buffered_id == resume_id:
+                    for term_id in counts:
+                        self._df[term_id] -= 1
+                    self._n_counted -= 1
+                    del self._buffer[i]
+                    break
+        else:
+            segment, row = location
+            segment.alive[row] = False
+            segment.deleted += 1
+        return True
+
+    def flush(self) -> None:
+        """Turn buffered documents into a new segment."""
+        if not self._buffer:
+            return
+        rows, cols, values = [], [], []
+        for row, (_, counts, _) in enumerate(self._buffer):
+            rows.extend([row] * len(counts))
+            cols.extend(counts.keys())
+            values.extend(counts.values())
+        matrix = sparse.csc_matrix(
+            (np.asarray(values, dtype=np.float32), (np.asarray(rows), np.asarray(cols))),
+            shape=(len(self._buffer), len(self._vocab))
+        )
+        segment = _Segment(
+            matrix,
+            [resume_id for resume_id, _, _ in self._buffer],
+            np.asarray([length for _, _, length in self._buffer], dtype=np.float32)
+        )
+        for row, resume_id in enumerate(segment.ids):
+            self._locations[resume_id] = (segment, row)
+        self._segments.append(segment)
+        self._buffer = []
+
+        self._maybe_merge()
+
+    def _merge(self, segments: List[_Segment]) -> Optional[_Segment]:
+        """Merge segments into one, dropping tombstoned rows and their document frequencies."""
+        width = len(self._vocab)
+        blocks, ids, lengths = [], [], []
+        for segment in segments:
+            if segment.deleted:
+                dead = segment.matrix.tocsr()[~segment.alive]
+                dead.resize((dead.shape[0], len(self._df)))
+                self._df -= np.diff(dead.tocsc().indptr).astype(np.int64)
+                self._n_counted -= segment.deleted
+            if segment.deleted == len(segment):
+                continue
+            live = segment.matrix.tocsr()[segment.alive]
+            live.resize((live.shape[0], width))
+            blocks.append(live)
+            ids.extend(resume_id for resume_id, alive in zip(segment.ids, segment.alive) if alive)
+            lengths.append(segment.lengths[segment.alive])
+
+        if not blocks:
+            return None
+        merged = _Segment(sparse.vstack(blocks, format="csr").tocsc(), ids, np.concatenate(lengths))
+        for row, resume_id in enumerate(merged.ids):
+            self._locations[resume_id] = (merged, row)
+        return merged
+
+    def _replace(self, old: List[_Segment], new: Optional[_Segment]) -> None:
+        old_ids = {id(segment) for segment in old}
+        self._segments = [segment for segment in self._segments if id(segment) not in old_ids]
+        if new is not None:
+            self._segments.append(new)
+
+    def _tier(self, size: int) -> int:
+        if size <= self.flush_size:
+            return 0
+        return int(math.log(size / self.flush_size, self.merge_factor))
+
+    def _maybe_merge(self) -> None:
+        """Size-tiered merging plus rewriting of heavily deleted segments."""
+        while True:
+            tiers: Dict[int, List[_Segment]] = {}
+            for segment in self._segments:
+                tiers.setdefault(self._tier(len(segment)), []).append(segment)
+            full = next((group for _, group in sorted(tiers.items()) if len(group) >= self.merge_factor), None)
+            if full is None:
+                break
+            self._replace(full, self._merge(full))
+
+        for segment in list(self._segments):
+            if segment.deleted * 5 >= len(segment):
+                self._replace([segment], self._merge([segment]))
+
+    def optimize(self) -> None:
+        """Flush and merge everything into a single segment."""
+        self.flush()
+        if len(self._segments) > 1 or any(segment.deleted for segment in self._segments):
+            self._replace(list(self._segments), self._merge(self._segments))
+
+    def _add_all(self, documents) -> None:
+        for resume_id, text in documents:
+            self.add(resume_id, text)
+
+    def build(self, documents) -> None:
+        """Replace the index with (resume_id, text) pairs from an iterable."""
+        started = time.perf_counter()
+        self._reset()
+        flush_size, self.flush_size = self.flush_size, math.inf  # one bulk segment
+        try:
+            self._add_all(documents)
+        finally:
+            self.flush_size = flush_size
+        self.flush()
+        self.ready = True
+        self.built_at = time.time()
+        logger.info(
+            "Text index built: %d resumes, %d terms in %.1f ms",
+            len(self), len(self._vocab), (time.perf_counter() - started) * 1000
+        )
+
+    async def load(self, resume_repository: Optional[ResumeRepository] = None) -> None:
+        """
+        (Re)build from the resume_texts table.
+
+        Batches are streamed from MySQL and indexed in a worker thread into a
+        fresh index, which then replaces this one. The current index keeps
+        serving searches meanwhile; adds and deletes made during the load are
+        replayed on the new one.
+        """
+        async with self._load_lock:
+            started = time.perf_counter()
+            resume_repository = resume_repository or ResumeRepository()
+            fresh = BM25Index(self.k1, self.b, math.inf, self.merge_factor)
+            self._pending = []
+            try:
+                watermark = await resume_repository.get_db_now()
+                async for batch in resume_repository.iter_resume_texts():
+                    await run_io(fresh._add_all, batch)
+                fresh.flush_size = self.flush_size
+                await run_io(fresh.flush)
+
+                pending, self._pending = self._pending, None
+                for attr in ("_vocab", "_df", "_segments", "_buffer", "_locations",
+                             "_lengths", "_n_counted", "_total_length"):
+                    setattr(self, attr, getattr(fresh, attr))
+                self._replay(pending)
+            finally:
+                self._pending = None
+
+            self._watermark = watermark
+            self.ready = True
+            self.built_at = self.refreshed_at = time.time()
+            logger.info(
+                "Text index loaded: %d resumes, %d terms in %.1f ms",
+                len(self), len(self._vocab), (time.perf_counter() - started) * 1000
+            )
+
+    def _replay(self, pending: List[Tuple[str, Optional[str]]]) -> None:
+        for resume_id, text in pending:
+            if text is None:
+                self.delete(resume_id)
+            else:
+                self.add(resume_id, text)
+
+    async def refresh(self, resume_repository: Optional[ResumeRepository] = None) -> int:
+        """
+        Re-index texts updated since the last load or refresh, including those
+        saved on other nodes. Loads first if not ready.
+
+        Returns:
+            Number of re-read texts
+        """
+        if not self.ready:
+            await self.load(resume_repository)
+            return len(self)
+
+        async with self._load_lock:
+            resume_repository = resume_repository or ResumeRepository()
+            count = 0
+            self._pending = []
+            try:
+                # updated_at has second resolution: >= the previous read time re-reads that
+                # second's rows (harmless) instead of missing ones written after the read
+                watermark = await resume_repository.get_db_now()
+                async for batch in resume_repository.iter_resume_texts(
+                    batch_size=self.flush_size, since=self._watermark
+                ):
+                    # Applied on the event loop between fetches, so searches never see a half-added batch
+                    pending, self._pending = self._pending, None
+                    for resume_id, text in batch:
+                        self.add(resume_id, text)
+                    self._replay(pending)  # local adds made while fetching are at least as new
+                    self._pending = []
+                    count += len(batch)
+            finally:
+                self._pending = None
+
+            self._watermark = watermark
+            self.refreshed_at = time.time()
+            return count
+
+    async def start_refresh(self, interval: float = TEXT_INDEX_REFRESH_SECONDS) -> None:
+        """Refresh in the background every interval seconds (0 disables)."""
+        if interval > 0 and self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop(interval))
+
+    async def stop_refresh(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+            self._refresh_task = None
+
+    async def _refresh_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.warning("Text index refresh failed", exc_info=True)
+
+    async def ensure_built(self) -> None:
+        """Load on first use if the startup load did not succeed."""
+        if not self.ready:
+            await self.load()
+
+    # ---------- Queries ----------
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Top-k resumes for a free-text query.
+
+        Returns:
+            (resume_id, BM25 score) pairs, best first
+        """
+        self.flush()
+        term_ids = sorted({self._vocab[token] for token in tokenize(query) if token in self._vocab})
+        if not term_ids or not self._locations:
+            return []
+
+        n = self._n_counted
+        avg_length = self._total_length / len(self._locations) or 1.0
+        df = self._df[term_ids].astype(np.float64)
+        idf = np.log(1.0 + (n - df + 0.5) / (df + 0.5))
+
+        candidates: List[Tuple[float, str]] = []
+        for segment in self._segments:
+            scores = np.zeros(len(segment), dtype=np.float32)
+            norm = self.k1 * (1.0 - self.b + self.b * segment.lengths / avg_length)
+            indptr, indices, data = segment.matrix.indptr, segment.matrix.indices, segment.matrix.data
+            width = segment.matrix.shape[1]
+            for term_id, term_idf in zip(term_ids, idf):
+                if term_id >= width:
+                    continue  # term first seen after this segment was written
+                start, end = indptr[term_id], indptr[term_id + 1]
+                if start == end:
+                    continue
+                rows = indices[start:end]
+                tf = data[start:end]
+                scores[rows] += term_idf * tf * (self.k1 + 1.0) / (tf + norm[rows])
+
+            scores[~segment.alive] = 0.0
+            hits = np.flatnonzero(scores)
+            if len(hits) > k:
+                hits = hits[np.argpartition(scores[hits], -k)[-k:]]
+            candidates.extend((float(scores[row]), segment.ids[row]) for row in hits)
+
+        candidates.sort(key=lambda hit: (-hit[0], hit[1]))
+        return [(resume_id, round(score, 4)) for score, resume_id in candidates[:k]]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "resumes": len(self),
+            "terms": len(self._vocab),
+            "segments": len(self._segments),
+            "buffered": len(self._buffer),
+            "deleted_pending_merge": sum(segment.deleted for segment in self._segments),
+            "built_at": self.built_at,
+            "refreshed_at": self.refreshed_at
+        }
+
+
+_text_index: Optional[BM25Index] = None
+
+
+def get_text_index() -> BM25Index:
+    """Process-wide BM25 text index."""
+    global _text_index
+    if _text_index is None:
+        _text_index = BM25Index()
+    return _text_index
@@ -0,0 +1,143 @@
+"""
+Batch resume uploads
+
+Every file of a multipart request, and every resume inside an uploaded zip
+archive, is streamed to UPLOAD_DIR with a bounded number of files written
+at once. The file count (archive members included) is checked for the
+whole request before anything is written, and the bytes written share one
+request-wide budget. The metadata of all stored files is then recorded with one
+batched INSERT in a single transaction instead of a round trip per file.
+"""
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List
+from uuid import uuid4
+
+from fastapi import HTTPException, UploadFile
+
+from app.core.config import (
+    UPLOAD_DIR,
+    BATCH_UPLOAD_MAX_FILES,
+    BATCH_UPLOAD_MAX_ARCHIVE_SIZE,
+    BATCH_UPLOAD_MAX_TOTAL_SIZE,
+    BATCH_UPLOAD_CONCURRENCY
+)
+from app.core.executors import run_io
+from app.core.uploads import (
+    UploadBudget,
+    save_upload,
+    is_zip_upload,
+    count_zip_members,
+    extract_zip,
+    remove_file
+)
+from app.repositories import ResumeRepository
+
+logger = logging.getLogger(__name__)
+
+
+class UploadService:
+    """Stores many uploaded resumes and records them in bulk."""
+
+    def __init__(self):
+        self.resume_repository = ResumeRepository()
+
+    async def _save_file(self, file: UploadFile, budget: UploadBudget) -> Dict[str, Any]:
+        file_id = str(uuid4())
+        partial_path = os.path.join(UPLOAD_DIR, f"{file_id}.part")
+        try:
+            info = await save_upload(file, partial_path, budget=budget)
+        except HTTPException as e:
+            return {"filename": file.filename, "error": e.detail}
+
+        file_path = os.path.join(UPLOAD_DIR, f"{file_id}{info.file_type}")
+        try:
+            await run_io(os.replace, partial_path, file_path)
+        except OSError as e:
+            await run_io(remove_file, partial_path)
+            return {"filename": file.filename, "error": str(e)}
+        return {
+            "filename": file.filename,
+            "file_id": file_id,
+            "file_path": file_path,
+            "size": info.size,
+            "sha256": info.sha256
+        }
+
+    async def _count_files(self, file: UploadFile) -> int:
+        if not await is_zip_upload(file):
+            return 1
+        if file.size is not None and file.size > BATCH_UPLOAD_MAX_ARCHIVE_SIZE:
+            return 0  # rejected by _save_archive without extracting anything
+        return await run_io(count_zip_members, file.file)
+
+    async def _save_archive(self, file: UploadFile, budget: UploadBudget) -> List[Dict[str, Any]]:
+        if file.size is not None and file.size > BATCH_UPLOAD_MAX_ARCHIVE_SIZE:
+            return [{"filename": file.filename, "error": f"Archive exceeds {BATCH_UPLOAD_MAX_ARCHIVE_SIZE} bytes"}]
+        try:
+            results = await run_io(
+                extract_zip, file.file, UPLOAD_DIR, BATCH_UPLOAD_MAX_FILES, budget=budget
+            )
+        except HTTPException as e:
+            return [{"filename": file.filename, "error": e.detail}]
+        for result in results:
+            result["archive"] = file.filename
+        return results
+
+    async def upload_batch(self, files: List[UploadFile]) -> Dict[str, Any]:
+        """
+        Store a batch of resumes (plain files and/or zip archives) and record them.
+
+        Args:
+            files: Uploaded PDFs/images or zip archives of them
+
+        Returns:
+            Counts and one entry per stored or rejected file (file_id or error)
+
+        Raises:
+            HTTPException: 400 if the batch holds too many files (archive members included),
+                           500 if recording metadata fails
+        """
+        if len(files) > BATCH_UPLOAD_MAX_FILES:
+            raise HTTPException(status_code=400, detail=f"At most {BATCH_UPLOAD_MAX_FILES} files per batch")
+
+        # 1️⃣ Count every file, archive members included, before writing anything
+        total_files = sum(await asyncio.gather(*(self._count_files(file) for file in files)))
+        if total_files > BATCH_UPLOAD_MAX_FILES:
+            raise HTTPException(status_code=400, detail=f"At most {BATCH_UPLOAD_MAX_FILES} files per batch")
+
+        semaphore = asyncio.Semaphore(BATCH_UPLOAD_CONCURRENCY)
+        budget = UploadBudget(BATCH_UPLOAD_MAX_TOTAL_SIZE)
+
+        async def store(file: UploadFile) -> List[Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    if await is_zip_upload(file):
+                        return await self._save_archive(file, budget)
+                    return [await self._save_file(file, budget)]
+                except Exception as e:  # e.g. UPLOAD_DIR missing or disk full: report it, keep the others
+                    logger.exception("Storing %s failed", file.filename)
+                    return [{"filename": file.filename, "error": str(e)}]
+
+        # 2️⃣ Stream every file to storage, a bounded number at a time, under one byte budget
+        results = [entry for entries in await asyncio.gather(*(store(file) for file in files)) for entry in entries]
+        stored = [entry for entry in results if "file_id" in entry]
+
+        # 3️⃣ Record all stored files in one transaction
+        try:
+            await self.resume_repository.insert_resumes(
+                [(entry["file_id"], entry["filename"], entry["file_path"]) for entry in stored]
+            )
+        except Exception as e:
+            await asyncio.gather(*(run_io(remove_file, entry["file_path"]) for entry in stored))
+            raise HTTPException(status_code=500, detail=f"Recording uploads failed: {str(e)}")
+
+        for entry in stored:
+            del entry["file_path"]
+        logger.info("Batch upload: %d stored, %d rejected", len(stored), len(results) - len(stored))
+        return {
+            "uploaded": len(stored),
+            "failed": len(results) - len(stored),
+            "files": results
+        }
@@ -0,0 +1,143 @@
+"""
+Generate the bundled benchmark corpus
+
+Writes synthetic resume PDFs to benchmarks/corpus/ together with a .txt file
+holding the exact text drawn on each page, which the benchmark uses as
+ground truth for text fidelity. The PDFs are built by hand (standard
+Helvetica font, no dependencies) so the corpus is fully reproducible.
+
+Usage:
+    python benchmarks/make_corpus.py
+"""
+import random
+from pathlib import Path
+
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+
+FIRST_NAMES = ["Aarav", "Priya", "Rahul", "Sneha", "Vikram", "Ananya", "Karan", "Meera"]
+LAST_NAMES = ["Sharma", "Iyer", "Patel", "Reddy", "Nair", "Gupta", "Kulkarni", "Das"]
+SKILLS = [
+    "Python", "Java", "C++", "JavaScript", "TypeScript", "React", "Node.js", "Django",
+    "Flask", "FastAPI", "TensorFlow", "PyTorch", "scikit-learn", "Pandas", "NumPy",
+    "MySQL", "PostgreSQL", "MongoDB", "Redis", "Docker", "Kubernetes", "AWS", "GCP",
+    "Kafka", "Spark", "Git", "Linux", "REST APIs", "GraphQL", "Machine Learning"
+]
+PROJECT_WORDS = ["Smart", "Agro", "Health", "Vision", "Ledger", "Chat", "Route", "Pulse", "Insight", "Grid"]
+PROJECT_SUFFIXES = ["Analyzer", "Tracker", "Assistant", "Platform", "Dashboard", "Engine"]
+VERBS = ["Built", "Designed", "Implemented", "Optimized", "Deployed", "Automated"]
+
+# (name, pages) for each generated document
+DOCUMENTS = [
+    ("resume_01_single_page", 1),
+    ("resume_02_single_page", 1),
+    ("resume_03_two_pages", 2),
+    ("resume_04_two_pages", 2),
+    ("resume_05_three_pages", 3),
+    ("portfolio_06_ten_pages", 10),
+    ("bundle_07_twenty_pages", 20),
+]
+
+LINES_PER_PAGE = 46
+
+
+def _escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _resume_lines(rng):
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    handle = name.lower().replace(" ", ".")
+    lines = [
+        name,
+        f"Email: {handle}@example.com",
+        f"GitHub: github.com/{handle.replace('.', '')}",
+        f"LinkedIn: linkedin.com/in/{handle.replace('.', '-')}",
+        "",
+        "EDUCATION",
+        f"B.Tech in Computer Science, CGPA {rng.uniform(7, 9.8):.2f}",
+        "",
+        "SKILLS",
+        ", ".join(rng.sample(SKILLS, 10)),
+        "",
+        "KEY PROJECTS",
+    ]
+    while True:
+        project = f"{rng.choice(PROJECT_WORDS)} {rng.choice(PROJECT_SUFFIXES)}"
+        lines.append(project)
+        for _ in range(3):
+            lines.append(
+                f"- {rng.choice(VERBS)} {rng.choice(SKILLS)} service using "
+                f"{rng.choice(SKILLS)} and {rng.choice(SKILLS)}"
+            )
+        yield from lines
+        lines = [""]
+
+
+def _page_stream(lines):
+    commands = ["BT", "/F1 10 Tf", "12 TL", "50 770 Td"]
+    for line in lines:
+        commands.append(f"({_escape(line)}) Tj T*")
+    commands.append("ET")
+    return "\n".join(commands).encode("latin-1")
+
+
+def build_pdf(pages):
+    """
+    Build a minimal PDF with one content stream per page.
+
+    Args:
+        pages: List of pages, each a list of text lines
+
+    Returns:
+        PDF file bytes
+    """
+    objects = []  # index i holds the body of object i + 1
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(None)  # page tree, filled in below
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+
+    page_ids = []
+    for lines in pages:
+        stream = _page_stream(lines)
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids).encode("latin-1")
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n" % (len(objects) + 1)
+    out += b"0000000000 65535 f \n"
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(out)
+
+
+def main():
+    CORPUS_DIR.mkdir(parents=True, exist_ok=True)
+    for seed, (name, page_total) in enumerate(DOCUMENTS):
+        rng = random.Random(seed)
+        line_source = _resume_lines(rng)
+        pages = [[next(line_source) for _ in range(LINES_PER_PAGE)] for _ in range(page_total)]
+
+        (CORPUS_DIR / f"{name}.pdf").write_bytes(build_pdf(pages))
+        (CORPUS_DIR / f"{name}.txt").write_text(
+            "\n".join("\n".join(lines) for lines in pages), encoding="utf-8"
+        )
+        print(f"wrote {name}.pdf ({page_total} pages)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark PDF text extraction backends on the bundled resume corpus
+
+For every registered backend (see Parser/pdf_backends.py) this measures
+throughput (pages/s and MB/s), memory (peak Python allocations and the peak
+RSS of a fresh worker process) and text fidelity against the ground-truth
+.txt file stored next to each PDF. Each backend runs in its own process so
+memory numbers are not polluted by the others.
+
+Usage:
+    python benchmarks/make_corpus.py          # (re)generate the corpus
+    python benchmarks/pdf_backends.py [--backends pypdf2 pdfium] [--repeat 5]
+
+PDFs without a matching .txt file (e.g. real resumes dropped into the corpus
+directory) are timed but excluded from the fidelity score.
+"""
+import argparse
+import difflib
+import multiprocessing
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from Parser.pdf_backends import PDF_BACKENDS, get_backend  # noqa: E402
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent / "corpus"
+
+
+def _normalize(text):
+    return text.split()
+
+
+def fidelity(extracted, expected):
+    """Similarity (0-1) of whitespace-normalized token sequences."""
+    return difflib.SequenceMatcher(None, _normalize(extracted), _normalize(expected), autojunk=False).ratio()
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_backend(name, files, repeat):
+    """Benchmark one backend over all files (runs inside a worker process)."""
+    try:
+        backend = get_backend(name)
+    except ValueError as e:
+        return {"backend": name, "error": str(e)}
+
+    total_pages = 0
+    total_bytes = 0
+    total_seconds = 0.0
+    scores = []
+    peak_traced = 0
+
+    for pdf_path in files:
+        data = pdf_path.read_bytes()
+        timings = []
+        text = ""
+        for _ in range(repeat):
+            started = time.perf_counter()
+            pages, page_texts = backend.page_range(data, 0, sys.maxsize)
+            text = "\n".join(page_texts)
+            timings.append(time.perf_counter() - started)
+
+        tracemalloc.start()
+        pages, page_texts = backend.page_range(data, 0, sys.maxsize)
+        "\n".join(page_texts)
+        peak_traced = max(peak_traced, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+        total_pages += pages
+        total_bytes += len(data)
+        total_seconds += statistics.median(timings)
+
+        truth = pdf_path.with_suffix(".txt")
+        if truth.exists():
+            scores.append(fidelity(text, truth.read_text(encoding="utf-8")))
+
+    return {
+        "backend": name,
+        "documents": len(files),
+        "pages": total_pages,
+        "seconds": total_seconds,
+        "pages_per_s": total_pages / total_seconds if total_seconds else 0.0,
+        "mb_per_s": total_bytes / (1024 * 1024) / total_seconds if total_seconds else 0.0,
+        "peak_traced_mb": peak_traced / (1024 * 1024),
+        "peak_rss_mb": _peak_rss_mb(),
+        "fidelity": statistics.mean(scores) if scores else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Directory of PDFs")
+    parser.add_argument("--backends", nargs="+", default=sorted(PDF_BACKENDS), help="Backends to compare")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per document (median is used)")
+    args = parser.parse_args()
+
+    files = sorted(args.corpus.glob("*.pdf"))
+    if not files:
+        sys.exit(f"No PDFs in {args.corpus}. Run benchmarks/make_corpus.py first.")
+
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for name in args.backends:
+        with context.Pool(1) as pool:
+            results.append(pool.apply(run_backend, (name, files, args.repeat)))
+
+    header = f"{'backend':<10} {'docs':>5} {'pages':>6} {'pages/s':>9} {'MB/s':>7} {'py peak MB':>11} {'RSS MB':>7} {'fidelity':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        if "error" in r:
+            print(f"{r['backend']:<10} skipped: {r['error']}")
+            continue
+        fid = f"{r['fidelity']:.4f}" if r["fidelity"] is not None else "n/a"
+        rss = f"{r['peak_rss_mb']:.1f}" if r["peak_rss_mb"] is not None else "n/a"
+        print(
+            f"{r['backend']:<10} {r['documents']:>5} {r['pages']:>6} {r['pages_per_s']:>9.1f} "
+            f"{r['mb_per_s']:>7.2f} {r['peak_traced_mb']:>11.2f} {rss:>7} {fid:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
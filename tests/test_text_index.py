@@ -0,0 +1,65 @@
+import asyncio
+from datetime import datetime
+
+from app.services.text_index import BM25Index
+
+
+class FakeResumeRepository:
+    """resume_texts rows served in batches; on_batch runs between fetches like a concurrent request."""
+
+    def __init__(self, rows, on_batch=None):
+        self.rows = rows
+        self.on_batch = on_batch
+
+    async def get_db_now(self):
+        return datetime(2026, 1, 1)
+
+    async def iter_resume_texts(self, batch_size=1000, since=None):
+        for row in self.rows:
+            if self.on_batch is not None:
+                self.on_batch()
+                await asyncio.sleep(0)
+            yield [row]
+
+
+def test_reindex_during_load_keeps_resume():
+    index = BM25Index(flush_size=2)
+    index.add("r1", "python developer")
+    index.add("r2", "java developer")
+
+    repository = FakeResumeRepository(
+        [("r1", "python developer"), ("r2", "java developer")],
+        on_batch=lambda: index.add("r1", "golang developer")
+    )
+    asyncio.run(index.load(repository))
+
+    assert len(index) == 2
+    assert [resume_id for resume_id, _ in index.search("golang")] == ["r1"]
+    assert index.search("python") == []
+
+
+def test_reindex_during_refresh_keeps_resume():
+    index = BM25Index(flush_size=2)
+    asyncio.run(index.load(FakeResumeRepository([("r1", "python developer"), ("r2", "java developer")])))
+
+    repository = FakeResumeRepository(
+        [("r2", "java spring developer")],
+        on_batch=lambda: index.add("r1", "golang developer")
+    )
+    asyncio.run(index.refresh(repository))
+
+    assert len(index) == 2
+    assert [resume_id for resume_id, _ in index.search("golang")] == ["r1"]
+    assert [resume_id for resume_id, _ in index.search("spring")] == ["r2"]
+
+
+def test_delete_during_load_is_replayed():
+    index = BM25Index()
+    repository = FakeResumeRepository(
+        [("r1", "python developer"), ("r2", "java developer")],
+        on_batch=lambda: index.delete("r2")
+    )
+    asyncio.run(index.load(repository))
+
+    assert len(index) == 1
+    assert index.search("java") == []